@@ -1,61 +1,59 @@
 import sys
 import traceback
 import customtkinter as ctk
-from datetime import datetime, date, timedelta
+from datetime import date, timedelta
 import sqlite3
 import os
 
+from tracker_calendar import CalendarWindow
+from tracker_charts import SLEEP_QUALITY_COLORS, BarChart, CalendarHeatmap, sleep_quality_breakdown
+from tracker_db import (DEFAULT_PROFILE, DEFAULT_RANGE, GOOD_SLEEP, HISTORY_RANGES, OKAY_SLEEP, POOR_SLEEP,
+                        Database, classify_sleep, profile_path)
+from tracker_profiles import ProfileSet, ProfileSwitcher
+from tracker_profiling import PROFILER
+from tracker_record import DayRecord, parse_field
+from tracker_search import SearchWindow
+
 # ─── CONSTANTS ──────────────────────────────────────────────────────────────
 
-# Determine database path - works for both .py and .exe
-if getattr(sys, 'frozen', False):
-    # Running as compiled .exe
-    DB_PATH = os.path.join(os.path.dirname(sys.executable), "tracker.db")
-else:
-    # Running as Python script
-    DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tracker.db")
+RANGE_TITLES = {"7d": "Last 7 Days", "30d": "Last 30 Days", "90d": "Last 90 Days",
+                "1y": "Last Year", "all": "All Time"}
+
+# Edits are saved this long after the last keystroke / slider move
+AUTOSAVE_DELAY_MS = 800
 
+SLEEP_QUALITY_TEXT = {GOOD_SLEEP: "✅ Good sleep!", OKAY_SLEEP: "⚠️ Okay sleep", POOR_SLEEP: "❌ Poor sleep"}
+# History charts: (field, title, bar colour, max value)
+HISTORY_CHARTS = (("sleep_hours", "😴 Sleep Hours", "#3b82f6", 12),
+                  ("mood", "🧠 Mood", "#10b981", 10),
+                  ("discomfort_level", "🩹 Discomfort", "#ef4444", 10),
+                  ("calories", "🍽️ Calories", "#f59e0b", 3000))
 MOOD_EMOJIS = {1: "😩", 2: "😢", 3: "😟", 4: "😕", 5: "😐", 6: "🙂", 7: "😊", 8: "😄", 9: "🤩", 10: "🔥"}
 
 # ─── DATABASE ────────────────────────────────────────────────────────────────
 
-def get_db():
+def open_profile(profiles, name=DEFAULT_PROFILE):
     try:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        # Enable foreign keys and set timeout for locked database
-        conn.execute("PRAGMA foreign_keys = ON")
-        conn.execute("PRAGMA journal_mode = WAL")
-        return conn
-    except sqlite3.OperationalError as e:
+        return profiles.open(name)
+    except sqlite3.Error as e:
         print(f"Database error: {e}")
-        print(f"Database path: {DB_PATH}")
+        print(f"Database path: {profile_path(name)}")
         raise
 
 
-def init_db():
-    try:
-        conn = get_db()
-        conn.executescript("""
-            CREATE TABLE IF NOT EXISTS daily_log (
-                date TEXT PRIMARY KEY,
-                sleep_hours REAL,
-                sleep_disturbances INTEGER,
-                calories INTEGER,
-                mood INTEGER,
-                discomfort_level INTEGER,
-                discomfort_notes TEXT,
-                gym_notes TEXT
-            );
-            CREATE TABLE IF NOT EXISTS weekly_weight (
-                date TEXT PRIMARY KEY,
-                weight_kg REAL
-            );
-        """)
-        conn.commit()
-        conn.close()
-    except Exception as e:
-        print(f"Database initialization error: {e}")
+def fetch_history(db, range_key, known=None):
+    # Runs on the DB worker thread: everything the history window needs in one request,
+    # or None when nothing has changed since the window showed version known.
+    version = (db.data_version(), date.today(), range_key)
+    if version == known:
+        return None
+
+    # NumPy is only imported the first time History is opened.
+    from tracker_analytics import analyze, describe
+
+    bucket, rows, _ = db.history(range_key)
+    start = db.range_start(range_key)
+    return version, bucket, rows, db.summary(start), describe(analyze(db)), db.sleep_quality(start)
 
 
 # ─── MAIN APP ────────────────────────────────────────────────────────────────
@@ -68,11 +66,22 @@ class TrackerApp(ctk.CTk):
         ctk.set_appearance_mode("dark")
         ctk.set_default_color_theme("blue")
 
-        init_db()
-
         self.selected_date = date.today()
+        self._autosave_job = None
+        self._last_saved = None  # form state last written to / read from the db
+        self._loading = False    # True while the selected day is being fetched
+        self.search_window = None
+        self.history_window = None
+        self._history_range = DEFAULT_RANGE
+        self.calendar_window = None
+        self.diagnostics_window = None
+        self._load_timer = None
 
         self._build_ui()
+        self.profiles = ProfileSet(self, self._set_busy)
+        self.profile = open_profile(self.profiles)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
         self._update_date_label()  # Called AFTER all widgets are created
         self._load_entry()
 
@@ -88,6 +97,15 @@ class TrackerApp(ctk.CTk):
         self.date_label.pack(side="left", expand=True)
         ctk.CTkButton(top, text="▶", width=40, command=self._next_day).pack(side="left")
         ctk.CTkButton(top, text="Today", width=70, command=self._go_today).pack(side="left", padx=(10, 0))
+        ctk.CTkButton(top, text="📅", width=40, command=self._show_calendar).pack(side="left", padx=(5, 0))
+        self.autosave_switch = ctk.CTkSwitch(top, text="Autosave", width=60)
+        self.autosave_switch.select()
+        self.autosave_switch.pack(side="left", padx=(15, 0))
+        self.busy_label = ctk.CTkLabel(top, text="", width=30, font=("Arial", 14))
+        self.busy_label.pack(side="left", padx=(5, 0))
+        ProfileSwitcher(top, self._switch_profile, width=130).pack(side="left", padx=(10, 0))
+        if PROFILER.enabled:
+            ctk.CTkButton(top, text="⏱", width=40, command=self._show_diagnostics).pack(side="left", padx=(5, 0))
 
         # Scrollable content
         scroll = ctk.CTkScrollableFrame(self)
@@ -142,7 +160,7 @@ class TrackerApp(ctk.CTk):
         mood_slider_row.pack(fill="x", padx=15, pady=5)
 
         self.mood_slider = ctk.CTkSlider(mood_slider_row, from_=1, to=10, number_of_steps=9, width=300,
-                                          command=self._update_mood_label)
+                                          command=self._on_mood_slide)
         self.mood_slider.set(5)
         self.mood_slider.pack(side="left")
 
@@ -163,7 +181,7 @@ class TrackerApp(ctk.CTk):
         disc_slider_row.pack(fill="x", padx=15, pady=5)
 
         self.disc_slider = ctk.CTkSlider(disc_slider_row, from_=0, to=10, number_of_steps=10, width=300,
-                                          command=self._update_disc_label)
+                                          command=self._on_disc_slide)
         self.disc_slider.set(0)
         self.disc_slider.pack(side="left")
 
@@ -183,6 +201,11 @@ class TrackerApp(ctk.CTk):
         self.gym_notes = ctk.CTkTextbox(gym_frame, height=60)
         self.gym_notes.pack(fill="x", padx=15, pady=(5, 10))
 
+        # Typing anywhere in the form queues an autosave
+        for widget in (self.weight_entry, self.sleep_hours, self.sleep_disturbances,
+                       self.calories, self.disc_notes, self.gym_notes):
+            widget.bind("<KeyRelease>", self._schedule_autosave)
+
         # ── BUTTONS ──
         btn_row = ctk.CTkFrame(self, fg_color="transparent")
         btn_row.pack(fill="x", padx=20, pady=(5, 10))
@@ -191,7 +214,10 @@ class TrackerApp(ctk.CTk):
                       height=45, command=self._save_entry).pack(side="left", expand=True, fill="x", padx=(0, 5))
         ctk.CTkButton(btn_row, text="📊  View History", font=("Arial", 15, "bold"),
                       height=45, fg_color="#2d8f4e", hover_color="#236b3c",
-                      command=self._show_history).pack(side="left", expand=True, fill="x", padx=(5, 0))
+                      command=self._show_history).pack(side="left", expand=True, fill="x", padx=5)
+        ctk.CTkButton(btn_row, text="🔍  Search Notes", font=("Arial", 15, "bold"),
+                      height=45, fg_color="#6b4fbb", hover_color="#553f96",
+                      command=self._show_search).pack(side="left", expand=True, fill="x", padx=(5, 0))
 
         # Status bar
         self.status = ctk.CTkLabel(self, text="", font=("Arial", 12))
@@ -225,18 +251,29 @@ class TrackerApp(ctk.CTk):
         v = int(float(value))
         self.disc_value_label.configure(text=str(v))
 
+    def _on_mood_slide(self, value):
+        self._update_mood_label(value)
+        self._schedule_autosave()
+
+    def _on_disc_slide(self, value):
+        self._update_disc_label(value)
+        self._schedule_autosave()
+
     def _prev_day(self):
+        self._flush_autosave()
         self.selected_date -= timedelta(days=1)
         self._update_date_label()
         self._load_entry()
 
     def _next_day(self):
         if self.selected_date < date.today():
+            self._flush_autosave()
             self.selected_date += timedelta(days=1)
             self._update_date_label()
             self._load_entry()
 
     def _go_today(self):
+        self._flush_autosave()
         self.selected_date = date.today()
         self._update_date_label()
         self._load_entry()
@@ -256,254 +293,376 @@ class TrackerApp(ctk.CTk):
 
     # ── DATABASE OPS ─────────────────────────────────────────────────────
 
-    def _save_entry(self):
-        date_str = self.selected_date.isoformat()
+    def _read_form(self):
+        """The form as a DayRecord; raises ValueError naming a field that doesn't parse."""
+        return DayRecord.parse(
+            self.selected_date.isoformat(),
+            sleep_hours=self.sleep_hours.get(),
+            sleep_disturbances=self.sleep_disturbances.get(),
+            calories=self.calories.get(),
+            mood=round(self.mood_slider.get()),
+            discomfort_level=round(self.disc_slider.get()),
+            discomfort_notes=self.disc_notes.get("1.0", "end").strip(),
+            gym_notes=self.gym_notes.get("1.0", "end").strip(),
+            weight_kg=self.weight_entry.get(),
+        )
+
+    def _schedule_autosave(self, event=None):
+        if not self.autosave_switch.get():
+            return
+        if self._autosave_job is not None:
+            self.after_cancel(self._autosave_job)
+        self._autosave_job = self.after(AUTOSAVE_DELAY_MS, self._autosave)
+
+    def _autosave(self):
+        self._autosave_job = None
+        self._save_entry(autosave=True)
+
+    def _flush_autosave(self):
+        """Write any pending autosave now (before navigating away or closing)."""
+        if self._autosave_job is not None:
+            self.after_cancel(self._autosave_job)
+            self._autosave()
+
+    def _save_entry(self, autosave=False):
+        # The form is still blank while a day is loading; saving it would wipe that day
+        if self._loading:
+            if not autosave:
+                self._show_status("⏳ Still loading this day, try again in a moment", "#c9a227")
+            return
+
         try:
-            conn = get_db()
-
-            daily_data = (
-                date_str,
-                self._safe_float(self.sleep_hours.get()),
-                self._safe_int(self.sleep_disturbances.get()),
-                self._safe_int(self.calories.get()),
-                int(float(self.mood_slider.get())),
-                int(float(self.disc_slider.get())),
-                self.disc_notes.get("1.0", "end").strip(),
-                self.gym_notes.get("1.0", "end").strip()
-            )
-
-            conn.execute("""
-                INSERT OR REPLACE INTO daily_log
-                (date, sleep_hours, sleep_disturbances, calories, mood, discomfort_level, discomfort_notes, gym_notes)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, daily_data)
-
-            weight = self._safe_float(self.weight_entry.get())
-            if weight:
-                conn.execute("INSERT OR REPLACE INTO weekly_weight (date, weight_kg) VALUES (?, ?)", (date_str, weight))
-
-            conn.commit()
-            conn.close()
-
-            self._update_sleep_quality()
-            self._show_status(f"✅ Saved entry for {self.selected_date.strftime('%b %d')}! (Database: {DB_PATH})", "#2d8f4e")
-        except Exception as e:
-            self._show_status(f"❌ Save failed: {str(e)}", "#c94040")
-            print(f"Error saving entry: {e}")
-            print(f"Database path: {DB_PATH}")
+            form = self._read_form()
+        except ValueError as e:
+            self._show_status(f"❌ Not saved: {e}", "#c94040")
+            return
+        # A burst of edits that ends where it started costs no write at all
+        if autosave and form == self._last_saved:
+            return
+
+        self._last_saved = form
+        self.day_cache.invalidate(form.date)
+        self._update_sleep_quality()
+        day = self.selected_date.strftime('%b %d')
+        timer = PROFILER.start("autosave" if autosave else "save_entry")
+        self.worker.submit(Database.save_day, form,
+                           callback=lambda _: self._on_saved(day, autosave, timer),
+                           errback=self._on_save_failed)
+
+    def _on_saved(self, day, autosave, timer=None):
+        PROFILER.stop(timer)
+        if autosave:
+            self._show_status(f"💾 Autosaved {day}", "gray")
+        else:
+            self._show_status(f"✅ Saved entry for {day}! (Database: {self.profile.path})", "#2d8f4e")
+
+    def _on_save_failed(self, e):
+        self._last_saved = None  # let the next autosave retry
+        self._show_status(f"❌ Save failed: {str(e)}", "#c94040")
+        print(f"Error saving entry: {e}")
+        print(f"Database path: {self.profile.path}")
 
     def _load_entry(self):
         self._clear_fields()
         date_str = self.selected_date.isoformat()
-        try:
-            conn = get_db()
-
-            row = conn.execute("SELECT * FROM daily_log WHERE date = ?", (date_str,)).fetchone()
-            if row:
-                self._populate_field(self.sleep_hours, row["sleep_hours"])
-                self._populate_field(self.sleep_disturbances, row["sleep_disturbances"])
-                self._populate_field(self.calories, row["calories"])
-                
-                if row["mood"] is not None:
-                    self.mood_slider.set(row["mood"])
-                    self._update_mood_label(row["mood"])
-                
-                if row["discomfort_level"] is not None:
-                    self.disc_slider.set(row["discomfort_level"])
-                    self._update_disc_label(row["discomfort_level"])
-                
-                self._populate_textbox(self.disc_notes, row["discomfort_notes"])
-                self._populate_textbox(self.gym_notes, row["gym_notes"])
-                self._update_sleep_quality()
-
-            weight_row = conn.execute("SELECT * FROM weekly_weight WHERE date = ?", (date_str,)).fetchone()
-            if weight_row:
-                self.weight_entry.insert(0, str(weight_row["weight_kg"]))
-
-            conn.close()
-        except Exception as e:
-            print(f"Error loading entry: {e}")
-            print(f"Database path: {DB_PATH}")
+        profile = self.profile
+        self._load_timer = PROFILER.start("load_entry")
+        cached = self.day_cache.get(date_str)
+        if cached is not None:
+            self._apply_entry(profile, date_str, cached)
+        else:
+            self._loading = True
+            token = self.day_cache.begin_fill()
+            self.worker.submit(Database.load_day, date_str,
+                               callback=lambda result: self._on_day_loaded(profile, token, date_str, result),
+                               errback=lambda e: self._on_load_failed(profile, e))
+        self._prefetch_around(self.selected_date)
+
+    def _on_day_loaded(self, profile, token, date_str, result):
+        profile.day_cache.fill(token, {date_str: result})
+        self._apply_entry(profile, date_str, result)
+
+    def _prefetch_around(self, day):
+        # Queued behind the visible day's load, so stepping with ◀ / ▶ hits the cache
+        window = self.day_cache.prefetch_window(day)
+        if window is None:
+            return
+        cache = self.day_cache
+        token = cache.begin_fill()
+        self.worker.submit(Database.load_range, *window,
+                           callback=lambda days: cache.fill(token, days, *window),
+                           errback=lambda e: self._on_prefetch_failed(cache, e))
+
+    def _on_prefetch_failed(self, cache, e):
+        cache.abandon_fill()
+        print(f"Error prefetching entries: {e}")
+
+    def _apply_entry(self, profile, date_str, record):
+        # Ignore answers for days (or profiles) the user has already moved away from
+        if profile is not self.profile or date_str != self.selected_date.isoformat():
+            return
+        self._loading = False
+        PROFILER.stop(self._load_timer)
+        self._load_timer = None
+
+        self._populate_field(self.sleep_hours, record.sleep_hours)
+        self._populate_field(self.sleep_disturbances, record.sleep_disturbances)
+        self._populate_field(self.calories, record.calories)
+
+        if record.mood is not None:
+            self.mood_slider.set(record.mood)
+            self._update_mood_label(record.mood)
+
+        if record.discomfort_level is not None:
+            self.disc_slider.set(record.discomfort_level)
+            self._update_disc_label(record.discomfort_level)
+
+        self._populate_textbox(self.disc_notes, record.discomfort_notes)
+        self._populate_textbox(self.gym_notes, record.gym_notes)
+        self._update_sleep_quality()
+        self._populate_field(self.weight_entry, record.weight_kg)
+
+        self._last_saved = self._read_form()
+
+    def _on_load_failed(self, profile, e):
+        profile.day_cache.abandon_fill()
+        if profile is not self.profile:
+            return
+        self._loading = False
+        self._last_saved = self._read_form()
+        print(f"Error loading entry: {e}")
+        print(f"Database path: {self.profile.path}")
 
     def _update_sleep_quality(self):
-        hours = self._safe_float(self.sleep_hours.get())
-        disturbances = self._safe_int(self.sleep_disturbances.get())
-        
-        if hours is None:
+        try:
+            quality = classify_sleep(parse_field("sleep_hours", self.sleep_hours.get()),
+                                     parse_field("sleep_disturbances", self.sleep_disturbances.get()))
+        except ValueError:
             return
-        
-        if hours >= 7 and (disturbances is None or disturbances <= 1):
-            self.sleep_quality_label.configure(text="✅ Good sleep!", text_color="#2d8f4e")
-        elif hours >= 6:
-            self.sleep_quality_label.configure(text="⚠️ Okay sleep", text_color="#c9a227")
-        else:
-            self.sleep_quality_label.configure(text="❌ Poor sleep", text_color="#c94040")
+        if quality is None:
+            return
+        self.sleep_quality_label.configure(text=SLEEP_QUALITY_TEXT[quality],
+                                           text_color=SLEEP_QUALITY_COLORS[quality])
 
     # ── HISTORY WINDOW ───────────────────────────────────────────────────
 
     def _show_history(self):
-        win = ctk.CTkToplevel(self)
-        win.title("📊 History - Last 14 Days")
+        self._flush_autosave()
+        win = self.history_window
+        if win is not None and win.winfo_exists():
+            win.deiconify()
+            win.lift()
+            win.focus()
+            self._render_history(self._history_range)
+            return
+
+        win = self.history_window = ctk.CTkToplevel(self)
         win.geometry("1100x700")
-        win.grab_set()
+        # Closing only hides the window: reopening reuses every widget and
+        # redraws just what changed since it was last shown
+        win.protocol("WM_DELETE_WINDOW", win.withdraw)
+
+        controls = ctk.CTkFrame(win, fg_color="transparent")
+        controls.pack(fill="x", padx=10, pady=(10, 0))
+
+        self._history_content = ctk.CTkFrame(win, fg_color="transparent")
+        self._history_content.pack(fill="both", expand=True)
+        self._history_view = None       # chart widgets, built with the first data
+        self._history_version = None    # data version they show
+
+        ctk.CTkLabel(controls, text="Range:", font=("Arial", 13, "bold")).pack(side="left", padx=(0, 10))
+        selector = ctk.CTkSegmentedButton(controls, values=list(HISTORY_RANGES), command=self._render_history)
+        selector.set(DEFAULT_RANGE)
+        selector.pack(side="left")
+
+        self._render_history(DEFAULT_RANGE)
+
+    def _render_history(self, range_key):
+        self._history_range = range_key
+        self.history_window.title(f"📊 History - {RANGE_TITLES[range_key]}")
+        if self._history_view is None:
+            self._clear_history()
+            ctk.CTkLabel(self._history_content, text="⏳ Loading…", font=("Arial", 16)).pack(expand=True)
+
+        timer = PROFILER.start(f"show_history {range_key}")
+        profile = self.profile
+        self.worker.submit(fetch_history, range_key, self._history_version,
+                           callback=lambda result: self._history_loaded(timer, profile, range_key, result),
+                           errback=lambda e: self._history_failed(timer, e))
+
+    def _history_loaded(self, timer, profile, range_key, result):
+        # None: nothing changed since the window last showed this range.
+        # Answers for a range or profile the user has since left are dropped.
+        if result is not None and profile is self.profile and range_key == self._history_range:
+            self._fill_history(*result)
+        PROFILER.stop(timer)
+
+    def _clear_history(self):
+        for child in self._history_content.winfo_children():
+            child.destroy()
+        self._history_view = None
+        self._history_version = None
+
+    def _fill_history(self, version, bucket, rows, summary, trends, sleep):
+        if not self.history_window.winfo_exists():
+            return
 
-        try:
-            conn = get_db()
-            rows = conn.execute("""
-                SELECT d.*, w.weight_kg
-                FROM daily_log d
-                LEFT JOIN weekly_weight w ON d.date = w.date
-                ORDER BY d.date DESC
-                LIMIT 14
-            """).fetchall()
-            conn.close()
-
-            if not rows:
-                ctk.CTkLabel(win, text="No entries yet! Start logging today.",
-                             font=("Arial", 16)).pack(expand=True)
-                return
-
-            scroll = ctk.CTkScrollableFrame(win)
-            scroll.pack(fill="both", expand=True, padx=10, pady=10)
+        if not rows:
+            self._clear_history()
+            ctk.CTkLabel(self._history_content, text="No entries yet! Start logging today.",
+                         font=("Arial", 16)).pack(expand=True)
+            self._history_version = version
+            return
 
-            self._add_summary(scroll, rows)
-            self._add_charts(scroll, rows)
-        except Exception as e:
-            ctk.CTkLabel(win, text=f"Error loading history: {str(e)}\n\nDatabase path: {DB_PATH}",
-                         font=("Arial", 12)).pack(expand=True, padx=20, pady=20)
+        if self._history_view is None:
+            self._clear_history()
+            scroll = ctk.CTkScrollableFrame(self._history_content)
+            scroll.pack(fill="both", expand=True, padx=10, pady=10)
+            self._history_view = {"summary": self._add_summary(scroll), "trends": self._add_trends(scroll),
+                                  **self._add_sleep_quality(scroll), **self._add_charts(scroll)}
+        self._history_version = version
+
+        view = self._history_view
+        view["summary"].configure(text=self._summary_text(summary))
+        view["trends"].configure(text="\n".join(trends))
+        self._update_sleep_history(view, *sleep)
+        self._update_charts(view, rows, bucket)
+
+    def _history_failed(self, timer, e):
+        PROFILER.stop(timer)
+        if not self.history_window.winfo_exists():
+            return
+        self._clear_history()
+        ctk.CTkLabel(self._history_content,
+                     text=f"Error loading history: {str(e)}\n\nDatabase path: {self.profile.path}",
+                     font=("Arial", 12)).pack(expand=True, padx=20, pady=20)
 
-    def _add_summary(self, parent, rows):
+    def _add_summary(self, parent):
         summary = ctk.CTkFrame(parent)
         summary.pack(fill="x", pady=(0, 10))
 
         ctk.CTkLabel(summary, text="📈 Summary", font=("Arial", 16, "bold")).pack(anchor="w", padx=10, pady=(10, 5))
+        label = ctk.CTkLabel(summary, text="", font=("Arial", 12))
+        label.pack(anchor="w", padx=10, pady=(0, 10))
+        return label
 
-        def avg(values):
-            return sum(values) / len(values) if values else 0
-        
-        sleep_vals = [r["sleep_hours"] for r in rows if r["sleep_hours"]]
-        cal_vals = [r["calories"] for r in rows if r["calories"]]
-        mood_vals = [r["mood"] for r in rows if r["mood"]]
-        disc_vals = [r["discomfort_level"] for r in rows if r["discomfort_level"] is not None]
-
+    def _summary_text(self, averages):
         stats = []
-        if sleep_vals:
-            stats.append(f"Avg Sleep: {avg(sleep_vals):.1f}h")
-        if cal_vals:
-            stats.append(f"Avg Calories: {int(avg(cal_vals))}")
-        if mood_vals:
-            stats.append(f"Avg Mood: {avg(mood_vals):.1f}/10")
-        if disc_vals:
-            stats.append(f"Avg Discomfort: {avg(disc_vals):.1f}/10")
-
-        conn = get_db()
-        weights = conn.execute("SELECT weight_kg FROM weekly_weight ORDER BY date DESC LIMIT 4").fetchall()
-        conn.close()
-        if len(weights) >= 2:
-            diff = weights[0]["weight_kg"] - weights[-1]["weight_kg"]
+        if averages["sleep_hours"] is not None:
+            stats.append(f"Avg Sleep: {averages['sleep_hours']:.1f}h")
+        if averages["calories"] is not None:
+            stats.append(f"Avg Calories: {int(averages['calories'])}")
+        if averages["mood"] is not None:
+            stats.append(f"Avg Mood: {averages['mood']:.1f}/10")
+        if averages["discomfort_level"] is not None:
+            stats.append(f"Avg Discomfort: {averages['discomfort_level']:.1f}/10")
+
+        if averages["weight_trend"]:
+            diff, count = averages["weight_trend"]
             direction = "📉" if diff < 0 else "📈" if diff > 0 else "➡️"
-            stats.append(f"Weight trend: {direction} {abs(diff):.1f}kg over {len(weights)} entries")
-
-        ctk.CTkLabel(summary, text="  |  ".join(stats) if stats else "Not enough data yet.",
-                     font=("Arial", 12)).pack(anchor="w", padx=10, pady=(0, 10))
-
-    def _add_charts(self, parent, rows):
-        rows_asc = list(reversed(rows))
-        
-        # Sleep Chart
-        self._create_chart(parent, "😴 Sleep Hours", rows_asc, "sleep_hours", "#3b82f6", max_val=12)
-        
-        # Mood Chart
-        self._create_chart(parent, "🧠 Mood", rows_asc, "mood", "#10b981", max_val=10)
-        
-        # Discomfort Chart
-        self._create_chart(parent, "🩹 Discomfort", rows_asc, "discomfort_level", "#ef4444", max_val=10)
-        
-        # Calories Chart
-        self._create_chart(parent, "🍽️ Calories", rows_asc, "calories", "#f59e0b", max_val=3000)
-
-    def _create_chart(self, parent, title, rows, field, color, max_val):
-        frame = ctk.CTkFrame(parent)
-        frame.pack(fill="x", pady=(0, 15))
-        
-        ctk.CTkLabel(frame, text=title, font=("Arial", 14, "bold")).pack(anchor="w", padx=10, pady=(10, 5))
-        
-        chart_frame = ctk.CTkFrame(frame, height=120)
-        chart_frame.pack(fill="x", padx=10, pady=(0, 10))
-        chart_frame.pack_propagate(False)
-
-        BAR_MAX_HEIGHT = 80
-
-        for row in rows:
-            val = row[field]
-
-            # Container per day (DO NOT use fill="both")
-            bar_container = ctk.CTkFrame(chart_frame, fg_color="transparent")
-            bar_container.pack(side="left", expand=True, padx=2)
-
-            # ─── HANDLE NONE VALUES (Placeholder Column) ───
-            if val is None:
-                ctk.CTkFrame(
-                    bar_container,
-                    width=30,
-                    height=BAR_MAX_HEIGHT,
-                    fg_color="transparent"
-                ).pack()
-
-                date_str = datetime.fromisoformat(row["date"]).strftime("%m/%d")
-                ctk.CTkLabel(
-                    bar_container,
-                    text="–",
-                    font=("Arial", 9),
-                    text_color="gray"
-                ).pack(pady=(2, 0))
-
-                ctk.CTkLabel(
-                    bar_container,
-                    text=date_str,
-                    font=("Arial", 8),
-                    text_color="gray"
-                ).pack()
-
-                continue
-
-            # ─── NORMAL BAR CALCULATION ───
-            bar_height = int((val / max_val) * BAR_MAX_HEIGHT) if max_val > 0 else 0
-            bar_height = max(2, min(bar_height, BAR_MAX_HEIGHT))  # Clamp AFTER calculation
-            spacer_height = BAR_MAX_HEIGHT - bar_height  # Derived from clamped value
-
-            # Spacer (top empty part)
-            ctk.CTkFrame(
-                bar_container,
-                width=30,
-                height=spacer_height,
-                fg_color="transparent"
-            ).pack()
-
-            # Actual bar
-            ctk.CTkFrame(
-                bar_container,
-                width=30,
-                height=bar_height,
-                fg_color=color,
-                corner_radius=3
-            ).pack()
-
-            # Value label
-            ctk.CTkLabel(
-                bar_container,
-                text=str(int(val) if isinstance(val, (int, float)) else val),
-                font=("Arial", 9, "bold")
-            ).pack(pady=(2, 0))
-
-            # Date label
-            date_str = datetime.fromisoformat(row["date"]).strftime("%m/%d")
-            ctk.CTkLabel(
-                bar_container,
-                text=date_str,
-                font=("Arial", 8),
-                text_color="gray"
-            ).pack()
+            stats.append(f"Weight trend: {direction} {abs(diff):.1f}kg over {count} entries")
+
+        return "  |  ".join(stats) if stats else "Not enough data yet."
+
+    def _add_trends(self, parent):
+        trends = ctk.CTkFrame(parent)
+        trends.pack(fill="x", pady=(0, 10))
+
+        ctk.CTkLabel(trends, text="🔎 Trends (all data)", font=("Arial", 16, "bold")).pack(anchor="w", padx=10, pady=(10, 5))
+        label = ctk.CTkLabel(trends, text="", font=("Arial", 12), justify="left")
+        label.pack(anchor="w", padx=10, pady=(0, 10))
+        return label
+
+    def _add_sleep_quality(self, parent):
+        heatmap = CalendarHeatmap(parent, "😴 Sleep Quality (click a day to open it)", on_click=self._go_to_date)
+        heatmap.pack(fill="x", pady=(0, 10))
+        breakdown = ctk.CTkLabel(heatmap, text="", font=("Arial", 12))
+        breakdown.pack(anchor="w", padx=10, pady=(0, 10))
+        good = self._create_chart(parent, "✅ Good Nights per Month (%)", "#2d8f4e", max_val=100, date_format="%b %y")
+        return {"heatmap": heatmap, "breakdown": breakdown, "good": good}
+
+    def _update_sleep_history(self, view, since, nights, months):
+        with PROFILER.span("chart: sleep_quality heatmap"):
+            view["heatmap"].set_data(date.fromisoformat(since), date.today(),
+                                     {night["date"]: SLEEP_QUALITY_COLORS[night["sleep_quality"]] for night in nights})
+        view["breakdown"].configure(text=sleep_quality_breakdown(months))
+        with PROFILER.span("chart: good"):
+            view["good"].set_data([(m["month"], round(100 * m["good"] / m["nights"])) for m in months if m["nights"]])
+
+    def _add_charts(self, parent):
+        return {field: self._create_chart(parent, title, color, max_val)
+                for field, title, color, max_val in HISTORY_CHARTS}
+
+    def _update_charts(self, view, rows, bucket="day"):
+        suffix = {"day": "", "week": " (weekly avg)", "month": " (monthly avg)"}[bucket]
+        date_format = "%b %y" if bucket == "month" else "%m/%d"
+
+        for field, title, _, _ in HISTORY_CHARTS:
+            chart = view[field]
+            with PROFILER.span(f"chart: {field}"):
+                chart.title_label.configure(text=title + suffix)
+                chart.renderer.date_format = date_format
+                chart.set_data([(row["date"], row[field]) for row in rows])
+
+    def _create_chart(self, parent, title, color, max_val, date_format="%m/%d"):
+        chart = BarChart(parent, title, color, max_val, date_format=date_format,
+                         value_format=lambda val: str(int(val) if isinstance(val, (int, float)) else val))
+        chart.pack(fill="x", pady=(0, 15))
+        return chart
+
+    # ── PROFILES ─────────────────────────────────────────────────────────
+
+    @property
+    def worker(self):
+        return self.profile.worker
+
+    @property
+    def day_cache(self):
+        return self.profile.day_cache
+
+    def _switch_profile(self, name):
+        # Pending edits belong to the profile they were typed into
+        self._flush_autosave()
+        self.profile = open_profile(self.profiles, name)
+        for window in (self.search_window, self.calendar_window, self.history_window):
+            if window is not None and window.winfo_exists():
+                window.destroy()
+        self.title("Daily Tracker" if name == DEFAULT_PROFILE else f"Daily Tracker - {name}")
+        self._loading = False
+        self._load_entry()
+
+    # ── DIAGNOSTICS ──────────────────────────────────────────────────────
+
+    def _show_diagnostics(self):
+        if self.diagnostics_window is not None and self.diagnostics_window.winfo_exists():
+            self.diagnostics_window.focus()
+            return
+        # Only reachable with profiling switched on, so not imported otherwise
+        from tracker_diagnostics import DiagnosticsWindow
+
+        self.diagnostics_window = DiagnosticsWindow(self)
+
+    # ── CALENDAR ─────────────────────────────────────────────────────────
+
+    def _show_calendar(self):
+        if self.calendar_window is not None and self.calendar_window.winfo_exists():
+            self.calendar_window.focus()
+            return
+        self.calendar_window = CalendarWindow(self, self.worker, self._go_to_date)
+
+    # ── SEARCH ───────────────────────────────────────────────────────────
+
+    def _show_search(self):
+        if self.search_window is not None and self.search_window.winfo_exists():
+            self.search_window.focus()
+            return
+        self.search_window = SearchWindow(self, self.worker, self._go_to_date)
+
+    def _go_to_date(self, date_str):
+        self._flush_autosave()
+        self.selected_date = date.fromisoformat(date_str)
+        self._update_date_label()
+        self._load_entry()
 
     # ── UTILITIES ────────────────────────────────────────────────────────
 
@@ -515,6 +674,14 @@ class TrackerApp(ctk.CTk):
         if value:
             widget.insert("1.0", value)
     
+    def _on_close(self):
+        self._flush_autosave()
+        self.profiles.close()
+        self.destroy()
+
+    def _set_busy(self, busy):
+        self.busy_label.configure(text="⏳" if busy else "")
+
     def _show_status(self, message, color):
         self.status.configure(text=message, text_color=color)
         self.after(3000, lambda: self.status.configure(text=""))
@@ -531,18 +698,6 @@ class TrackerApp(ctk.CTk):
             return f"🟠 {val}"
         return f"🔴 {val}"
 
-    def _safe_float(self, val):
-        try:
-            return float(val)
-        except (ValueError, TypeError):
-            return None
-
-    def _safe_int(self, val):
-        try:
-            return int(val)
-        except (ValueError, TypeError):
-            return None
-
 
 # ─── ENTRY POINT ─────────────────────────────────────────────────────────────
 
@@ -1,22 +1,79 @@
+
 # daily_log.py - runs in terminal
+#
+# log.json is a snapshot of every entry; each day logged since then is one
+# line appended to log.jsonl. Startup reads both, in order, into one dict
+# (later lines win), and every COMPACT_AFTER appends the dict is written
+# back out as a new snapshot and the journal starts over.
 import json
+import os
 from datetime import date
 
 LOG_FILE = "log.json"
+JOURNAL_FILE = os.path.splitext(LOG_FILE)[0] + ".jsonl"
+COMPACT_AFTER = 50
 
 def load_log():
+    """Return (log, journal lines replayed) from the snapshot plus the journal."""
+    try:
+        with open(LOG_FILE, "r", encoding="utf-8") as f:
+            log = json.load(f)
+    except FileNotFoundError:
+        log = {}
+
+    replayed = 0
+    good_end = 0
     try:
-        with open(LOG_FILE, "r") as f:
-            return json.load(f)
+        with open(JOURNAL_FILE, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break   # torn by a crash mid-append
+                good_end += len(line)
+                try:
+                    record = json.loads(line)
+                    log[record["date"]] = record["entry"]
+                except (ValueError, KeyError, TypeError):
+                    continue
+                replayed += 1
+            torn = f.tell() > good_end
     except FileNotFoundError:
-        return {}
+        return log, 0
+    if torn:
+        # Cut the partial line off, or the next append would be glued to it
+        with open(JOURNAL_FILE, "r+b") as f:
+            f.truncate(good_end)
+    return log, replayed
+
+def append_entry(day, entry):
+    """Journal one entry; it is on disk when this returns."""
+    with open(JOURNAL_FILE, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"date": day, "entry": entry}) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+def _fsync_dir(path):
+    # Makes the rename itself durable; directories can't be opened on Windows
+    if os.name == "posix":
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
 
 def save_log(log):
-    with open(LOG_FILE, "w") as f:
+    """Write a new snapshot atomically, then empty the journal it replaces."""
+    tmp = LOG_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
         json.dump(log, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, LOG_FILE)
+    _fsync_dir(LOG_FILE)
+    # A crash before this point just replays entries the snapshot already has
+    open(JOURNAL_FILE, "w").close()
 
 def main():
-    log = load_log()
+    log, journaled = load_log()
     today = str(date.today())
     
     print(f"\n📋 Daily Log - {today}\n")
@@ -29,7 +86,9 @@ def main():
     }
     
     log[today] = entry
-    save_log(log)
+    append_entry(today, entry)
+    if journaled + 1 >= COMPACT_AFTER or not os.path.exists(LOG_FILE):
+        save_log(log)
     print("\n✅ Logged!")
 
 if __name__ == "__main__":
@@ -0,0 +1,53 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from tracker_db import SCHEMA_VERSION, Database
+
+
+class TypedTablesMigrationTest(unittest.TestCase):
+    """v1 -> current on a file as the apps wrote it before schema versions."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "v1.db")
+        conn = sqlite3.connect(self.path)
+        conn.execute("""CREATE TABLE daily_log (
+            date TEXT PRIMARY KEY, sleep_hours REAL, sleep_disturbances INTEGER, calories INTEGER,
+            mood INTEGER, discomfort_level INTEGER, discomfort_notes TEXT, gym_notes TEXT)""")
+        conn.execute("CREATE TABLE weekly_weight (date TEXT PRIMARY KEY, weight_kg REAL)")
+        conn.executemany("INSERT INTO daily_log (date, calories, mood, gym_notes) VALUES (?, ?, ?, ?)", [
+            ("2026-01-01", 2000, 7, "squats"),      # valid
+            ("2026-01-02", 1800, 42, ""),           # mood out of range: carried over without it
+            ("2026-1-3", 1900, 6, ""),              # not an ISO date: can't be carried over
+            (None, 2100, 5, "no date"),             # NULL date: can't be carried over
+        ])
+        conn.executemany("INSERT INTO weekly_weight (date, weight_kg) VALUES (?, ?)", [
+            ("2026-01-01", 80.5),
+            (None, 81.0),
+        ])
+        conn.commit()
+        conn.close()
+
+    def test_every_row_is_kept_somewhere(self):
+        db = Database(self.path)
+        self.addCleanup(db.close)
+        conn = db.conn
+        self.assertEqual(conn.execute("PRAGMA user_version").fetchone()[0], SCHEMA_VERSION)
+
+        days = conn.execute("SELECT date, mood FROM daily_log ORDER BY date").fetchall()
+        self.assertEqual([tuple(row) for row in days], [("2026-01-01", 7), ("2026-01-02", None)])
+        invalid = conn.execute("SELECT date, mood, gym_notes FROM daily_log_invalid ORDER BY date").fetchall()
+        self.assertEqual([tuple(row) for row in invalid],
+                         [(None, 5, "no date"), ("2026-01-02", 42, ""), ("2026-1-3", 6, "")])
+
+        weights = conn.execute("SELECT date, weight_kg FROM weekly_weight").fetchall()
+        self.assertEqual([tuple(row) for row in weights], [("2026-01-01", 80.5)])
+        invalid = conn.execute("SELECT date, weight_kg FROM weekly_weight_invalid").fetchall()
+        self.assertEqual([tuple(row) for row in invalid], [(None, 81.0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
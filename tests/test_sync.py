@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+
+from tracker_db import Database
+from tracker_io import import_rows
+from tracker_record import DayRecord
+from tracker_sync import sync_directory
+
+
+class JournalTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def open(self, name):
+        db = Database(os.path.join(self.tmp.name, name))
+        self.addCleanup(db.close)
+        return db
+
+    def journal(self, db, date_str, field):
+        return db.conn.execute(
+            "SELECT value FROM change_log WHERE date = ? AND field = ? ORDER BY seq", (date_str, field)
+        ).fetchall()
+
+    def test_back_to_back_writes_to_one_field(self):
+        # Many of these land in the same millisecond, i.e. the same stamp
+        db = self.open("a.db")
+        for calories in range(200):
+            db.update_day("2026-10-17", calories=calories)
+        for calories in range(200):
+            db.save_day(DayRecord("2026-10-17", calories=calories))
+        self.assertEqual(db.load_day("2026-10-17").calories, 199)
+        self.assertEqual(self.journal(db, "2026-10-17", "calories")[-1][0], 199)
+
+    def test_import_replace_with_a_repeated_date(self):
+        db = self.open("a.db")
+        records = iter([DayRecord("2026-01-01", calories=1), DayRecord("2026-01-01", calories=2)])
+        self.assertEqual(import_rows(db, records, replace=True), 2)
+        self.assertEqual(db.load_day("2026-01-01").calories, 2)
+
+    def test_new_row_does_not_journal_default_notes(self):
+        db = self.open("a.db")
+        db.update_day("2026-10-17", mood=7)
+        self.assertEqual(self.journal(db, "2026-10-17", "gym_notes"), [])
+        self.assertEqual(self.journal(db, "2026-10-17", "discomfort_notes"), [])
+
+    def test_merge_keeps_a_note_from_the_other_copy(self):
+        # b creates the day later, with only a mood: a's note must survive
+        a, b = self.open("a.db"), self.open("b.db")
+        folder = os.path.join(self.tmp.name, "sync")
+        a.update_day("2026-10-10", gym_notes="bench")
+        b.update_day("2026-10-10", mood=7)
+        for _ in range(2):
+            sync_directory(a, folder)
+            sync_directory(b, folder)
+        for db in (a, b):
+            record = db.load_day("2026-10-10")
+            self.assertEqual((record.gym_notes, record.mood), ("bench", 7))
+
+
+if __name__ == "__main__":
+    unittest.main()
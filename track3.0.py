@@ -1,16 +1,24 @@
+import os
 import sys
+import time
 import traceback
+
+STARTED = time.perf_counter()
+
 import customtkinter as ctk
-from datetime import datetime, date, timedelta
-import sqlite3
-import os
+from datetime import date, timedelta
+
+from tracker_db import DB_PATH, DEFAULT_PROFILE, DEFAULT_RANGE, HISTORY_RANGES, Database
+from tracker_profiles import ProfileSet, ProfileSwitcher
+from tracker_profiling import PROFILER
+from tracker_record import DayRecord
+
+IMPORTED = time.perf_counter()
 
 # ─────────────────────────────────────────────────────
 # CONFIG
 # ─────────────────────────────────────────────────────
 
-DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tracker.db")
-
 MOOD_EMOJIS = {
     1: "😩", 2: "😢", 3: "😟", 4: "😕", 5: "😐",
     6: "🙂", 7: "😊", 8: "😄", 9: "🤩", 10: "🔥"
@@ -18,37 +26,45 @@ MOOD_EMOJIS = {
 
 BAR_MAX_HEIGHT = 80
 
+AUTOSAVE_DELAY_MS = 800
+
+# The DayRecord fields this form edits. Saves only ever write these, so
+# discomfort notes from Track2.0 or the API are left alone.
+FORM_FIELDS = ("sleep_hours", "sleep_disturbances", "calories", "mood",
+               "discomfort_level", "gym_notes", "weight_kg")
+
+BUCKET_SUFFIXES = {"day": "", "week": " · weekly avg", "month": " · monthly avg"}
+
+# `track3.0.py --startup-timing` reports where cold start goes, then exits.
+# The report is appended to STARTUP_LOG, next to the database (and so next
+# to the .exe in the windowed build, which has no console to print to).
+STARTUP_TIMING = "--startup-timing" in sys.argv
+STARTUP_LOG = os.path.join(os.path.dirname(DB_PATH), "tracker_startup.log")
+
 # ─────────────────────────────────────────────────────
 # DATABASE
 # ─────────────────────────────────────────────────────
 
-def get_db():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
-
-
-def init_db():
-    conn = get_db()
-    conn.executescript("""
-        CREATE TABLE IF NOT EXISTS daily_log (
-            date TEXT PRIMARY KEY,
-            sleep_hours REAL,
-            sleep_disturbances INTEGER,
-            calories INTEGER,
-            mood INTEGER,
-            discomfort_level INTEGER,
-            discomfort_notes TEXT,
-            gym_notes TEXT
-        );
-
-        CREATE TABLE IF NOT EXISTS weekly_weight (
-            date TEXT PRIMARY KEY,
-            weight_kg REAL
-        );
-    """)
-    conn.commit()
-    conn.close()
+def fetch_history(db, range_key, known=None):
+    # Runs on the DB worker thread, so History is a single queued request.
+    # Returns None when the window already shows version known of this range.
+    # Gym notes are only counted here; the notes list pages them in itself.
+    version = (db.data_version(), date.today(), range_key)
+    if version == known:
+        return None
+
+    from tracker_analytics import analyze, describe
+
+    bucket, daily_rows, weight_rows = db.history(range_key)
+    start = db.range_start(range_key)
+    trends = describe(analyze(db))
+    return (version, bucket, daily_rows, weight_rows, start, db.count_gym_notes(start), trends,
+            db.sleep_quality(start))
+
+
+def save_fields(db, date_str, changed):
+    # The worker passes positional arguments only
+    return db.update_day(date_str, **changed)
 
 
 # ─────────────────────────────────────────────────────
@@ -58,6 +74,8 @@ def init_db():
 class TrackerApp(ctk.CTk):
 
     def __init__(self):
+        self.timings = [("imports", IMPORTED - STARTED)]
+        mark = time.perf_counter()
         super().__init__()
 
         self.title("Daily Tracker")
@@ -66,17 +84,42 @@ class TrackerApp(ctk.CTk):
         ctk.set_appearance_mode("dark")
         ctk.set_default_color_theme("blue")
 
-        init_db()
-
         self.selected_date = date.today()
-
-        self.build_ui()
+        self.autosave_job = None
+        self.last_saved = None
+        self.loading = False
+        # A slider only counts as data once it was loaded or moved for this day
+        self.mood_set = False
+        self.disc_set = False
+        self.search_window = None
+        self.calendar_window = None
+        self.history_window = None
+        self.history_range = DEFAULT_RANGE
+        self.diagnostics_window = None
+        self.load_timer = None
+        self.first_load = None
+        mark = self.time_stage("window", mark)
+
+        # The date bar goes up first and is painted before the rest of the form exists
+        self.build_top_bar()
         self.update_date_label()
+        self.update_idletasks()
+        mark = self.time_stage("date bar", mark)
+
+        self.profiles = ProfileSet(self, on_busy=self.set_busy)
+        self.profile = self.profiles.open(DEFAULT_PROFILE)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        mark = self.time_stage("db open", mark)
+
+        self.build_form()
+        mark = self.time_stage("form", mark)
+
+        self.first_load = mark
         self.load_entry()
 
     # ───────────────── UI ─────────────────
 
-    def build_ui(self):
+    def build_top_bar(self):
 
         top = ctk.CTkFrame(self)
         top.pack(fill="x", padx=20, pady=15)
@@ -86,6 +129,17 @@ class TrackerApp(ctk.CTk):
         self.date_label.pack(side="left", expand=True)
         ctk.CTkButton(top, text="▶", width=40, command=self.next_day).pack(side="left")
         ctk.CTkButton(top, text="Today", command=self.go_today).pack(side="left", padx=10)
+        ctk.CTkButton(top, text="📅", width=40, command=self.show_calendar).pack(side="left", padx=(0, 10))
+        self.autosave_switch = ctk.CTkSwitch(top, text="Autosave")
+        self.autosave_switch.select()
+        self.autosave_switch.pack(side="left")
+        self.busy_label = ctk.CTkLabel(top, text="", width=30)
+        self.busy_label.pack(side="left", padx=5)
+        ProfileSwitcher(top, self.switch_profile, width=130).pack(side="left", padx=5)
+        if PROFILER.enabled:
+            ctk.CTkButton(top, text="⏱", width=40, command=self.show_diagnostics).pack(side="left", padx=5)
+
+    def build_form(self):
 
         scroll = ctk.CTkScrollableFrame(self)
         scroll.pack(fill="both", expand=True, padx=20, pady=10)
@@ -118,7 +172,7 @@ class TrackerApp(ctk.CTk):
 
         self.mood_slider = ctk.CTkSlider(
             mood_frame, from_=1, to=10, number_of_steps=9,
-            command=self.update_mood
+            command=self.on_mood_slide
         )
         self.mood_slider.set(5)
         self.mood_slider.pack(pady=5)
@@ -131,7 +185,7 @@ class TrackerApp(ctk.CTk):
 
         self.disc_slider = ctk.CTkSlider(
             disc_frame, from_=0, to=10, number_of_steps=10,
-            command=self.update_disc
+            command=self.on_disc_slide
         )
         self.disc_slider.set(0)
         self.disc_slider.pack(pady=5)
@@ -144,12 +198,17 @@ class TrackerApp(ctk.CTk):
         self.gym_notes = ctk.CTkTextbox(gym_frame, height=60)
         self.gym_notes.pack(fill="x", pady=5)
 
+        for widget in (self.weight_entry, self.sleep_hours, self.sleep_disturbances,
+                       self.calories, self.gym_notes):
+            widget.bind("<KeyRelease>", self.schedule_autosave)
+
         # Buttons
         bottom = ctk.CTkFrame(self)
         bottom.pack(fill="x", padx=20, pady=10)
 
         ctk.CTkButton(bottom, text="💾 Save", command=self.save_entry).pack(side="left", expand=True, fill="x", padx=5)
         ctk.CTkButton(bottom, text="📊 History", command=self.show_history).pack(side="left", expand=True, fill="x", padx=5)
+        ctk.CTkButton(bottom, text="🔍 Search", command=self.show_search).pack(side="left", expand=True, fill="x", padx=5)
 
         self.status = ctk.CTkLabel(self, text="")
         self.status.pack(pady=5)
@@ -174,17 +233,20 @@ class TrackerApp(ctk.CTk):
         self.date_label.configure(text=self.selected_date.strftime("%A %d %B %Y"))
 
     def prev_day(self):
+        self.flush_autosave()
         self.selected_date -= timedelta(days=1)
         self.update_date_label()
         self.load_entry()
 
     def next_day(self):
         if self.selected_date < date.today():
+            self.flush_autosave()
             self.selected_date += timedelta(days=1)
             self.update_date_label()
             self.load_entry()
 
     def go_today(self):
+        self.flush_autosave()
         self.selected_date = date.today()
         self.update_date_label()
         self.load_entry()
@@ -199,239 +261,469 @@ class TrackerApp(ctk.CTk):
         v = int(float(val))
         self.disc_label.configure(text=str(v))
 
+    def on_mood_slide(self, val):
+        self.mood_set = True
+        self.update_mood(val)
+        self.schedule_autosave()
+
+    def on_disc_slide(self, val):
+        self.disc_set = True
+        self.update_disc(val)
+        self.schedule_autosave()
+
+    # ───────────────── Autosave ─────────────────
+
+    def schedule_autosave(self, event=None):
+        # Restart the timer on every change so a burst of edits is one write
+        if not self.autosave_switch.get():
+            return
+        if self.autosave_job is not None:
+            self.after_cancel(self.autosave_job)
+        self.autosave_job = self.after(AUTOSAVE_DELAY_MS, self.autosave)
+
+    def autosave(self):
+        self.autosave_job = None
+        self.save_entry(autosave=True)
+
+    def flush_autosave(self):
+        if self.autosave_job is not None:
+            self.after_cancel(self.autosave_job)
+            self.autosave()
+
     # ───────────────── Database ─────────────────
 
-    def save_entry(self):
-        conn = get_db()
-        d = self.selected_date.isoformat()
+    def read_form(self):
+        # Raises ValueError, naming the field, for anything that doesn't parse
+        return DayRecord.parse(
+            self.selected_date.isoformat(),
+            sleep_hours=self.sleep_hours.get(),
+            sleep_disturbances=self.sleep_disturbances.get(),
+            calories=self.calories.get(),
+            mood=round(self.mood_slider.get()) if self.mood_set else None,
+            discomfort_level=round(self.disc_slider.get()) if self.disc_set else None,
+            gym_notes=self.gym_notes.get("1.0", "end").strip(),
+            weight_kg=self.weight_entry.get()
+        )
 
-        conn.execute("""
-            INSERT OR REPLACE INTO daily_log
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            d,
-            self.safe_float(self.sleep_hours.get()),
-            self.safe_int(self.sleep_disturbances.get()),
-            self.safe_int(self.calories.get()),
-            int(self.mood_slider.get()),
-            int(self.disc_slider.get()),
-            "",
-            self.gym_notes.get("1.0", "end").strip()
-        ))
-
-        weight = self.safe_float(self.weight_entry.get())
-        if weight:
-            conn.execute(
-                "INSERT OR REPLACE INTO weekly_weight VALUES (?, ?)",
-                (d, weight)
-            )
+    def save_entry(self, autosave=False):
+        # Never write the blank form shown while a day is still loading
+        if self.loading:
+            return
+
+        try:
+            form = self.read_form()
+        except ValueError as error:
+            self.show_saved(f"Not saved: {error}", "red")
+            return
+        # Only what changed since the last save or load is written
+        last = self.last_saved
+        changed = {field: getattr(form, field) for field in FORM_FIELDS
+                   if last is None or getattr(form, field) != getattr(last, field)}
+        if not changed:
+            if not autosave:
+                self.show_saved("Saved!", "green")
+            return
 
-        conn.commit()
-        conn.close()
+        self.last_saved = form
+        self.day_cache.invalidate(form.date)
+        timer = PROFILER.start("autosave" if autosave else "save_entry")
+        self.worker.submit(
+            save_fields, form.date, changed,
+            callback=lambda _: self.show_saved("Autosaved" if autosave else "Saved!", "green", timer),
+            errback=self.save_failed
+        )
 
-        self.status.configure(text="Saved!", text_color="green")
+    def show_saved(self, text, color, timer=None):
+        PROFILER.stop(timer)
+        self.status.configure(text=text, text_color=color)
         self.after(2000, lambda: self.status.configure(text=""))
 
+    def save_failed(self, error):
+        self.last_saved = None
+        self.show_saved(f"Save failed: {error}", "red")
+
     def load_entry(self):
-        conn = get_db()
         d = self.selected_date.isoformat()
-        row = conn.execute("SELECT * FROM daily_log WHERE date=?", (d,)).fetchone()
-        conn.close()
-
+        profile = self.profile
+        self.load_timer = PROFILER.start("load_entry")
         self.clear_fields()
+        cached = self.day_cache.get(d)
+        if cached is not None:
+            self.apply_entry(profile, d, cached)
+        else:
+            self.loading = True
+            token = self.day_cache.begin_fill()
+            self.worker.submit(
+                Database.load_day, d,
+                callback=lambda result: self.day_loaded(profile, token, d, result),
+                errback=lambda error: self.day_load_failed(profile, d)
+            )
+        self.prefetch_around(self.selected_date)
+
+    def day_loaded(self, profile, token, d, result):
+        profile.day_cache.fill(token, {d: result})
+        self.apply_entry(profile, d, result)
+
+    def day_load_failed(self, profile, d):
+        profile.day_cache.abandon_fill()
+        self.apply_entry(profile, d, None)
 
-        if not row:
+    def prefetch_around(self, day):
+        # Neighbouring days in one range query, so arrowing through dates hits the cache
+        window = self.day_cache.prefetch_window(day)
+        if window is None:
+            return
+        cache = self.day_cache
+        token = cache.begin_fill()
+        self.worker.submit(
+            Database.load_range, *window,
+            callback=lambda days: cache.fill(token, days, *window),
+            errback=lambda error: cache.abandon_fill()
+        )
+
+    def apply_entry(self, profile, d, record):
+        # Answers for another day, or a profile switched away from, are dropped
+        if profile is not self.profile or d != self.selected_date.isoformat():
+            return
+        self.loading = False
+        PROFILER.stop(self.load_timer)
+        self.load_timer = None
+        if self.first_load is not None:
+            self.after_idle(self.report_startup)
+
+        if record is None:
+            self.last_saved = self.read_form()
             return
 
-        self.populate(self.sleep_hours, row["sleep_hours"])
-        self.populate(self.sleep_disturbances, row["sleep_disturbances"])
-        self.populate(self.calories, row["calories"])
+        self.populate(self.weight_entry, record.weight_kg)
+        self.populate(self.sleep_hours, record.sleep_hours)
+        self.populate(self.sleep_disturbances, record.sleep_disturbances)
+        self.populate(self.calories, record.calories)
 
-        if row["mood"]:
-            self.mood_slider.set(row["mood"])
-            self.update_mood(row["mood"])
+        if record.mood is not None:
+            self.mood_slider.set(record.mood)
+            self.update_mood(record.mood)
+            self.mood_set = True
 
-        if row["discomfort_level"] is not None:
-            self.disc_slider.set(row["discomfort_level"])
-            self.update_disc(row["discomfort_level"])
+        if record.discomfort_level is not None:
+            self.disc_slider.set(record.discomfort_level)
+            self.update_disc(record.discomfort_level)
+            self.disc_set = True
 
-        if row["gym_notes"]:
-            self.gym_notes.insert("1.0", row["gym_notes"])
+        if record.gym_notes:
+            self.gym_notes.insert("1.0", record.gym_notes)
+
+        self.last_saved = self.read_form()
 
     # ───────────────── History ─────────────────
 
     def show_history(self):
-        win = ctk.CTkToplevel(self)
+        self.flush_autosave()
+        win = self.history_window
+        if win is not None and win.winfo_exists():
+            win.deiconify()
+            win.lift()
+            win.focus()
+            self.render_history(self.history_range)
+            return
+
+        win = self.history_window = ctk.CTkToplevel(self)
         win.geometry("1200x800")
         win.title("📊 History Overview")
+        # Hidden rather than destroyed on close, so reopening only redraws what changed
+        win.protocol("WM_DELETE_WINDOW", win.withdraw)
+
+        controls = ctk.CTkFrame(win, fg_color="transparent")
+        controls.pack(fill="x", padx=15, pady=(15, 0))
+
+        self.history_scroll = ctk.CTkScrollableFrame(win)
+        self.history_scroll.pack(fill="both", expand=True, padx=15, pady=15)
+        self.history_view = None
+        self.history_version = None
+
+        ctk.CTkLabel(controls, text="Range:", font=("Arial", 13, "bold")).pack(side="left", padx=(0, 10))
+        selector = ctk.CTkSegmentedButton(
+            controls,
+            values=list(HISTORY_RANGES),
+            command=self.render_history
+        )
+        selector.set(DEFAULT_RANGE)
+        selector.pack(side="left")
+
+        self.render_history(DEFAULT_RANGE)
+
+    def render_history(self, range_key):
+        self.history_range = range_key
+        if self.history_view is None:
+            self.clear_history()
+            ctk.CTkLabel(self.history_scroll, text="Loading…").pack(pady=40)
+
+        timer = PROFILER.start(f"show_history {range_key}")
+        profile = self.profile
+        self.worker.submit(
+            fetch_history, range_key, self.history_version,
+            callback=lambda result: self.history_loaded(timer, profile, range_key, result),
+            errback=lambda error: self.history_failed(timer, error)
+        )
 
-        scroll = ctk.CTkScrollableFrame(win)
-        scroll.pack(fill="both", expand=True, padx=15, pady=15)
+    def history_loaded(self, timer, profile, range_key, result):
+        # None means the window already shows this version; stale answers are dropped
+        if result is not None and profile is self.profile and range_key == self.history_range:
+            self.fill_history(*result)
+        PROFILER.stop(timer)
 
-        conn = get_db()
+    def history_failed(self, timer, error):
+        PROFILER.stop(timer)
+        if not self.history_scroll.winfo_exists():
+            return
+        self.clear_history()
+        ctk.CTkLabel(self.history_scroll, text=f"Error loading history: {error}",
+                     text_color="red").pack(pady=40)
+
+    def clear_history(self):
+        for child in self.history_scroll.winfo_children():
+            child.destroy()
+        self.history_view = None
+        self.history_version = None
+
+    def fill_history(self, version, bucket, daily_rows, weight_rows, start, note_count, trends, sleep):
+        if not self.history_scroll.winfo_exists():
+            return
 
-        daily_rows = conn.execute("""
-            SELECT * FROM daily_log
-            ORDER BY date ASC
-            LIMIT 30
-        """).fetchall()
+        if not daily_rows and not weight_rows:
+            self.clear_history()
+            ctk.CTkLabel(self.history_scroll, text="No history yet.").pack(pady=40)
+            self.history_version = version
+            return
 
-        weight_rows = conn.execute("""
-            SELECT * FROM weekly_weight
-            ORDER BY date ASC
-            LIMIT 12
-        """).fetchall()
+        if self.history_view is None:
+            self.clear_history()
+            self.history_view = self.build_history(self.history_scroll)
+        self.history_version = version
+        view = self.history_view
 
-        conn.close()
+        suffix = BUCKET_SUFFIXES[bucket]
+        date_format = "%b %y" if bucket == "month" else "%d/%m"
 
-        if not daily_rows and not weight_rows:
-            ctk.CTkLabel(scroll, text="No history yet.").pack(pady=40)
-            return
+        view["trends"].configure(text="\n".join(trends))
 
-        # ───────── DAILY CALORIES ─────────
         cal_max = max((r["calories"] for r in daily_rows if r["calories"]), default=2000)
-        self.create_chart(
-            scroll,
-            "🍽️ Daily Calories",
-            daily_rows,
-            "calories",
-            "#f59e0b",
-            max_val=max(cal_max * 1.1, 500)
+        self.update_chart(view["calories"], f"🍽️ Daily Calories{suffix}", daily_rows, "calories",
+                          max_val=max(cal_max * 1.1, 500), date_format=date_format)
+        self.update_chart(view["sleep_hours"], f"😴 Sleep Duration (Hours){suffix}", daily_rows, "sleep_hours",
+                          date_format=date_format)
+
+        from tracker_charts import SLEEP_QUALITY_COLORS, sleep_quality_breakdown
+
+        since, nights, months = sleep
+        with PROFILER.span("chart: sleep_quality heatmap"):
+            view["heatmap"].set_data(
+                date.fromisoformat(since),
+                date.today(),
+                {night["date"]: SLEEP_QUALITY_COLORS[night["sleep_quality"]] for night in nights}
+            )
+        view["breakdown"].configure(text=sleep_quality_breakdown(months))
+        self.update_chart(
+            view["good"],
+            "✅ Good Nights per Month (%)",
+            [{"date": m["month"], "good": round(100 * m["good"] / m["nights"])} for m in months if m["nights"]],
+            "good"
         )
 
+        self.update_chart(view["sleep_disturbances"], f"🌙 Sleep Disturbances{suffix}", daily_rows,
+                          "sleep_disturbances", date_format=date_format)
+
+        weight_max = max((r["weight_kg"] for r in weight_rows if r["weight_kg"]), default=100)
+        self.update_chart(view["weight_kg"], f"⚖️ Weekly Weight (kg){suffix}", weight_rows, "weight_kg",
+                          max_val=weight_max * 1.05, date_format=date_format)
+
+        # The notes list caches the pages it has read, so it is replaced whenever the data changed
+        view["gym_title"].configure(text=f"🏋️ Gym Notes ({note_count})")
+        for child in view["gym_notes"].winfo_children():
+            child.destroy()
+        if note_count:
+            from tracker_notes import VirtualNotesList
+
+            VirtualNotesList(view["gym_notes"], self.worker, start, note_count).pack(
+                fill="both", expand=True, padx=10, pady=(0, 10)
+            )
+
+    def build_history(self, scroll):
+        # Every widget of the overview, created once and then updated in place
+        from tracker_charts import CalendarHeatmap
+
+        view = {}
+
+        # ───────── TRENDS ─────────
+        trends_frame = ctk.CTkFrame(scroll)
+        trends_frame.pack(fill="x", pady=(0, 10))
+
+        ctk.CTkLabel(
+            trends_frame,
+            text="🔎 Trends (all data)",
+            font=("Arial", 16, "bold")
+        ).pack(anchor="w", padx=10, pady=5)
+
+        view["trends"] = ctk.CTkLabel(trends_frame, text="", justify="left")
+        view["trends"].pack(anchor="w", padx=10, pady=(0, 10))
+
+        # ───────── DAILY CALORIES ─────────
+        view["calories"] = self.create_chart(scroll, "#f59e0b", max_val=2000)
+
         # ───────── SLEEP DURATION ─────────
-        self.create_chart(
+        view["sleep_hours"] = self.create_chart(scroll, "#3b82f6", max_val=12)
+
+        # ───────── SLEEP QUALITY ─────────
+        view["heatmap"] = CalendarHeatmap(
             scroll,
-            "😴 Sleep Duration (Hours)",
-            daily_rows,
-            "sleep_hours",
-            "#3b82f6",
-            max_val=12
+            "🛌 Sleep Quality (click a day to open it)",
+            title_font=("Arial", 16, "bold"),
+            on_click=self.go_to_date
         )
+        view["heatmap"].pack(fill="x", pady=(0, 10))
+        view["breakdown"] = ctk.CTkLabel(view["heatmap"], text="")
+        view["breakdown"].pack(anchor="w", padx=10, pady=(0, 10))
+
+        view["good"] = self.create_chart(scroll, "#2d8f4e", max_val=100, date_format="%b %y")
 
         # ───────── SLEEP DISTURBANCES ─────────
-        self.create_chart(
-            scroll,
-            "🌙 Sleep Disturbances",
-            daily_rows,
-            "sleep_disturbances",
-            "#8b5cf6",
-            max_val=10
-        )
+        view["sleep_disturbances"] = self.create_chart(scroll, "#8b5cf6", max_val=10)
 
         # ───────── WEEKLY WEIGHT ─────────
-        weight_max = max((r["weight_kg"] for r in weight_rows if r["weight_kg"]), default=100)
-        self.create_chart(
-            scroll,
-            "⚖️ Weekly Weight (kg)",
-            weight_rows,
-            "weight_kg",
-            "#10b981",
-            max_val=weight_max * 1.05
-        )
+        view["weight_kg"] = self.create_chart(scroll, "#10b981", max_val=100)
 
         # ───────── GYM NOTES ─────────
         gym_frame = ctk.CTkFrame(scroll)
         gym_frame.pack(fill="x", pady=20)
 
-        ctk.CTkLabel(
-            gym_frame,
-            text="🏋️ Gym Notes",
-            font=("Arial", 16, "bold")
-        ).pack(anchor="w", padx=10, pady=5)
+        view["gym_title"] = ctk.CTkLabel(gym_frame, text="", font=("Arial", 16, "bold"))
+        view["gym_title"].pack(anchor="w", padx=10, pady=5)
+        view["gym_notes"] = ctk.CTkFrame(gym_frame, fg_color="transparent")
+        view["gym_notes"].pack(fill="both", expand=True)
+        return view
 
-        notes_container = ctk.CTkFrame(gym_frame)
-        notes_container.pack(fill="both", expand=True, padx=10)
+    def create_chart(self, parent, color, max_val, date_format="%d/%m"):
+        # Chart drawing is only needed once History is opened, so it is not imported at startup
+        from tracker_charts import BarChart
 
-        for row in daily_rows:
-            if row["gym_notes"]:
-                note_frame = ctk.CTkFrame(notes_container, border_width=1, border_color="gray")
-                note_frame.pack(fill="x", pady=5)
+        chart = BarChart(
+            parent,
+            "",
+            color,
+            max_val,
+            title_font=("Arial", 16, "bold"),
+            title_pady=0,
+            canvas_pady=10,
+            bar_height=120,
+            min_bar_height=4,
+            bar_width=25,
+            date_format=date_format
+        )
+        chart.pack(fill="x", pady=20)
+        return chart
+
+    def update_chart(self, chart, title, rows, field, max_val=None, date_format=None):
+        # Only the bars whose value (or scaled height) changed are redrawn
+        with PROFILER.span(f"chart: {field}"):
+            chart.title_label.configure(text=title)
+            if date_format is not None:
+                chart.renderer.date_format = date_format
+            chart.set_data([(row["date"], row[field]) for row in rows], max_val)
+
+    # ───────────────── Profiles ─────────────────
+
+    @property
+    def worker(self):
+        return self.profile.worker
+
+    @property
+    def day_cache(self):
+        return self.profile.day_cache
+
+    def switch_profile(self, name):
+        # Edits still waiting to autosave go to the profile they were made in
+        self.flush_autosave()
+        self.profile = self.profiles.open(name)
+        for window in (self.search_window, self.calendar_window, self.history_window):
+            if window is not None and window.winfo_exists():
+                window.destroy()
+        self.title("Daily Tracker" if name == DEFAULT_PROFILE else f"Daily Tracker - {name}")
+        self.loading = False
+        self.load_entry()
 
-                date_str = datetime.fromisoformat(row["date"]).strftime("%A, %d %B %Y")
-                ctk.CTkLabel(
-                    note_frame,
-                    text=date_str,
-                    font=("Arial", 11, "bold"),
-                    text_color="#3b82f6"
-                ).pack(anchor="w", padx=10, pady=(5, 0))
+    # ───────────────── Diagnostics ─────────────────
 
-                textbox = ctk.CTkTextbox(note_frame, height=80, width=500)
-                textbox.pack(fill="x", padx=10, pady=(0, 10))
-                textbox.insert("1.0", row["gym_notes"])
-                textbox.configure(state="disabled")
+    def show_diagnostics(self):
+        if self.diagnostics_window is not None and self.diagnostics_window.winfo_exists():
+            self.diagnostics_window.focus()
+            return
+        from tracker_diagnostics import DiagnosticsWindow
 
-    def create_chart(self, parent, title, rows, field, color, max_val):
-        BAR_HEIGHT = 120
+        self.diagnostics_window = DiagnosticsWindow(self)
 
-        frame = ctk.CTkFrame(parent)
-        frame.pack(fill="x", pady=20)
+    # ───────────────── Calendar ─────────────────
 
-        ctk.CTkLabel(
-            frame,
-            text=title,
-            font=("Arial", 16, "bold")
-        ).pack(anchor="w", padx=10)
-
-        chart = ctk.CTkFrame(frame, height=BAR_HEIGHT + 40)
-        chart.pack(fill="x", padx=10, pady=10)
-        chart.pack_propagate(False)
-
-        for row in rows:
-            container = ctk.CTkFrame(chart, fg_color="transparent")
-            container.pack(side="left", expand=True, padx=4)
-
-            value = row[field]
-
-            # Date label
-            date_str = datetime.fromisoformat(row["date"]).strftime("%d/%m")
-
-            if value is None:
-                ctk.CTkFrame(container, height=BAR_HEIGHT).pack()
-                ctk.CTkLabel(container, text="–", text_color="gray").pack()
-                ctk.CTkLabel(container, text=date_str, font=("Arial", 8), text_color="gray").pack()
-                continue
-
-            # Calculate proportional height
-            bar_height = int((value / max_val) * BAR_HEIGHT)
-            bar_height = max(4, min(bar_height, BAR_HEIGHT))
-            spacer = BAR_HEIGHT - bar_height
-
-            # Spacer (top empty area)
-            ctk.CTkFrame(
-                container,
-                height=spacer,
-                fg_color="transparent"
-            ).pack()
-
-            # Actual bar
-            ctk.CTkFrame(
-                container,
-                height=bar_height,
-                width=25,
-                fg_color=color,
-                corner_radius=4
-            ).pack()
-
-            # Value label
-            display_value = f"{value:.1f}" if isinstance(value, float) else str(value)
-            ctk.CTkLabel(
-                container,
-                text=display_value,
-                font=("Arial", 9, "bold")
-            ).pack()
-
-            # Date label
-            ctk.CTkLabel(
-                container,
-                text=date_str,
-                font=("Arial", 8),
-                text_color="gray"
-            ).pack()
+    def show_calendar(self):
+        if self.calendar_window is not None and self.calendar_window.winfo_exists():
+            self.calendar_window.focus()
+            return
+        from tracker_calendar import CalendarWindow
+
+        self.calendar_window = CalendarWindow(self, self.worker, self.go_to_date)
+
+    # ───────────────── Search ─────────────────
+
+    def show_search(self):
+        if self.search_window is not None and self.search_window.winfo_exists():
+            self.search_window.focus()
+            return
+        from tracker_search import SearchWindow
+
+        self.search_window = SearchWindow(self, self.worker, self.go_to_date)
+
+    def go_to_date(self, d):
+        self.flush_autosave()
+        self.selected_date = date.fromisoformat(d)
+        self.update_date_label()
+        self.load_entry()
+
+    # ───────────────── Startup Timing ─────────────────
 
+    def time_stage(self, stage, since):
+        now = time.perf_counter()
+        self.timings.append((stage, now - since))
+        return now
+
+    def report_startup(self):
+        # Runs once, after today's entry has been drawn
+        first_load, self.first_load = self.first_load, None
+        if not STARTUP_TIMING:
+            return
+        self.update_idletasks()
+        self.time_stage("first query", first_load)
+        lines = [f"{stage:<12} {seconds * 1000:8.1f} ms" for stage, seconds in self.timings]
+        lines.append(f"{'total':<12} {(time.perf_counter() - STARTED) * 1000:8.1f} ms")
+        report = "\n".join(lines)
+        try:
+            with open(STARTUP_LOG, "a", encoding="utf-8") as f:
+                f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')}\n{report}\n\n")
+        except OSError as error:
+            report += f"\n(could not write {STARTUP_LOG}: {error})"
+        # sys.stdout is None in a --windowed build
+        if sys.stdout is not None:
+            print(report)
+        self.on_close()
 
     # ───────────────── Utils ─────────────────
 
+    def on_close(self):
+        self.flush_autosave()
+        self.profiles.close()
+        self.destroy()
+
+    def set_busy(self, busy):
+        self.busy_label.configure(text="⏳" if busy else "")
+
     def clear_fields(self):
         for w in [self.weight_entry, self.sleep_hours,
                   self.sleep_disturbances, self.calories]:
@@ -439,22 +731,17 @@ class TrackerApp(ctk.CTk):
 
         self.gym_notes.delete("1.0", "end")
 
+        self.mood_slider.set(5)
+        self.update_mood(5)
+        self.disc_slider.set(0)
+        self.update_disc(0)
+        self.mood_set = False
+        self.disc_set = False
+
     def populate(self, widget, value):
         if value is not None:
             widget.insert(0, str(value))
 
-    def safe_float(self, v):
-        try:
-            return float(v)
-        except:
-            return None
-
-    def safe_int(self, v):
-        try:
-            return int(v)
-        except:
-            return None
-
 
 # ───────────────── Entry Point ─────────────────
 
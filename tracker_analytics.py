@@ -0,0 +1,227 @@
+from datetime import date
+
+import numpy as np
+
+from tracker_db import SELECT_METRICS
+
+# ─── CONSTANTS ──────────────────────────────────────────────────────────────
+
+EPOCH = date(1970, 1, 1)        # day number 0, as in daily_log.day
+
+ROLLING_WINDOWS = (7, 30)
+WEIGHT_HALFLIFE_DAYS = 14       # EWMA weight trend: half the weight after two weeks
+WEIGHT_RATE_DAYS = 28           # trend change reported per week over this span
+MAX_WEIGH_IN_GAP = 14           # longer gaps between weigh-ins aren't used for correlations
+MIN_PAIRS = 10                  # fewer points than this gives no correlation
+
+# SELECT_METRICS columns, in order. Zeros mean "not logged" for sleep,
+# calories and mood, the same as in the rollups.
+COLUMNS = ("date", "logged", "sleep_hours", "calories", "mood", "discomfort_level", "trained", "weight_kg")
+ZERO_IS_MISSING = ("sleep_hours", "calories", "mood")
+ROLLING_METRICS = ("sleep_hours", "calories", "mood", "discomfort_level")
+
+_cache = {}     # db path -> ((data version, today), result)
+
+
+# ─── VECTOR HELPERS ──────────────────────────────────────────────────────────
+
+def rolling_mean(values, window):
+    """Mean of the non-NaN values in the `window` days ending at each index."""
+    valid = ~np.isnan(values)
+    pad = np.zeros(window)
+    sums = np.concatenate((pad, np.cumsum(np.where(valid, values, 0.0))))
+    counts = np.concatenate((pad, np.cumsum(valid)))
+    total = sums[window:] - sums[:-window]
+    n = counts[window:] - counts[:-window]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(n > 0, total / n, np.nan)
+
+
+def ewma(times, values, halflife):
+    """Exponentially weighted mean of irregularly spaced samples.
+
+    Each sample's weight halves every `halflife` days of age, so gaps
+    between weigh-ins are handled naturally. The sums are computed with
+    cumsum relative to a chunk start; a new chunk starts before the
+    exponent could overflow, which for decades of data is one or two.
+    """
+    rate = np.log(2) / halflife
+    max_span = 600 / rate
+    trend = np.empty(len(values))
+    num = den = 0.0
+    last = times[0] if len(times) else 0
+    start = 0
+    while start < len(times):
+        t0 = times[start]
+        end = start + int(np.searchsorted(times[start:], t0 + max_span, side="right"))
+        carry = np.exp(-rate * (t0 - last))
+        age = times[start:end] - t0
+        grow = np.exp(rate * age)
+        decay = np.exp(-rate * age)
+        nums = decay * (num * carry + np.cumsum(values[start:end] * grow))
+        dens = decay * (den * carry + np.cumsum(grow))
+        trend[start:end] = nums / dens
+        num, den, last = nums[-1], dens[-1], times[end - 1]
+        start = end
+    return trend
+
+
+def pearson(x, y):
+    """(r, n) over the pairs where both are present, or None if too few / flat."""
+    both = ~(np.isnan(x) | np.isnan(y))
+    n = int(both.sum())
+    if n < MIN_PAIRS:
+        return None
+    x, y = x[both], y[both]
+    if x.std() == 0 or y.std() == 0:
+        return None
+    return float(np.corrcoef(x, y)[0, 1]), n
+
+
+def streaks(flags):
+    """(current, longest) run of True days; current may end today or yesterday."""
+    padded = np.concatenate(([0], flags.astype(np.int8), [0]))
+    edges = np.flatnonzero(np.diff(padded))
+    starts, ends = edges[::2], edges[1::2]
+    if not len(starts):
+        return 0, 0
+    lengths = ends - starts
+    current = int(lengths[-1]) if ends[-1] >= len(flags) - 1 else 0
+    return current, int(lengths.max())
+
+
+# ─── ANALYTICS ───────────────────────────────────────────────────────────────
+
+def load_series(db, today=None):
+    """Every metric as a dense per-day array from the first logged day to today.
+
+    One query; days with nothing logged are NaN (False for the flags).
+    """
+    # Plain tuples: building sqlite3.Row objects is most of the cost here
+    cursor = db.conn.cursor()
+    cursor.row_factory = None
+    rows = cursor.execute(SELECT_METRICS).fetchall()
+    today_number = ((today or date.today()) - EPOCH).days
+    if not rows:
+        return None
+
+    dates, *columns = zip(*rows)
+    days = np.array(dates, dtype="datetime64[D]").astype(np.int64)
+    data = np.array(columns, dtype=float)
+    first = int(days[0])
+    length = max(int(days[-1]), today_number) - first + 1
+    index = days - first
+
+    series = {"first_day": first, "weigh_in_days": days[~np.isnan(data[-1])]}
+    for column, values in zip(COLUMNS[1:], data):
+        if column in ZERO_IS_MISSING:
+            values = np.where(values == 0, np.nan, values)
+        dense = np.full(length, np.nan)
+        dense[index] = values
+        series[column] = dense
+    series["logged"] = series["logged"] == 1
+    series["trained"] = series["trained"] == 1
+    return series
+
+
+def compute(series):
+    weights = series["weight_kg"]
+    weigh_ins = series["weigh_in_days"] - series["first_day"]
+    result = {
+        "rolling": {
+            column: tuple(
+                None if np.isnan(latest) else float(latest)
+                for latest in (rolling_mean(series[column], window)[-1] for window in ROLLING_WINDOWS)
+            )
+            for column in ROLLING_METRICS
+        },
+        "sleep_vs_mood": pearson(series["sleep_hours"], series["mood"]),
+        "logging_streak": streaks(series["logged"]),
+        "training_streak": streaks(series["trained"]),
+        "weight_trend": None,
+        "calories_vs_weight": None,
+    }
+
+    if len(weigh_ins):
+        values = weights[weigh_ins]
+        trend = ewma(weigh_ins.astype(float), values, WEIGHT_HALFLIFE_DAYS)
+        then = np.interp(weigh_ins[-1] - WEIGHT_RATE_DAYS, weigh_ins, trend)
+        rate = (trend[-1] - then) * 7 / WEIGHT_RATE_DAYS if len(weigh_ins) > 1 else 0.0
+        result["weight_trend"] = (float(trend[-1]), float(rate))
+
+    if len(weigh_ins) > 1:
+        # Mean calories between consecutive weigh-ins vs the weekly rate of
+        # weight change over the same days
+        calories = series["calories"]
+        valid = ~np.isnan(calories)
+        cal_sums = np.concatenate(([0.0], np.cumsum(np.where(valid, calories, 0.0))))
+        cal_counts = np.concatenate(([0], np.cumsum(valid)))
+        prev, curr = weigh_ins[:-1], weigh_ins[1:]
+        gaps = curr - prev
+        logged = cal_counts[curr + 1] - cal_counts[prev + 1]
+        usable = (gaps <= MAX_WEIGH_IN_GAP) & (logged > 0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_cal = np.where(usable, (cal_sums[curr + 1] - cal_sums[prev + 1]) / logged, np.nan)
+            change = np.where(usable, (weights[curr] - weights[prev]) * 7 / gaps, np.nan)
+        result["calories_vs_weight"] = pearson(mean_cal, change)
+
+    return result
+
+
+def analyze(db, today=None):
+    """Trend and correlation stats for everything logged, cached per data version.
+
+    Runs on the DB worker thread. Reopening History without new saves (in
+    this or any other connection) returns the cached result.
+    """
+    today = today or date.today()
+    key = (db.data_version(), today)
+    cached = _cache.get(db.path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    series = load_series(db, today)
+    result = compute(series) if series is not None else None
+    _cache[db.path] = (key, result)
+    return result
+
+
+# ─── FORMATTING ──────────────────────────────────────────────────────────────
+
+def _fmt_pair(pair, fmt):
+    return " / ".join("–" if v is None else fmt.format(v) for v in pair)
+
+
+def _fmt_r(corr, unit):
+    if corr is None:
+        return "not enough data"
+    r, n = corr
+    return f"r = {r:+.2f} over {n} {unit}"
+
+
+def _days(n):
+    return f"{n} day{'s' if n != 1 else ''}"
+
+
+def describe(result):
+    """The analytics as short lines of text for the History windows."""
+    if result is None:
+        return ["Not enough data yet."]
+    rolling = result["rolling"]
+    lines = [
+        "7-day / 30-day avg:  "
+        f"Sleep {_fmt_pair(rolling['sleep_hours'], '{:.1f}h')}  |  "
+        f"Calories {_fmt_pair(rolling['calories'], '{:.0f}')}  |  "
+        f"Mood {_fmt_pair(rolling['mood'], '{:.1f}')}  |  "
+        f"Discomfort {_fmt_pair(rolling['discomfort_level'], '{:.1f}')}",
+    ]
+    if result["weight_trend"] is not None:
+        weight, rate = result["weight_trend"]
+        direction = "📉" if rate < -0.05 else "📈" if rate > 0.05 else "➡️"
+        lines.append(f"Weight trend (smoothed): {weight:.1f}kg  {direction} {rate:+.2f}kg/week")
+    lines.append(f"Sleep ↔ mood: {_fmt_r(result['sleep_vs_mood'], 'days')}  |  "
+                 f"Calories ↔ weight change: {_fmt_r(result['calories_vs_weight'], 'weigh-ins')}")
+    logging, training = result["logging_streak"], result["training_streak"]
+    lines.append(f"Streaks: logging {_days(logging[0])} (best {logging[1]})  |  "
+                 f"gym notes {_days(training[0])} (best {training[1]})")
+    return lines
@@ -0,0 +1,265 @@
+"""Local HTTP/JSON API over tracker.db, for scripts and dashboards.
+
+    python tracker_cli.py serve-api                     # http://127.0.0.1:8766
+
+    GET   /days?since=&until=&limit=&after=   days (entries and weigh-ins), oldest first
+    GET   /days/2026-10-18                    one day
+    PUT   /days/2026-10-18   {"calories": 2100, "mood": 7, ...}   replace a day's entry
+    PATCH /days/2026-10-18   {"calories": 2100}                  change just these fields
+    GET   /weights?since=&until=&limit=&after=
+    PUT   /weights/2026-10-18   {"weight_kg": 81.4}
+
+Lists come a page at a time: a response with more to read has a "next"
+link, which carries on after the last date returned. Every GET has an
+ETag for the state of the whole file. Send it back as If-None-Match and
+the answer is 304 Not Modified, with no query run, until something is
+written (here, in the apps or by sync). Each request thread borrows a
+connection from a small pool. In WAL mode, readers never block on each
+other or on the apps, and writes take their turn through busy_timeout.
+"""
+import json
+import queue
+import sqlite3
+from contextlib import contextmanager
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from tracker_db import Database
+from tracker_record import DAILY_FIELDS, RECORD_FIELDS, parse_date, parse_field, parse_number
+
+# ─── CONSTANTS ──────────────────────────────────────────────────────────────
+
+DEFAULT_PORT = 8766
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+MAX_BODY = 64 * 1024
+FIRST_DATE = "0001-01-01"
+LAST_DATE = "9999-12-31"
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# ─── QUERIES ─────────────────────────────────────────────────────────────────
+
+def _page_bounds(query):
+    """(since, until, limit) from a list request's query string."""
+    since = parse_date(query["since"]) if query.get("since") else FIRST_DATE
+    until = parse_date(query["until"]) if query.get("until") else LAST_DATE
+    if query.get("after"):
+        # Keyset paging: carry on the day after the last one already returned
+        since = max(since, (date.fromisoformat(parse_date(query["after"])) + timedelta(days=1)).isoformat())
+    limit = DEFAULT_LIMIT if query.get("limit") is None else parse_number(query["limit"], "integer")
+    if limit is None:
+        raise ValueError("limit must be a number")
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ValueError(f"limit must be between 1 and {MAX_LIMIT}")
+    return since, until, limit
+
+
+def _page(path, query, items, limit, last_date):
+    # One row more than the limit was read to find out whether there is a next page
+    more = len(items) > limit
+    items = items[:limit]
+    page = {"items": items, "next": None}
+    if more:
+        page["next"] = f"{path}?{urlencode({**query, 'after': last_date(items[-1])})}"
+    return page
+
+
+def list_days(db, path, query, day=None, body=None):
+    since, until, limit = _page_bounds(query)
+    records = db.load_range(since, until, limit + 1)
+    return 200, _page(path, query, [record.as_dict() for record in records.values()], limit,
+                      lambda item: item["date"])
+
+
+def get_day(db, path, query, day, body=None):
+    record = db.load_range(day, day).get(day)
+    if record is None:
+        raise ApiError(404, f"nothing logged on {day}")
+    return 200, record.as_dict()
+
+
+def put_day(db, path, query, day, body):
+    # Every daily_log field not in the body is cleared; weight_kg only if given
+    _check_fields(body)
+    values = {field: body.get(field) for field in DAILY_FIELDS[1:]}
+    if "weight_kg" in body:
+        values["weight_kg"] = body["weight_kg"]
+    return 200, db.update_day(day, **values).as_dict()
+
+
+def patch_day(db, path, query, day, body):
+    _check_fields(body)
+    return 200, db.update_day(day, **body).as_dict()
+
+
+def list_weights(db, path, query, day=None, body=None):
+    since, until, limit = _page_bounds(query)
+    rows = db.load_weights(since, until, limit + 1)
+    return 200, _page(path, query, [{"date": d, "weight_kg": w} for d, w in rows], limit,
+                      lambda item: item["date"])
+
+
+def put_weight(db, path, query, day, body):
+    if set(body) != {"weight_kg"}:
+        raise ValueError('expected {"weight_kg": number}')
+    _check_fields(body)
+    record = db.update_day(day, weight_kg=body["weight_kg"])
+    return 200, {"date": record.date, "weight_kg": record.weight_kg}
+
+
+def _check_fields(body):
+    unknown = set(body) - set(RECORD_FIELDS[1:])
+    if unknown:
+        raise ValueError(f"unknown fields: {', '.join(sorted(unknown))}")
+    # Weigh-ins are never deleted and a weight of 0 is never stored (see
+    # Database.update_day), so neither null nor 0 can mean "clear"
+    if "weight_kg" in body and not parse_field("weight_kg", body["weight_kg"]):
+        raise ValueError("weight_kg must be above 0: a weigh-in can be changed but not cleared")
+
+
+# (method, collection, has a date) -> handler(db, path, query, day, body)
+ROUTES = {
+    ("GET", "days", False): list_days,
+    ("GET", "days", True): get_day,
+    ("PUT", "days", True): put_day,
+    ("PATCH", "days", True): patch_day,
+    ("GET", "weights", False): list_weights,
+    ("PUT", "weights", True): put_weight,
+}
+COLLECTIONS = {collection for _, collection, _ in ROUTES}
+
+
+# ─── SERVER ──────────────────────────────────────────────────────────────────
+
+def _etag(version):
+    site, seq = version
+    return f'"{site}-{seq}"'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "tracker-api/1"
+    protocol_version = "HTTP/1.1"       # keep-alive: a dashboard reuses its connection
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_PATCH(self):
+        self._dispatch("PATCH")
+
+    def _dispatch(self, method):
+        url = urlsplit(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        try:
+            body = self._read_body() if method != "GET" else None
+            if not parts or len(parts) > 2 or parts[0] not in COLLECTIONS:
+                raise ApiError(404, f"no such resource: {url.path}")
+            handler = ROUTES.get((method, parts[0], len(parts) == 2))
+            if handler is None:
+                raise ApiError(405, f"no {method} {url.path}")
+            day = parse_date(parts[1]) if len(parts) == 2 else None
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+            with self.server.connection() as db:
+                if method == "GET":
+                    with db.snapshot():
+                        etag = _etag(db.journal_version())
+                        if etag in self._if_none_match():
+                            self._send(304, None, etag)
+                            return
+                        status, payload = handler(db, url.path, query, day)
+                else:
+                    status, payload = handler(db, url.path, query, day, body)
+                    etag = _etag(db.journal_version())
+            self._send(status, payload, etag)
+        except ApiError as e:
+            self._send(e.status, {"error": str(e)})
+        except ValueError as e:
+            self._send(400, {"error": str(e)})
+        except sqlite3.Error as e:
+            # Most likely a write lock held past busy_timeout: worth retrying
+            self._send(503, {"error": f"database: {e}"})
+
+    def _read_body(self):
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            raise ApiError(400, "bad Content-Length")
+        if length > MAX_BODY:
+            self.close_connection = True    # the body is left unread
+            raise ApiError(413, f"request body over {MAX_BODY} bytes")
+        try:
+            body = json.loads(self.rfile.read(length) or b"null")
+        except ValueError:
+            raise ApiError(400, "request body is not JSON") from None
+        if not isinstance(body, dict):
+            raise ApiError(400, "request body must be a JSON object")
+        return body
+
+    def _if_none_match(self):
+        header = self.headers.get("If-None-Match") or ""
+        return {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+    def _send(self, status, payload, etag=None):
+        data = b"" if payload is None else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        if etag is not None:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        if payload is not None:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ApiServer(ThreadingHTTPServer):
+    """A thread per client, each borrowing a Database from a pool while it answers."""
+
+    daemon_threads = True
+
+    def __init__(self, address, db_path):
+        super().__init__(address, _Handler)
+        self.db_path = db_path
+        self._idle = queue.LifoQueue()
+
+    @contextmanager
+    def connection(self):
+        try:
+            db = self._idle.get_nowait()
+        except queue.Empty:
+            db = Database(self.db_path, check_same_thread=False)
+        try:
+            yield db
+        finally:
+            self._idle.put(db)
+
+    def server_close(self):
+        super().server_close()
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+def serve(db_path, host="127.0.0.1", port=DEFAULT_PORT):
+    """Answer API requests until interrupted."""
+    with ApiServer((host, port), db_path) as server:
+        print(f"Serving {db_path} on http://{host}:{port}/days (Ctrl+C to stop)")
+        server.serve_forever()
@@ -0,0 +1,262 @@
+"""Benchmarks for the tracker's hot paths against synthetic multi-year databases.
+
+    python tracker_bench.py                       # 1, 10 and 50 years -> bench.json
+    python tracker_bench.py --years 10 --repeat 200 --out before.json
+    python tracker_bench.py --compare before.json --out after.json
+
+Each run builds fresh databases (same seed, same data) in a temporary
+directory unless --dir is given. Charts are drawn onto a stub canvas, so no
+display is needed.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from tracker_analytics import compute, load_series
+from tracker_charts import ChartRenderer
+from tracker_db import HISTORY_RANGES, Database
+from tracker_io import import_rows
+from tracker_record import DayRecord
+
+# ─── CONSTANTS ──────────────────────────────────────────────────────────────
+
+DEFAULT_YEARS = (1, 10, 50)
+DEFAULT_REPEAT = 50
+DEFAULT_SEED = 1234
+CHART_WIDTH = 1100
+
+# (field, max_val) for the charts both apps draw in their History windows
+CHARTS = (("calories", 3500), ("sleep_hours", 12), ("sleep_disturbances", 10), ("weight_kg", 110))
+
+GYM_NOTES = ("Push day: bench 5x5", "Pull day: rows, chins", "Legs: squats 5x5",
+             "10k run", "Mobility + core", "")
+
+# A regression worth flagging in --compare output
+REGRESSION_RATIO = 1.2
+
+
+# ─── SYNTHETIC DATA ──────────────────────────────────────────────────────────
+
+def synthetic_rows(years, seed=DEFAULT_SEED, end=None):
+    """Yield a DayRecord for each of `years` of days ending today.
+
+    Roughly one day in twelve is skipped, and a weight is logged every Monday.
+    """
+    rng = random.Random(seed)
+    end = end or date.today()
+    day = end - timedelta(days=365 * years - 1)
+    weight = 82.0
+    while day <= end:
+        if rng.random() < 0.08:
+            day += timedelta(days=1)
+            continue
+        weight_kg = None
+        if day.weekday() == 0:
+            weight = min(max(weight + rng.uniform(-0.6, 0.5), 60.0), 110.0)
+            weight_kg = round(weight, 1)
+        mood = rng.randint(3, 10)
+        discomfort = rng.choice((0, 0, 0, 1, 2, 4))
+        yield DayRecord(
+            day.isoformat(),
+            round(rng.uniform(5.0, 9.5), 1),
+            rng.choice((0, 0, 1, 1, 2, 3)),
+            rng.randint(1600, 3200),
+            mood,
+            discomfort,
+            "Lower back" if discomfort else "",
+            rng.choice(GYM_NOTES),
+            weight_kg,
+        )
+        day += timedelta(days=1)
+
+
+def build_database(path, years, seed=DEFAULT_SEED):
+    """Create a tracker.db at path holding `years` of synthetic data. Returns row count."""
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    db = Database(path)
+    try:
+        return import_rows(db, synthetic_rows(years, seed))
+    finally:
+        db.close()
+
+
+# ─── TIMING ──────────────────────────────────────────────────────────────────
+
+class StubCanvas:
+    """Counts the canvas calls ChartRenderer makes instead of drawing them."""
+
+    def __init__(self):
+        self.items = 0
+
+    def delete(self, *tags):
+        self.items = 0
+
+    def _create(self, *args, **options):
+        self.items += 1
+        return self.items
+
+    def _change(self, item, *args, **options):
+        pass
+
+    create_line = create_rectangle = create_text = _create
+    coords = itemconfigure = _change
+
+
+def measure(func, repeat):
+    """Run func() repeat times; return timing stats in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "runs": repeat,
+        "min_ms": round(samples[0], 4),
+        "median_ms": round(statistics.median(samples), 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+    }
+
+
+def bench_database(path, repeat, seed=DEFAULT_SEED):
+    """Time every hot path against one synthetic database."""
+    rng = random.Random(seed)
+    db = Database(path)
+    try:
+        first = date.fromisoformat(db.range_start("all"))
+        span = (date.today() - first).days
+
+        def random_day():
+            return (first + timedelta(days=rng.randint(0, span))).isoformat()
+
+        def save():
+            day = random_day()
+            db.save_day(DayRecord(day, 7.0, 1, 2200, 7, 0, "", "Bench", 80.0 if rng.random() < 0.15 else None))
+
+        results = {
+            "load_day": measure(lambda: db.load_day(random_day()), repeat),
+            "load_range_29d": measure(lambda: _load_window(db, date.fromisoformat(random_day())), repeat),
+            "save_day": measure(save, repeat),
+            # Uncached: what the first History open after a save costs
+            "analytics": measure(lambda: compute(load_series(db)), repeat),
+        }
+
+        for key in HISTORY_RANGES:
+            start = db.range_start(key)
+            results[f"history_{key}"] = measure(lambda: db.history(key), repeat)
+            results[f"summary_{key}"] = measure(lambda: db.summary(start), repeat)
+            results[f"gym_notes_{key}"] = measure(lambda: db.gym_notes(start, 50, db.count_gym_notes(start) // 2), repeat)
+
+            _, daily_rows, weight_rows = db.history(key)
+            for field, max_val in CHARTS:
+                rows = weight_rows if field == "weight_kg" else daily_rows
+                points = [(row["date"], row[field]) for row in rows]
+                renderer = ChartRenderer(StubCanvas(), "#3b82f6", max_val)
+                results[f"chart_{field}_{key}"] = measure(lambda: renderer.draw(points, CHART_WIDTH), repeat)
+                if points:
+                    # Reopening History after one save: a single bar differs
+                    edited = [points[:-1] + [(points[-1][0], value)] for value in (1, 2)]
+                    runs = iter(range(repeat))
+                    results[f"chart_update_{field}_{key}"] = measure(
+                        lambda: renderer.update(edited[next(runs) % 2], CHART_WIDTH), repeat)
+        return results
+    finally:
+        db.close()
+
+
+def _load_window(db, center):
+    return db.load_range((center - timedelta(days=14)).isoformat(),
+                         (center + timedelta(days=14)).isoformat())
+
+
+# ─── REPORTING ───────────────────────────────────────────────────────────────
+
+def compare(baseline, current):
+    """Print median changes against a previous results file; returns the regression count."""
+    regressions = 0
+    for label, dataset in current["datasets"].items():
+        before = baseline.get("datasets", {}).get(label)
+        if not before:
+            continue
+        print(f"\n{label} (vs baseline)")
+        for name, stats in dataset["benchmarks"].items():
+            old = before["benchmarks"].get(name)
+            if not old or not old["median_ms"]:
+                continue
+            ratio = stats["median_ms"] / old["median_ms"]
+            flag = "  ⚠ slower" if ratio >= REGRESSION_RATIO else ""
+            regressions += bool(flag)
+            print(f"  {name:<36} {old['median_ms']:9.3f} -> {stats['median_ms']:9.3f} ms  x{ratio:5.2f}{flag}")
+    return regressions
+
+
+def run(years_list, repeat, out, workdir, seed=DEFAULT_SEED):
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "seed": seed,
+        "datasets": {},
+    }
+    for years in years_list:
+        path = os.path.join(workdir, f"bench_{years}y.db")
+        started = time.perf_counter()
+        rows = build_database(path, years, seed)
+        built = time.perf_counter() - started
+        print(f"{years}y: {rows} rows built in {built:.2f}s")
+
+        benchmarks = bench_database(path, repeat, seed)
+        report["datasets"][f"{years}y"] = {
+            "years": years,
+            "rows": rows,
+            "build_seconds": round(built, 3),
+            "benchmarks": benchmarks,
+        }
+        for name, stats in benchmarks.items():
+            print(f"  {name:<36} median {stats['median_ms']:9.3f} ms   p95 {stats['p95_ms']:9.3f} ms")
+
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Results written to {out}")
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="tracker_bench", description="Benchmark the tracker's hot paths.")
+    parser.add_argument("--years", type=int, nargs="+", default=list(DEFAULT_YEARS))
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="runs per benchmark")
+    parser.add_argument("--out", default="bench.json", help="results file (JSON)")
+    parser.add_argument("--dir", help="keep the generated databases here instead of a temp dir")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--compare", metavar="BASELINE", help="earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    if args.dir:
+        os.makedirs(args.dir, exist_ok=True)
+        report = run(args.years, args.repeat, args.out, args.dir, args.seed)
+    else:
+        with tempfile.TemporaryDirectory(prefix="tracker_bench_") as workdir:
+            report = run(args.years, args.repeat, args.out, workdir, args.seed)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report)
+        print(f"\n{regressions} benchmark(s) at least x{REGRESSION_RATIO} slower than baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+from collections import OrderedDict
+from datetime import date, timedelta
+
+from tracker_record import DayRecord
+
+# ─── CONSTANTS ──────────────────────────────────────────────────────────────
+
+CACHE_DAYS = 400        # most recently used days kept in memory
+PREFETCH_RADIUS = 14    # days either side of the selected day fetched per range query
+PREFETCH_MARGIN = 4     # prefetch again once an uncached day is this close
+
+
+# ─── CACHE ───────────────────────────────────────────────────────────────────
+
+class DayCache:
+    """LRU of ISO date -> DayRecord, as returned by load_day().
+
+    Days with nothing logged are cached as blank records so they are not
+    queried again either. Fills are tagged with the generation at which they were
+    requested: a day saved (invalidated) after a fill was queued keeps its
+    invalidation instead of being overwritten with the pre-save answer.
+    """
+
+    def __init__(self, capacity=CACHE_DAYS):
+        self.capacity = capacity
+        self.generation = 0
+        self._days = OrderedDict()
+        self._touched = {}      # date -> generation it was last invalidated at
+        self._open_fills = 0
+        self._requested = set()
+
+    def get(self, date_str):
+        entry = self._days.get(date_str)
+        if entry is not None:
+            self._days.move_to_end(date_str)
+        return entry
+
+    def invalidate(self, date_str):
+        self.generation += 1
+        self._days.pop(date_str, None)
+        self._touched[date_str] = self.generation
+
+    # ── FILLING ──────────────────────────────────────────────────────────
+
+    def begin_fill(self):
+        """Call when a load is queued; pass the token to fill() or abandon_fill()."""
+        self._open_fills += 1
+        return self.generation
+
+    def fill(self, token, entries, since=None, until=None):
+        """Store loaded entries; with since/until, days absent from entries are cached empty."""
+        if since is not None:
+            day, last = date.fromisoformat(since), date.fromisoformat(until)
+            while day <= last:
+                iso = day.isoformat()
+                if iso not in entries:
+                    entries[iso] = DayRecord(iso)
+                day += timedelta(days=1)
+
+        for date_str, entry in entries.items():
+            if self._touched.get(date_str, -1) > token:
+                continue
+            self._days[date_str] = entry
+            self._days.move_to_end(date_str)
+        while len(self._days) > self.capacity:
+            self._days.popitem(last=False)
+        self.abandon_fill()
+
+    def abandon_fill(self):
+        self._open_fills -= 1
+        if self._open_fills == 0:
+            self._touched.clear()
+            self._requested.clear()
+
+    # ── PREFETCH ─────────────────────────────────────────────────────────
+
+    def prefetch_window(self, center, latest=None):
+        """(since, until) to fetch around center, or None if it is already covered.
+
+        A window is only asked for once while fills are outstanding, so holding
+        down an arrow key doesn't queue the same range query again and again.
+        """
+        latest = latest or date.today()
+        near = (center + timedelta(days=offset) for offset in range(-PREFETCH_MARGIN, PREFETCH_MARGIN + 1))
+        if all(d > latest or d.isoformat() in self._days or d.isoformat() in self._requested for d in near):
+            return None
+
+        since = center - timedelta(days=PREFETCH_RADIUS)
+        until = min(center + timedelta(days=PREFETCH_RADIUS), latest)
+        day = since
+        while day <= until:
+            self._requested.add(day.isoformat())
+            day += timedelta(days=1)
+        return since.isoformat(), until.isoformat()
@@ -0,0 +1,124 @@
+import customtkinter as ctk
+from datetime import date
+
+from tracker_charts import HEATMAP_SCALES, CalendarHeatmap, heatmap_palette, metric_colors
+from tracker_db import HEATMAP_METRICS, Database
+
+# ─── CONSTANTS ──────────────────────────────────────────────────────────────
+
+SWATCH_SIZE = 14
+
+_cache = {}     # (db path, metric, year) -> (data version, colors)
+
+
+# ─── DATA ────────────────────────────────────────────────────────────────────
+
+def year_colors(db, metric, year):
+    """{iso date: colour} for one metric over one calendar year.
+
+    Runs on the DB worker thread: one range query, one pass over the rows,
+    and the result is kept until the data version changes, so paging back
+    and forth through ten years of data re-queries nothing.
+    """
+    key = (db.path, metric, year)
+    version = db.data_version()
+    cached = _cache.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    colors = metric_colors(db.metric_range(metric, f"{year}-01-01", f"{year}-12-31"), metric)
+    _cache[key] = (version, colors)
+    return colors
+
+
+# ─── WINDOW ──────────────────────────────────────────────────────────────────
+
+class CalendarWindow(ctk.CTkToplevel):
+    """A year at a glance for one metric; clicking a day calls on_pick(iso_date)."""
+
+    def __init__(self, parent, worker, on_pick, metric=HEATMAP_METRICS[0]):
+        super().__init__(parent)
+        self.title("📅 Calendar")
+        self.geometry("860x320")
+
+        self.worker = worker
+        self.metric = metric
+        self.year = date.today().year
+        self.first_year = self.year
+        self._request = 0       # answers to older requests are dropped
+
+        controls = ctk.CTkFrame(self, fg_color="transparent")
+        controls.pack(fill="x", padx=15, pady=(15, 5))
+
+        titles = {HEATMAP_SCALES[m][0]: m for m in HEATMAP_METRICS}
+        selector = ctk.CTkSegmentedButton(controls, values=list(titles),
+                                          command=lambda title: self.show(metric=titles[title]))
+        selector.set(HEATMAP_SCALES[metric][0])
+        selector.pack(side="left")
+
+        self.next_button = ctk.CTkButton(controls, text="▶", width=40, state="disabled",
+                                         command=lambda: self.show(year=self.year + 1))
+        self.next_button.pack(side="right")
+        self.year_label = ctk.CTkLabel(controls, text="", width=60, font=("Arial", 15, "bold"))
+        self.year_label.pack(side="right", padx=5)
+        self.prev_button = ctk.CTkButton(controls, text="◀", width=40,
+                                         command=lambda: self.show(year=self.year - 1))
+        self.prev_button.pack(side="right")
+
+        self.heatmap = CalendarHeatmap(self, "", on_click=on_pick)
+        self.heatmap.pack(fill="x", padx=15, pady=5)
+
+        footer = ctk.CTkFrame(self, fg_color="transparent")
+        footer.pack(fill="x", padx=15, pady=(0, 15))
+        self.count_label = ctk.CTkLabel(footer, text="", text_color="gray")
+        self.count_label.pack(side="left")
+        self.legend = ctk.CTkFrame(footer, fg_color="transparent")
+        self.legend.pack(side="right")
+
+        self.worker.submit(Database.range_start, "all", callback=self._set_first_year)
+        self.show()
+
+    def _set_first_year(self, first_date):
+        if first_date and self.winfo_exists():
+            self.first_year = int(first_date[:4])
+            self._update_buttons()
+
+    # ── DRAWING ──────────────────────────────────────────────────────────
+
+    def show(self, metric=None, year=None):
+        self.metric = metric or self.metric
+        self.year = year or self.year
+        self._request += 1
+        request = self._request
+        self.year_label.configure(text=str(self.year))
+        self._update_buttons()
+        self.worker.submit(year_colors, self.metric, self.year,
+                           callback=lambda colors: self._render(request, colors))
+
+    def _render(self, request, colors):
+        if request != self._request or not self.winfo_exists():
+            return
+        title, lowest, highest, color = HEATMAP_SCALES[self.metric]
+        first = date(self.year, 1, 1)
+        last = min(date(self.year, 12, 31), date.today())
+        self.heatmap.title_label.configure(text=f"{title} — {self.year} (click a day to open it)")
+        self.heatmap.set_data(first, last, colors)
+        self.count_label.configure(text=f"{len(colors)} day{'s' if len(colors) != 1 else ''} logged")
+        self._draw_legend(lowest, highest, color)
+
+        # Warm the year before, so stepping back is instant too
+        if self.year > self.first_year:
+            self.worker.submit(year_colors, self.metric, self.year - 1)
+
+    def _draw_legend(self, lowest, highest, color):
+        for child in self.legend.winfo_children():
+            child.destroy()
+        ctk.CTkLabel(self.legend, text=str(lowest), text_color="gray").pack(side="left", padx=(0, 5))
+        for swatch in heatmap_palette(color):
+            ctk.CTkFrame(self.legend, width=SWATCH_SIZE, height=SWATCH_SIZE, corner_radius=2,
+                         fg_color=swatch).pack(side="left", padx=1)
+        ctk.CTkLabel(self.legend, text=str(highest), text_color="gray").pack(side="left", padx=(5, 0))
+
+    def _update_buttons(self):
+        self.prev_button.configure(state="normal" if self.year > self.first_year else "disabled")
+        self.next_button.configure(state="normal" if self.year < date.today().year else "disabled")
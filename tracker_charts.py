@@ -0,0 +1,343 @@
+import math
+import tkinter as tk
+import customtkinter as ctk
+from datetime import datetime, timedelta
+
+from tracker_db import GOOD_SLEEP, OKAY_SLEEP, POOR_SLEEP
+
+# ─── CONSTANTS ──────────────────────────────────────────────────────────────
+
+TOP_PAD = 6
+SIDE_PAD = 10
+LABEL_SPACE = 40        # room under the bars for the value + date labels
+MIN_LABEL_SLOT = 30     # narrowest slot (px) that still gets its own labels
+AXIS_COLOR = "gray40"
+MUTED_COLOR = "gray"
+
+# Calendar heatmap: one column per week, Monday at the top
+CELL_SIZE = 12
+CELL_GAP = 2
+WEEKDAY_LABEL_SPACE = 30
+MONTH_LABEL_SPACE = 16
+EMPTY_CELL_COLOR = "gray25"
+WEEKDAY_LABELS = {0: "Mon", 2: "Wed", 4: "Fri"}
+
+SLEEP_QUALITY_COLORS = {GOOD_SLEEP: "#2d8f4e", OKAY_SLEEP: "#c9a227", POOR_SLEEP: "#c94040"}
+
+# Metric heatmaps: metric -> (title, lowest, highest, colour of the highest
+# value). Cells shade from HEATMAP_LOW_COLOR in HEATMAP_STEPS steps.
+HEATMAP_SCALES = {
+    "mood": ("🧠 Mood", 1, 10, "#10b981"),
+    "discomfort_level": ("🩹 Discomfort", 0, 10, "#ef4444"),
+    "calories": ("🍽️ Calories", 1200, 3500, "#f59e0b"),
+    "sleep_hours": ("😴 Sleep Hours", 4, 10, "#3b82f6"),
+}
+HEATMAP_LOW_COLOR = "#1f2937"
+HEATMAP_STEPS = 8
+
+
+def heatmap_palette(color, steps=HEATMAP_STEPS):
+    """steps hex colours from HEATMAP_LOW_COLOR up to color."""
+    low = [int(HEATMAP_LOW_COLOR[i:i + 2], 16) for i in (1, 3, 5)]
+    high = [int(color[i:i + 2], 16) for i in (1, 3, 5)]
+    return ["#" + "".join(f"{round(a + (b - a) * step / (steps - 1)):02x}" for a, b in zip(low, high))
+            for step in range(steps)]
+
+
+def metric_colors(rows, metric):
+    """{iso date: colour} for (date, value) rows of one HEATMAP_SCALES metric, in one pass."""
+    _, lowest, highest, color = HEATMAP_SCALES[metric]
+    palette = heatmap_palette(color)
+    top = len(palette) - 1
+    per_step = (highest - lowest) / top
+    colors = {}
+    for date_str, value in rows:
+        # On a scale that starts above zero, zero means "not logged"
+        if value <= 0 < lowest:
+            continue
+        colors[date_str] = palette[min(top, max(0, round((value - lowest) / per_step)))]
+    return colors
+
+
+def sleep_quality_breakdown(months):
+    """Good/okay/poor percentages over SELECT_SLEEP_MONTHS rows, as one line of text."""
+    nights = sum(m["nights"] for m in months)
+    if not nights:
+        return "No sleep logged in this range."
+    parts = (f"{label} {100 * sum(m[key] for m in months) / nights:.0f}%"
+             for label, key in (("✅ Good", "good"), ("⚠️ Okay", "okay"), ("❌ Poor", "poor")))
+    return "  ·  ".join(parts) + f"  of {nights} nights"
+
+
+def format_value(value):
+    return f"{value:.1f}" if isinstance(value, float) else str(value)
+
+
+# ─── RENDERER ────────────────────────────────────────────────────────────────
+
+class ChartRenderer:
+    """Lays out a bar chart and draws it onto a canvas.
+
+    Only the create_*/coords/itemconfigure/delete canvas calls are used, so
+    the same renderer can draw onto a tkinter.Canvas or onto a stand-in when
+    no display exists.
+    """
+
+    def __init__(self, canvas, color, max_val, bar_height=80, min_bar_height=2,
+                 bar_width=30, date_format="%m/%d", value_format=format_value,
+                 text_color="white"):
+        self.canvas = canvas
+        self.color = color
+        self.max_val = max_val
+        self.bar_height = bar_height
+        self.min_bar_height = min_bar_height
+        self.bar_width = bar_width
+        self.date_format = date_format
+        self.value_format = value_format
+        self.text_color = text_color
+        self.points = None      # what is on the canvas now, and at what width
+        self.width = None
+        self._items = []
+        self._layout = None
+
+    def scaled_height(self, value):
+        # Same semantics as the old per-bar frames: proportional to max_val,
+        # clamped so tiny values still show and big ones never overflow.
+        bar = int((value / self.max_val) * self.bar_height) if self.max_val > 0 else 0
+        return max(self.min_bar_height, min(bar, self.bar_height))
+
+    def draw(self, points, width):
+        """Redraw every bar for points, a list of (iso_date, value) pairs."""
+        canvas = self.canvas
+        canvas.delete("all")
+        self.points, self.width = list(points), width
+        self._items = []        # per point: [bar id, value text id, bar height], None where not drawn
+
+        baseline = TOP_PAD + self.bar_height
+        canvas.create_line(SIDE_PAD, baseline, width - SIDE_PAD, baseline, fill=AXIS_COLOR)
+        if not points:
+            return
+
+        slot = max(width - 2 * SIDE_PAD, 1) / len(points)
+        bar_w = max(1, min(self.bar_width, slot * 0.8))
+        label_every = max(1, math.ceil(MIN_LABEL_SLOT / slot))
+        self._layout = (baseline, slot, bar_w, label_every == 1)
+
+        for i, (date_str, value) in enumerate(points):
+            self._items.append(self._draw_value(i, value))
+            if i % label_every == 0:
+                label = datetime.fromisoformat(date_str).strftime(self.date_format)
+                canvas.create_text(SIDE_PAD + slot * (i + 0.5), baseline + 24, text=label,
+                                   font=("Arial", 8), fill=MUTED_COLOR)
+
+    def _draw_value(self, i, value):
+        # Point i's bar and value text; returns [bar id, text id, bar height]
+        canvas = self.canvas
+        baseline, slot, bar_w, show_values = self._layout
+        center = SIDE_PAD + slot * (i + 0.5)
+        bar = text = height = None
+
+        if value is None:
+            if show_values:
+                text = canvas.create_text(center, baseline + 9, text="–",
+                                          font=("Arial", 9), fill=MUTED_COLOR)
+        else:
+            height = self.scaled_height(value)
+            bar = canvas.create_rectangle(center - bar_w / 2, baseline - height, center + bar_w / 2, baseline,
+                                          fill=self.color, outline="")
+            if show_values:
+                text = canvas.create_text(center, baseline + 9, text=self.value_format(value),
+                                          font=("Arial", 9, "bold"), fill=self.text_color)
+        return [bar, text, height]
+
+    def update(self, points, width):
+        """Bring the canvas up to date with points, touching only the bars that changed.
+
+        Falls back to draw() when the width or the dates differ from the last
+        drawing, since then every bar moves anyway. Returns how many points
+        were redrawn.
+        """
+        points, old = list(points), self.points
+        if (old is None or width != self.width or len(points) != len(old)
+                or any(new[0] != was[0] for new, was in zip(points, old))):
+            self.draw(points, width)
+            return len(points)
+
+        canvas = self.canvas
+        changed = 0
+        for i, ((_, value), (_, was)) in enumerate(zip(points, old)):
+            height = None if value is None else self.scaled_height(value)
+            items = self._items[i]
+            if value == was and height == items[2]:
+                continue
+            changed += 1
+            if (value is None) != (was is None):
+                # The bar appears or goes: replace just this point's items
+                for item in items[:2]:
+                    if item is not None:
+                        canvas.delete(item)
+                self._items[i] = self._draw_value(i, value)
+                continue
+            baseline, slot, bar_w, show_values = self._layout
+            center = SIDE_PAD + slot * (i + 0.5)
+            canvas.coords(items[0], center - bar_w / 2, baseline - height, center + bar_w / 2, baseline)
+            items[2] = height
+            if show_values:
+                canvas.itemconfigure(items[1], text=self.value_format(value))
+        self.points = points
+        return changed
+
+
+class HeatmapRenderer:
+    """Lays out days from first to last as a calendar of coloured cells.
+
+    colors maps ISO dates to fill colours; days missing from it are drawn
+    empty. Like ChartRenderer it only uses create_*/itemconfigure/delete, so
+    it runs against a stand-in canvas too.
+    """
+
+    def __init__(self, canvas, cell=CELL_SIZE, gap=CELL_GAP, empty_color=EMPTY_CELL_COLOR):
+        self.canvas = canvas
+        self.cell = cell
+        self.gap = gap
+        self.empty_color = empty_color
+        self.origin = None      # Monday of the first column
+        self.first = self.last = None
+        self._cells = {}        # ISO date -> (cell id, fill colour)
+
+    def size(self, first, last):
+        weeks = (last - (first - timedelta(days=first.weekday()))).days // 7 + 1
+        pitch = self.cell + self.gap
+        return WEEKDAY_LABEL_SPACE + weeks * pitch, MONTH_LABEL_SPACE + 7 * pitch
+
+    def draw(self, first, last, colors):
+        canvas = self.canvas
+        canvas.delete("all")
+        self.first, self.last = first, last
+        self._cells = {}
+        self.origin = first - timedelta(days=first.weekday())
+        pitch = self.cell + self.gap
+
+        for weekday, label in WEEKDAY_LABELS.items():
+            canvas.create_text(WEEKDAY_LABEL_SPACE - 6, MONTH_LABEL_SPACE + weekday * pitch + self.cell / 2,
+                               text=label, anchor="e", font=("Arial", 8), fill=MUTED_COLOR)
+
+        day = first
+        while day <= last:
+            offset = (day - self.origin).days
+            x = WEEKDAY_LABEL_SPACE + (offset // 7) * pitch
+            y = MONTH_LABEL_SPACE + (offset % 7) * pitch
+            if day.day == 1 or day == first:
+                canvas.create_text(x, MONTH_LABEL_SPACE - 4, text=day.strftime("%b"), anchor="sw",
+                                   font=("Arial", 8), fill=MUTED_COLOR)
+            iso = day.isoformat()
+            fill = colors.get(iso, self.empty_color)
+            self._cells[iso] = (canvas.create_rectangle(x, y, x + self.cell, y + self.cell,
+                                                        outline="", fill=fill), fill)
+            day += timedelta(days=1)
+
+    def update(self, first, last, colors):
+        """Recolour only the cells that changed; a different range is drawn afresh.
+
+        Returns how many cells were touched.
+        """
+        if (first, last) != (self.first, self.last):
+            self.draw(first, last, colors)
+            return len(self._cells)
+        changed = 0
+        for iso, (cell, was) in self._cells.items():
+            fill = colors.get(iso, self.empty_color)
+            if fill != was:
+                self.canvas.itemconfigure(cell, fill=fill)
+                self._cells[iso] = (cell, fill)
+                changed += 1
+        return changed
+
+    def date_at(self, x, y):
+        """ISO date of the cell under canvas point (x, y), or None."""
+        if self.origin is None:
+            return None
+        pitch = self.cell + self.gap
+        column, row = (x - WEEKDAY_LABEL_SPACE) // pitch, (y - MONTH_LABEL_SPACE) // pitch
+        if x < WEEKDAY_LABEL_SPACE or y < MONTH_LABEL_SPACE or row > 6:
+            return None
+        day = self.origin + timedelta(days=int(column) * 7 + int(row))
+        return day.isoformat() if self.first <= day <= self.last else None
+
+
+# ─── WIDGET ──────────────────────────────────────────────────────────────────
+
+class BarChart(ctk.CTkFrame):
+    """A titled bar chart drawn on a single canvas, whatever the point count."""
+
+    def __init__(self, parent, title, color, max_val, title_font=("Arial", 14, "bold"),
+                 title_pady=(10, 5), canvas_pady=(0, 10), **renderer_options):
+        super().__init__(parent)
+
+        self.title_label = ctk.CTkLabel(self, text=title, font=title_font)
+        self.title_label.pack(anchor="w", padx=10, pady=title_pady)
+
+        bar_height = renderer_options.get("bar_height", 80)
+        self.canvas = tk.Canvas(
+            self,
+            height=TOP_PAD + bar_height + LABEL_SPACE,
+            bg=self._apply_appearance_mode(self.cget("fg_color")),
+            highlightthickness=0
+        )
+        self.canvas.pack(fill="x", padx=10, pady=canvas_pady)
+
+        text_color = self._apply_appearance_mode(ctk.ThemeManager.theme["CTkLabel"]["text_color"])
+        self.renderer = ChartRenderer(self.canvas, color, max_val, text_color=text_color,
+                                      **renderer_options)
+        self.points = []
+        self._drawn_width = None
+        self.canvas.bind("<Configure>", self._on_resize)
+
+    def set_data(self, points, max_val=None):
+        """Show points; only the bars that differ from the last call are redrawn."""
+        self.points = list(points)
+        if max_val is not None:
+            self.renderer.max_val = max_val
+        self._redraw()
+
+    def _on_resize(self, event):
+        if event.width != self._drawn_width:
+            self._redraw()
+
+    def _redraw(self):
+        width = self.canvas.winfo_width()
+        if width <= 1:
+            # Not mapped yet; the first <Configure> will draw it.
+            return
+        self._drawn_width = width
+        self.renderer.update(self.points, width)
+
+
+class CalendarHeatmap(ctk.CTkFrame):
+    """A titled calendar heatmap on one canvas; on_click(iso_date) fires for day cells."""
+
+    def __init__(self, parent, title, title_font=("Arial", 14, "bold"), on_click=None, **renderer_options):
+        super().__init__(parent)
+
+        self.title_label = ctk.CTkLabel(self, text=title, font=title_font)
+        self.title_label.pack(anchor="w", padx=10, pady=(10, 5))
+
+        self.canvas = tk.Canvas(self, height=1, width=1, highlightthickness=0,
+                                bg=self._apply_appearance_mode(self.cget("fg_color")))
+        self.canvas.pack(anchor="w", padx=10, pady=(0, 10))
+        self.renderer = HeatmapRenderer(self.canvas, **renderer_options)
+        self.on_click = on_click
+        if on_click is not None:
+            self.canvas.configure(cursor="hand2")
+            self.canvas.bind("<Button-1>", self._on_click)
+
+    def set_data(self, first, last, colors):
+        if (first, last) != (self.renderer.first, self.renderer.last):
+            width, height = self.renderer.size(first, last)
+            self.canvas.configure(width=width, height=height)
+        self.renderer.update(first, last, colors)
+
+    def _on_click(self, event):
+        day = self.renderer.date_at(self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
+        if day is not None:
+            self.on_click(day)
@@ -0,0 +1,147 @@
+"""Headless command line for tracker.db.
+
+    python tracker_cli.py import log.json
+    python tracker_cli.py import history.csv --replace
+    python tracker_cli.py export nightly.jsonl --since 2026-01-01
+    python tracker_cli.py --profile Sam import sam.csv
+    python tracker_cli.py sync --dir /media/usb/tracker-sync
+    python tracker_cli.py serve-sync --host 0.0.0.0          # on the desktop
+    python tracker_cli.py sync --connect desktop:8765         # on the laptop
+    python tracker_cli.py serve-api                           # JSON API, see tracker_api.py
+"""
+import argparse
+import sqlite3
+import sys
+
+from tracker_db import DB_PATH, Database, profile_path
+
+# ─── COMMANDS ────────────────────────────────────────────────────────────────
+
+def cmd_import(db, args):
+    from tracker_io import import_file
+
+    total = skipped = 0
+    elapsed = 0.0
+    for path in args.files:
+        count, bad, seconds = import_file(db, path, fmt=args.format, replace=args.replace)
+        print(f"{path}: {count} rows" + (f", {bad} skipped" if bad else ""))
+        total += count
+        skipped += bad
+        elapsed += seconds
+
+    rate = total / elapsed if elapsed > 0 else 0
+    print(f"✅ Imported {total} rows in {elapsed:.2f}s ({rate:,.0f} rows/sec)")
+    return 0
+
+
+def cmd_export(db, args):
+    from tracker_io import export_file
+
+    count, seconds = export_file(db, args.path, fmt=args.format, since=args.since, until=args.until)
+    rate = count / seconds if seconds > 0 else 0
+    print(f"✅ Exported {count} rows in {seconds:.2f}s ({rate:,.0f} rows/sec)", file=sys.stderr)
+    return 0
+
+
+def cmd_sync(db, args):
+    from tracker_sync import DEFAULT_PORT, sync_directory, sync_socket
+
+    if args.dir:
+        sent, received, applied = sync_directory(db, args.dir)
+    else:
+        host, _, port = args.connect.rpartition(":") if ":" in args.connect else (args.connect, "", "")
+        sent, received, applied = sync_socket(db, host, int(port or DEFAULT_PORT))
+    print(f"✅ Sent {sent} changes, received {received}, applied {applied}")
+    return 0
+
+
+def cmd_serve_sync(db, args):
+    from tracker_sync import serve
+
+    try:
+        serve(db.path, args.host, args.port)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def cmd_serve_api(db, args):
+    from tracker_api import serve
+
+    try:
+        serve(db.path, args.host, args.port)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def cmd_new_site(db, args):
+    print(f"✅ This copy's site id is now {db.reset_site_id()}")
+    return 0
+
+
+# ─── ENTRY POINT ─────────────────────────────────────────────────────────────
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="tracker_cli", description="Daily Tracker without the GUI.")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--db", default=DB_PATH, help=f"database file (default: {DB_PATH})")
+    target.add_argument("--profile", help="use this profile's database instead of --db")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("import", help="bulk-import a legacy log.json or a CSV file")
+    p.add_argument("files", nargs="+")
+    p.add_argument("--format", choices=("json", "csv"), help="default: guessed from the extension")
+    p.add_argument("--replace", action="store_true", help="overwrite days that are already logged")
+    p.set_defaults(func=cmd_import)
+
+    p = commands.add_parser("export", help="stream daily_log + weekly_weight to CSV, JSONL or columnar")
+    p.add_argument("path", help='output file, or "-" for stdout')
+    p.add_argument("--format", choices=("csv", "jsonl", "tcol"), help="default: guessed from the extension")
+    p.add_argument("--since", default="", help="first ISO date to include")
+    p.add_argument("--until", default="9999-12-31", help="last ISO date to include")
+    p.set_defaults(func=cmd_export)
+
+    p = commands.add_parser("sync", help="exchange changes with another copy of the database")
+    via = p.add_mutually_exclusive_group(required=True)
+    via.add_argument("--dir", help="folder shared by the copies (each keeps a <site>.jsonl there)")
+    via.add_argument("--connect", metavar="HOST[:PORT]", help="a copy running serve-sync")
+    p.set_defaults(func=cmd_sync)
+
+    p = commands.add_parser("serve-sync", help="let other copies sync with this one over TCP")
+    p.add_argument("--host", default="127.0.0.1", help="address to listen on (no authentication: "
+                                                      "only use 0.0.0.0 on a trusted network)")
+    p.add_argument("--port", type=int, default=8765)
+    p.set_defaults(func=cmd_serve_sync)
+
+    p = commands.add_parser("serve-api", help="answer HTTP/JSON queries and writes for scripts and dashboards")
+    p.add_argument("--host", default="127.0.0.1", help="address to listen on (no authentication: "
+                                                      "only use 0.0.0.0 on a trusted network)")
+    p.add_argument("--port", type=int, default=8766)
+    p.set_defaults(func=cmd_serve_api)
+
+    p = commands.add_parser("new-site", help="give a copied database file its own sync identity")
+    p.set_defaults(func=cmd_new_site)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        path = profile_path(args.profile) if args.profile else args.db
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    db = Database(path)
+    try:
+        return args.func(db, args)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1012 @@
+import sys
+import os
+import re
+import sqlite3
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+from tracker_record import DAILY_FIELDS, NUMBER_FIELDS, DayRecord
+
+# ─── CONSTANTS ──────────────────────────────────────────────────────────────
+
+# Determine database path - works for both .py and .exe
+if getattr(sys, 'frozen', False):
+    # Running as compiled .exe
+    DB_PATH = os.path.join(os.path.dirname(sys.executable), "tracker.db")
+else:
+    # Running as Python script
+    DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tracker.db")
+
+# Pragmas are connection-level settings, so they only need to run once per
+# Database instead of once per query.
+PRAGMAS = (
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    # Wait for another writer (a second app window, the CLI) instead of
+    # failing straight away with "database is locked"
+    "PRAGMA busy_timeout = 5000",
+)
+
+# SQL text is kept in module constants so every call hands sqlite3 the exact
+# same string and hits its prepared-statement cache instead of re-parsing.
+DAILY_COLUMNS = DAILY_FIELDS
+# Bulk imports keep whatever is already logged unless asked to overwrite
+INSERT_DAY_IF_NEW = f"""
+    INSERT OR IGNORE INTO daily_log
+    ({", ".join(DAILY_COLUMNS)})
+    VALUES ({", ".join("?" * len(DAILY_COLUMNS))})
+"""
+INSERT_WEIGHT_IF_NEW = "INSERT OR IGNORE INTO weekly_weight (date, weight_kg) VALUES (?, ?)"
+# A true upsert rather than INSERT OR REPLACE: an existing day is updated in
+# place, so UPDATE triggers see both the old and the new notes.
+UPSERT_DAY = INSERT_DAY_IF_NEW.replace("OR IGNORE ", "") + f"""
+    ON CONFLICT (date) DO UPDATE SET
+    {", ".join(f"{c} = excluded.{c}" for c in DAILY_COLUMNS[1:])}
+"""
+UPSERT_WEIGHT = (INSERT_WEIGHT_IF_NEW.replace("OR IGNORE ", "")
+                 + " ON CONFLICT (date) DO UPDATE SET weight_kg = excluded.weight_kg")
+# Every day in [:since, :until] with a daily_log row or a weigh-in, oldest
+# first. (A LEFT JOIN alone would drop weigh-ins on days with no entry.)
+# The trailing `logged` column tells the two kinds of row apart.
+SELECT_DAY_RANGE = f"""
+    SELECT {", ".join("d." + c for c in DAILY_COLUMNS)}, w.weight_kg, 1 AS logged
+    FROM daily_log d
+    LEFT JOIN weekly_weight w ON w.date = d.date
+    WHERE d.date BETWEEN :since AND :until
+    UNION ALL
+    SELECT w.date, {", ".join("NULL" for _ in DAILY_COLUMNS[1:])}, w.weight_kg, 0
+    FROM weekly_weight w
+    WHERE w.date BETWEEN :since AND :until
+      AND NOT EXISTS (SELECT 1 FROM daily_log d WHERE d.date = w.date)
+    ORDER BY 1
+"""
+SELECT_DAY_PAGE = SELECT_DAY_RANGE + "    LIMIT :limit\n"
+SELECT_WEIGHT_PAGE = """
+    SELECT date, weight_kg FROM weekly_weight
+    WHERE date BETWEEN :since AND :until
+    ORDER BY date
+    LIMIT :limit
+"""
+# Numeric columns for tracker_analytics, one row per day (with a daily_log
+# entry or a weigh-in), oldest first. Ordered by the clustered date key
+# rather than `day`, which would cost a table lookup per row.
+SELECT_METRICS = """
+    SELECT d.date, 1 AS logged, d.sleep_hours, d.calories, d.mood, d.discomfort_level,
+           d.gym_notes != '' AS trained, w.weight_kg
+    FROM daily_log d
+    LEFT JOIN weekly_weight w ON w.date = d.date
+    UNION ALL
+    SELECT w.date, 0, NULL, NULL, NULL, NULL, 0, w.weight_kg
+    FROM weekly_weight w
+    WHERE NOT EXISTS (SELECT 1 FROM daily_log d WHERE d.date = w.date)
+    ORDER BY 1
+"""
+SELECT_RECENT_WEIGHTS = "SELECT weight_kg FROM weekly_weight ORDER BY date DESC LIMIT ?"
+SELECT_FIRST_DATE = """
+    SELECT MIN(first) FROM (
+        SELECT MIN(date) AS first FROM daily_log
+        UNION ALL
+        SELECT MIN(date) FROM weekly_weight
+    )
+"""
+SELECT_GYM_NOTES = """
+    SELECT date, gym_notes FROM daily_log
+    WHERE date >= ? AND gym_notes != ''
+    ORDER BY date DESC
+    LIMIT ? OFFSET ?
+"""
+COUNT_GYM_NOTES = "SELECT COUNT(*) FROM daily_log WHERE date >= ? AND gym_notes != ''"
+
+# ─── SCHEMA ──────────────────────────────────────────────────────────────────
+
+# Days are keyed by ISO date text, which every query, export and the apps
+# use. Each row also has an integer day number (days since 1970-01-01)
+# generated from that text, so day arithmetic never has to parse strings.
+DAY_NUMBER = "CAST(julianday(date) - 2440587.5 AS INTEGER)"
+
+
+def _number_check(column):
+    kind, low, high = NUMBER_FIELDS[column]
+    kinds = "'integer', 'real'" if kind == "real" else "'integer'"
+    bounds = f"{column} >= {low}" if high is None else f"{column} BETWEEN {low} AND {high}"
+    return f"{column} IS NULL OR (typeof({column}) IN ({kinds}) AND {bounds})"
+
+
+# Table -> (column definitions, {constraint name: CHECK expression})
+TYPED_TABLES = {
+    "daily_log": (
+        f"""date TEXT NOT NULL PRIMARY KEY,
+        day INTEGER GENERATED ALWAYS AS ({DAY_NUMBER}) VIRTUAL,
+        sleep_hours REAL,
+        sleep_disturbances INTEGER,
+        calories INTEGER,
+        mood INTEGER,
+        discomfort_level INTEGER,
+        discomfort_notes TEXT,
+        gym_notes TEXT""",
+        {
+            "date_is_iso": "date IS date(date)",
+            **{f"{column}_valid": _number_check(column) for column in NUMBER_FIELDS if column in DAILY_COLUMNS},
+        },
+    ),
+    "weekly_weight": (
+        f"""date TEXT NOT NULL PRIMARY KEY,
+        day INTEGER GENERATED ALWAYS AS ({DAY_NUMBER}) VIRTUAL,
+        weight_kg REAL""",
+        {
+            "date_is_iso": "date IS date(date)",
+            "weight_kg_valid": _number_check("weight_kg"),
+        },
+    ),
+}
+
+
+def _typed_table_sql(table, name=None):
+    columns, checks = TYPED_TABLES[table]
+    constraints = "".join(f",\n        CONSTRAINT {c} CHECK ({expr})" for c, expr in checks.items())
+    return f"CREATE TABLE {name or table} (\n        {columns}{constraints}\n    ) WITHOUT ROWID"
+
+
+def _migrate_baseline(conn):
+    """v1: the tables as Track2.0/track3.0 created them before versioning."""
+    conn.execute("""CREATE TABLE IF NOT EXISTS daily_log (
+        date TEXT PRIMARY KEY,
+        sleep_hours REAL,
+        sleep_disturbances INTEGER,
+        calories INTEGER,
+        mood INTEGER,
+        discomfort_level INTEGER,
+        discomfort_notes TEXT,
+        gym_notes TEXT
+    )""")
+    conn.execute("""CREATE TABLE IF NOT EXISTS weekly_weight (
+        date TEXT PRIMARY KEY,
+        weight_kg REAL
+    )""")
+
+
+def _migrate_typed_tables(conn):
+    """v2: CHECK constraints, rows clustered by date, integer day numbers.
+
+    SQLite can't add constraints to an existing table, so both tables are
+    rebuilt. Nothing is thrown away: rows that break a constraint, or that
+    can't be carried over at all (no usable date, including NULL), are kept
+    as they were in <table>_invalid. If their date is usable the row is also
+    carried over with just the offending values blanked.
+    """
+    for table, (_, checks) in TYPED_TABLES.items():
+        columns = [row["name"] for row in conn.execute(f"PRAGMA table_info({table})")]
+        # A CHECK passes unless its expression is false, i.e. IS NOT 0, so
+        # date_is_iso alone lets a NULL date through; NOT NULL catches it
+        valid = " AND ".join(f"({expr}) IS NOT 0" for expr in checks.values())
+        carried = f"date IS NOT NULL AND ({checks['date_is_iso']}) IS NOT 0"
+        conn.execute(f"CREATE TABLE {table}_invalid AS SELECT * FROM {table} "
+                     f"WHERE NOT ({valid}) OR NOT ({carried})")
+        if not conn.execute(f"SELECT EXISTS (SELECT 1 FROM {table}_invalid)").fetchone()[0]:
+            conn.execute(f"DROP TABLE {table}_invalid")
+
+        kept = ", ".join(
+            f"CASE WHEN ({checks[f'{column}_valid']}) IS NOT 0 THEN {column} END"
+            if f"{column}_valid" in checks else column
+            for column in columns
+        )
+        conn.execute(_typed_table_sql(table, f"{table}_new"))
+        conn.execute(f"INSERT INTO {table}_new ({', '.join(columns)}) SELECT {kept} FROM {table} "
+                     f"WHERE {carried}")
+        conn.execute(f"DROP TABLE {table}")
+        conn.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+        conn.execute(f"CREATE UNIQUE INDEX {table}_day ON {table} (day)")
+
+    # Lets the gym-notes list walk back from the newest note without
+    # stepping over every day that has none
+    conn.execute("CREATE INDEX daily_log_gym_notes ON daily_log (date) WHERE gym_notes != ''")
+
+
+# Sleep quality, as the entry form has always rated a night: good is 7+ hours
+# with at most one disturbance, okay is 6+ hours, anything less is poor.
+POOR_SLEEP, OKAY_SLEEP, GOOD_SLEEP = 0, 1, 2
+SLEEP_QUALITY_LABELS = {GOOD_SLEEP: "Good", OKAY_SLEEP: "Okay", POOR_SLEEP: "Poor"}
+SLEEP_QUALITY_SQL = f"""CASE
+    WHEN sleep_hours IS NULL THEN NULL
+    WHEN sleep_hours >= 7 AND IFNULL(sleep_disturbances, 0) <= 1 THEN {GOOD_SLEEP}
+    WHEN sleep_hours >= 6 THEN {OKAY_SLEEP}
+    ELSE {POOR_SLEEP} END"""
+
+
+def classify_sleep(hours, disturbances):
+    """The same rating as daily_log.sleep_quality, for values not saved yet."""
+    if hours is None:
+        return None
+    if hours >= 7 and (disturbances or 0) <= 1:
+        return GOOD_SLEEP
+    if hours >= 6:
+        return OKAY_SLEEP
+    return POOR_SLEEP
+
+
+def _migrate_sleep_quality(conn):
+    """v3: sleep_quality as a generated column, so it is rated once in SQL for every day."""
+    conn.execute(f"ALTER TABLE daily_log ADD COLUMN sleep_quality INTEGER "
+                 f"GENERATED ALWAYS AS ({SLEEP_QUALITY_SQL}) VIRTUAL")
+
+
+# Fields recorded in change_log, per table. Generated columns are derived
+# from these, so they never need syncing.
+JOURNAL_FIELDS = {
+    "daily_log": DAILY_COLUMNS[1:],
+    "weekly_weight": ("weight_kg",),
+}
+# Stamp of the entries a file is seeded with: older than any real edit
+SEED_STAMP = "1970-01-01T00:00:00.000Z"
+
+
+def _migrate_change_log(conn):
+    """v4: the append-only change journal sync works from.
+
+    Every value already in the file is journalled once, under this copy's
+    new site id and SEED_STAMP, so a first sync carries it across and any
+    later edit on either side wins over it.
+    """
+    conn.execute("CREATE TABLE sync_meta (key TEXT NOT NULL PRIMARY KEY, value) WITHOUT ROWID")
+    conn.execute("INSERT INTO sync_meta (key, value) VALUES ('site', lower(hex(randomblob(8))))")
+    conn.execute("""CREATE TABLE sync_peers (
+        site TEXT NOT NULL PRIMARY KEY,
+        received INTEGER NOT NULL
+    ) WITHOUT ROWID""")
+    # AUTOINCREMENT: a seq is never reused, even for an entry replaced in
+    # the same millisecond, so a peer's watermark can't skip past one
+    conn.execute("""CREATE TABLE change_log (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        site TEXT NOT NULL,
+        stamp TEXT NOT NULL,
+        tbl TEXT NOT NULL,
+        date TEXT NOT NULL,
+        field TEXT NOT NULL,
+        value
+    )""")
+    conn.execute("CREATE UNIQUE INDEX change_log_field ON change_log (tbl, date, field, stamp, site)")
+    for table, fields in JOURNAL_FIELDS.items():
+        conn.execute(
+            "INSERT INTO change_log (site, stamp, tbl, date, field, value) "
+            f"SELECT (SELECT value FROM sync_meta WHERE key = 'site'), '{SEED_STAMP}', '{table}', date, field, value "
+            "FROM (" + " UNION ALL ".join(
+                f"SELECT date, '{f}' AS field, {f} AS value FROM {table} WHERE {f} IS NOT NULL" for f in fields
+            ) + ") ORDER BY date"
+        )
+
+
+def _migrate_journal_triggers(conn):
+    """v5: drop the v4 journal triggers; init_schema() creates the current ones."""
+    for table in JOURNAL_FIELDS:
+        for event in ("insert", "update"):
+            conn.execute(f"DROP TRIGGER IF EXISTS {table}_journal_{event}")
+
+
+# Applied in order; PRAGMA user_version records how many have run. Only ever
+# append here: a released migration must not change.
+MIGRATIONS = (
+    _migrate_baseline,
+    _migrate_typed_tables,
+    _migrate_sleep_quality,
+    _migrate_change_log,
+    _migrate_journal_triggers,
+)
+SCHEMA_VERSION = len(MIGRATIONS)
+
+# Sleep quality for History: per night for the heatmap, and good/okay/poor
+# counts per month in one aggregate pass
+SLEEP_HEATMAP_DAYS = 371    # 53 full weeks
+SELECT_SLEEP_NIGHTS = """
+    SELECT date, sleep_quality FROM daily_log
+    WHERE date >= ? AND sleep_quality IS NOT NULL
+    ORDER BY date
+"""
+SELECT_SLEEP_MONTHS = f"""
+    SELECT date(date, 'start of month') AS month,
+           SUM(sleep_quality = {GOOD_SLEEP}) AS good,
+           SUM(sleep_quality = {OKAY_SLEEP}) AS okay,
+           SUM(sleep_quality = {POOR_SLEEP}) AS poor,
+           COUNT(sleep_quality) AS nights
+    FROM daily_log
+    WHERE date >= ?
+    GROUP BY 1
+    ORDER BY 1
+"""
+
+# Calendar heatmap: one metric over a date range. The column name is
+# formatted in, so only names from HEATMAP_METRICS may be passed.
+HEATMAP_METRICS = ("mood", "discomfort_level", "calories", "sleep_hours")
+SELECT_METRIC_RANGE = """
+    SELECT date, {metric} FROM daily_log
+    WHERE date BETWEEN ? AND ? AND {metric} IS NOT NULL
+"""
+
+# ─── ROLLUPS ─────────────────────────────────────────────────────────────────
+
+# Per-week and per-month sums/counts/min/max, kept current by triggers on the
+# source tables so summaries and long-range charts read one row per bucket.
+# Metric prefix -> (daily_log column, aggregated expression). Zeros count as
+# "not logged" for sleep, calories and mood, like the old Python summary did.
+DAILY_METRICS = {
+    "sleep": ("sleep_hours", "NULLIF(sleep_hours, 0)"),
+    "disturb": ("sleep_disturbances", "sleep_disturbances"),
+    "cal": ("calories", "NULLIF(calories, 0)"),
+    "mood": ("mood", "NULLIF(mood, 0)"),
+    "disc": ("discomfort_level", "discomfort_level"),
+}
+WEIGHT_METRICS = {
+    "weight": ("weight_kg", "weight_kg"),
+}
+
+# Period -> (first day, last day) of the bucket holding the date {d}
+ROLLUP_PERIODS = {
+    "week": ("date({d}, '-6 days', 'weekday 1')", "date({d}, '-6 days', 'weekday 1', '+6 days')"),
+    "month": ("date({d}, 'start of month')", "date({d}, 'start of month', '+1 month', '-1 day')"),
+}
+
+# Rollup table -> (source table, metrics)
+ROLLUPS = {
+    "daily_rollup": ("daily_log", DAILY_METRICS),
+    "weight_rollup": ("weekly_weight", WEIGHT_METRICS),
+}
+
+
+def _aggregates(metrics):
+    return ", ".join(
+        f"SUM({expr}), COUNT({expr}), MIN({expr}), MAX({expr})"
+        for _, expr in metrics.values()
+    )
+
+
+def _rollup_table_sql(table, metrics):
+    columns = "".join(
+        f"{m}_sum REAL, {m}_count INTEGER NOT NULL, {m}_min REAL, {m}_max REAL, "
+        for m in metrics
+    )
+    return (f"CREATE TABLE IF NOT EXISTS {table} (period TEXT NOT NULL, bucket TEXT NOT NULL, "
+            f"days INTEGER NOT NULL, {columns}PRIMARY KEY (period, bucket)) WITHOUT ROWID")
+
+
+def _rollup_refresh_sql(table, source, metrics, period, day):
+    """Statements recomputing the one bucket of `period` that holds `day`."""
+    first, last = (expr.format(d=day) for expr in ROLLUP_PERIODS[period])
+    return [
+        f"DELETE FROM {table} WHERE period = '{period}' AND bucket = {first}",
+        f"INSERT INTO {table} SELECT * FROM ("
+        f"SELECT '{period}', {first}, COUNT(*) AS days, {_aggregates(metrics)} "
+        f"FROM {source} WHERE date BETWEEN {first} AND {last}) WHERE days > 0",
+    ]
+
+
+def _rollup_trigger_sql(table, source, metrics):
+    """Trigger name -> CREATE TRIGGER statement for one rollup table."""
+    triggers = {}
+    for event, refs in (("INSERT", ("new",)), ("UPDATE", ("old", "new")), ("DELETE", ("old",))):
+        body = []
+        for ref in refs:
+            for period in ROLLUP_PERIODS:
+                body += _rollup_refresh_sql(table, source, metrics, period, f"{ref}.date")
+        name = f"{table}_after_{event.lower()}"
+        triggers[name] = (f"CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON {source} "
+                          f"BEGIN {'; '.join(body)}; END")
+    return triggers
+
+
+def _rollup_rebuild_sql(table, source, metrics):
+    statements = [f"DELETE FROM {table}"]
+    for period, (first, _) in ROLLUP_PERIODS.items():
+        statements.append(
+            f"INSERT INTO {table} SELECT '{period}', {first.format(d='date')}, COUNT(*), "
+            f"{_aggregates(metrics)} FROM {source} GROUP BY 2"
+        )
+    return statements
+
+
+ROLLUP_TABLES = tuple(
+    _rollup_table_sql(table, metrics)
+    for table, (_, metrics) in ROLLUPS.items()
+)
+ROLLUP_TRIGGERS = {
+    name: statement
+    for table, (source, metrics) in ROLLUPS.items()
+    for name, statement in _rollup_trigger_sql(table, source, metrics).items()
+}
+ROLLUP_REBUILD = tuple(
+    statement
+    for table, (source, metrics) in ROLLUPS.items()
+    for statement in _rollup_rebuild_sql(table, source, metrics)
+)
+
+
+def _averages(metrics, prefix=""):
+    return ",\n".join(
+        f"1.0 * {prefix}{m}_sum / {prefix}{m}_count AS {column}"
+        for m, (column, _) in metrics.items()
+    )
+
+
+# Whole-range summary: the partial month at the start of the range is read
+# from daily_log (at most 30 rows), every later month from daily_rollup.
+SELECT_SUMMARY = f"""
+    WITH parts AS (
+        SELECT {_aggregates(DAILY_METRICS)}
+        FROM daily_log
+        WHERE date >= :start AND date < date(:start, '-1 day', 'start of month', '+1 month')
+        UNION ALL
+        SELECT {", ".join(f"SUM({m}_sum), SUM({m}_count), MIN({m}_min), MAX({m}_max)" for m in DAILY_METRICS)}
+        FROM daily_rollup
+        WHERE period = 'month' AND bucket >= date(:start, '-1 day', 'start of month', '+1 month')
+    ),
+    totals ({", ".join(f"{m}_sum, {m}_count, {m}_min, {m}_max" for m in DAILY_METRICS)}) AS (
+        SELECT * FROM parts
+    )
+    SELECT {", ".join(
+        f"1.0 * SUM({m}_sum) / SUM({m}_count) AS {column}, "
+        f"MIN({m}_min) AS {column}_min, MAX({m}_max) AS {column}_max"
+        for m, (column, _) in DAILY_METRICS.items()
+    )}
+    FROM totals
+"""
+
+# ─── NOTES SEARCH ────────────────────────────────────────────────────────────
+
+# Full-text index over the free-text columns of daily_log. Its rowid is the
+# day number, kept in step by triggers like the rollups. Days without notes
+# are left out. Porter stemming lets "deadlifts" find "deadlift".
+NOTES_COLUMNS = ("gym_notes", "discomfort_notes")
+NOTES_TABLE = (f"CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5("
+               f"{', '.join(NOTES_COLUMNS)}, tokenize = 'porter unicode61')")
+
+# Highlight markers around each hit in a snippet; SearchWindow turns them into tags
+HIT_START = "\x02"
+HIT_END = "\x03"
+SNIPPET_TOKENS = 16
+SEARCH_PAGE_SIZE = 20
+
+
+def _notes_index_sql(ref):
+    has_notes = " OR ".join(f"{ref}.{c} != ''" for c in NOTES_COLUMNS)
+    return (f"INSERT INTO notes_fts (rowid, {', '.join(NOTES_COLUMNS)}) "
+            f"SELECT {ref}.day, {', '.join(f'{ref}.{c}' for c in NOTES_COLUMNS)} WHERE {has_notes}")
+
+
+NOTES_TRIGGERS = {
+    "notes_fts_after_insert": f"""CREATE TRIGGER IF NOT EXISTS notes_fts_after_insert
+        AFTER INSERT ON daily_log BEGIN {_notes_index_sql("new")}; END""",
+    "notes_fts_after_update": f"""CREATE TRIGGER IF NOT EXISTS notes_fts_after_update
+        AFTER UPDATE OF {", ".join(NOTES_COLUMNS)} ON daily_log
+        WHEN {" OR ".join(f"old.{c} IS NOT new.{c}" for c in NOTES_COLUMNS)} BEGIN
+        DELETE FROM notes_fts WHERE rowid = old.day; {_notes_index_sql("new")}; END""",
+    "notes_fts_after_delete": """CREATE TRIGGER IF NOT EXISTS notes_fts_after_delete
+        AFTER DELETE ON daily_log BEGIN DELETE FROM notes_fts WHERE rowid = old.day; END""",
+}
+NOTES_REBUILD = (
+    "DELETE FROM notes_fts",
+    _notes_index_sql("daily_log").replace("WHERE", "FROM daily_log WHERE"),
+)
+
+SEARCH_NOTES = f"""
+    SELECT d.date, snippet(notes_fts, -1, char({ord(HIT_START)}), char({ord(HIT_END)}), '…', {SNIPPET_TOKENS}) AS snippet
+    FROM notes_fts
+    JOIN daily_log d ON d.day = notes_fts.rowid
+    WHERE notes_fts MATCH :query
+    ORDER BY notes_fts.rank
+    LIMIT :limit OFFSET :offset
+"""
+COUNT_NOTES = "SELECT COUNT(*) FROM notes_fts WHERE notes_fts MATCH :query"
+
+
+def notes_query(text):
+    """Turn what the user typed into an FTS5 query.
+
+    Every word must appear, taken literally (no FTS syntax errors from
+    quotes or dashes). The last word also matches as a prefix, so results
+    show up while the user is still typing it.
+    """
+    words = text.split()
+    if not words:
+        return ""
+    terms = ['"' + word.replace('"', '""') + '"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+# ─── CHANGE LOG ──────────────────────────────────────────────────────────────
+
+# Every field a save changes is appended to change_log with this copy's
+# site id and a UTC millisecond stamp. Sync ships entries past a peer's
+# watermark (its last seen seq) and keeps, per field, the value with the
+# latest (stamp, site). While remote entries are applied the journal
+# triggers are switched off by an 'applying' row in sync_meta, and the
+# entries are logged with their original site and stamp instead.
+STAMP_NOW = "strftime('%Y-%m-%dT%H:%M:%fZ', 'now')"
+
+
+def _journal_trigger_sql(table, event):
+    # A new row journals only the values actually written: an empty note
+    # is the default, and must not win over a note another copy has
+    changed = "nullif(new.{0}, '') IS NOT NULL" if event == "INSERT" else "new.{0} IS NOT old.{0}"
+    fields = " UNION ALL ".join(
+        f"SELECT '{f}' AS field, new.{f} AS value WHERE {changed.format(f)}" for f in JOURNAL_FIELDS[table]
+    )
+    site = "(SELECT value FROM sync_meta WHERE key = 'site')"
+    # A second write to a field within the same millisecond supersedes the
+    # first. This is an explicit DELETE, not INSERT OR REPLACE: a trigger
+    # takes the conflict policy of the statement that fired it, and an
+    # upsert's is ABORT. 'now' is fixed for the whole statement, so both
+    # see the same stamp.
+    return f"""CREATE TRIGGER IF NOT EXISTS {table}_journal_{event.lower()}
+        AFTER {event} ON {table}
+        WHEN NOT EXISTS (SELECT 1 FROM sync_meta WHERE key = 'applying') BEGIN
+        DELETE FROM change_log
+        WHERE tbl = '{table}' AND date = new.date AND stamp = {STAMP_NOW} AND site = {site}
+          AND field IN (SELECT field FROM ({fields}));
+        INSERT INTO change_log (site, stamp, tbl, date, field, value)
+        SELECT {site}, {STAMP_NOW}, '{table}', new.date, field, value
+        FROM ({fields}); END"""
+
+
+JOURNAL_TRIGGERS = {
+    f"{table}_journal_{event.lower()}": _journal_trigger_sql(table, event)
+    for table in JOURNAL_FIELDS for event in ("INSERT", "UPDATE")
+}
+
+SELECT_SITE = "SELECT value FROM sync_meta WHERE key = 'site'"
+# change_log's AUTOINCREMENT counter: moves with every journaled write, from any connection
+SELECT_JOURNAL_SEQ = "SELECT seq FROM sqlite_sequence WHERE name = 'change_log'"
+SELECT_CHANGES = """
+    SELECT seq, site, stamp, tbl, date, field, value FROM change_log
+    WHERE seq > :since AND (:skip IS NULL OR site != :skip)
+    ORDER BY seq
+    LIMIT :limit
+"""
+SELECT_FIELD_STAMP = """
+    SELECT stamp, site FROM change_log
+    WHERE tbl = ? AND date = ? AND field = ?
+    ORDER BY stamp DESC, site DESC
+    LIMIT 1
+"""
+INSERT_CHANGE = "INSERT INTO change_log (site, stamp, tbl, date, field, value) VALUES (?, ?, ?, ?, ?, ?)"
+SELECT_WATERMARK = "SELECT received FROM sync_peers WHERE site = ?"
+UPSERT_WATERMARK = """
+    INSERT INTO sync_peers (site, received) VALUES (?, ?)
+    ON CONFLICT (site) DO UPDATE SET received = max(received, excluded.received)
+"""
+# Last seq this copy appended to an outbox file, keyed 'outbox:<path>'
+SELECT_META = "SELECT value FROM sync_meta WHERE key = ?"
+UPSERT_META = "INSERT INTO sync_meta (key, value) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value"
+# One field of one day, creating the row if this is the day's first value
+APPLY_FIELD = {
+    (table, field): f"INSERT INTO {table} (date, {field}) VALUES (?, ?) "
+                    f"ON CONFLICT (date) DO UPDATE SET {field} = excluded.{field}"
+    for table, fields in JOURNAL_FIELDS.items() for field in fields
+}
+SYNC_BATCH = 5000       # change_log entries per message / read
+BULK_APPLY = 500        # from this many entries, rebuild rollups once instead of per row
+
+
+# ─── HISTORY RANGES ──────────────────────────────────────────────────────────
+
+# Range key -> number of days back from today (None = everything).
+HISTORY_RANGES = {"7d": 7, "30d": 30, "90d": 90, "1y": 365, "all": None}
+DEFAULT_RANGE = "30d"
+
+# History never returns more points than a chart can usefully draw; longer
+# spans are read per week or month from the rollup tables instead.
+MAX_HISTORY_POINTS = 120
+
+DAILY_HISTORY_SQL = {
+    period: f"""
+        SELECT bucket AS date,
+               {_averages(DAILY_METRICS)}
+        FROM daily_rollup
+        WHERE period = '{period}' AND bucket >= {first.format(d='?')}
+        ORDER BY bucket
+    """
+    for period, (first, _) in ROLLUP_PERIODS.items()
+}
+DAILY_HISTORY_SQL["day"] = "SELECT * FROM daily_log WHERE date >= ? ORDER BY date"
+
+WEIGHT_HISTORY_SQL = {
+    period: f"""
+        SELECT bucket AS date,
+               {_averages(WEIGHT_METRICS)}
+        FROM weight_rollup
+        WHERE period = '{period}' AND bucket >= {first.format(d='?')}
+        ORDER BY bucket
+    """
+    for period, (first, _) in ROLLUP_PERIODS.items()
+}
+WEIGHT_HISTORY_SQL["day"] = "SELECT * FROM weekly_weight WHERE date >= ? ORDER BY date"
+
+STATEMENT_CACHE_SIZE = 64
+
+
+def pick_bucket(span_days):
+    if span_days <= MAX_HISTORY_POINTS:
+        return "day"
+    if span_days / 7 <= MAX_HISTORY_POINTS:
+        return "week"
+    return "month"
+
+
+# ─── PROFILES ────────────────────────────────────────────────────────────────
+
+# Each person tracked on this machine gets their own database file next to
+# DB_PATH: the default profile is tracker.db itself, any other is
+# tracker-<name>.db. Separate files keep every table, index and trigger
+# exactly as it is for a single user.
+DEFAULT_PROFILE = "Default"
+PROFILE_PREFIX = "tracker-"
+PROFILE_NAME = re.compile(r"[A-Za-z0-9][A-Za-z0-9 _-]{0,31}")
+
+
+def profile_path(name):
+    """Database file for a profile; raises ValueError for a name that can't be a file name."""
+    if name == DEFAULT_PROFILE:
+        return DB_PATH
+    if not PROFILE_NAME.fullmatch(name):
+        raise ValueError(f"Profile names are 1-32 letters, digits, spaces, '-' or '_': {name!r}")
+    return os.path.join(os.path.dirname(DB_PATH), f"{PROFILE_PREFIX}{name}.db")
+
+
+def list_profiles():
+    """DEFAULT_PROFILE followed by every other profile with a file, sorted by name."""
+    names = []
+    for filename in os.listdir(os.path.dirname(DB_PATH)):
+        stem, ext = os.path.splitext(filename)
+        name = stem[len(PROFILE_PREFIX):]
+        if (ext == ".db" and stem.startswith(PROFILE_PREFIX) and name != DEFAULT_PROFILE
+                and PROFILE_NAME.fullmatch(name)):
+            names.append(name)
+    return [DEFAULT_PROFILE] + sorted(names, key=str.casefold)
+
+
+# ─── DATABASE ────────────────────────────────────────────────────────────────
+
+class Database:
+    """A single long-lived connection to tracker.db.
+
+    The connection runs in autocommit mode; writes that belong together go
+    through transaction() so they commit (and fsync) once.
+    """
+
+    def __init__(self, path=DB_PATH, check_same_thread=True):
+        self.path = path
+        # check_same_thread=False is for pools that hand the connection to
+        # one thread at a time
+        self.conn = sqlite3.connect(path, isolation_level=None, check_same_thread=check_same_thread,
+                                    cached_statements=STATEMENT_CACHE_SIZE)
+        self.conn.row_factory = sqlite3.Row
+        for pragma in PRAGMAS:
+            self.conn.execute(pragma)
+        self.init_schema()
+
+    def init_schema(self):
+        """Bring the file up to SCHEMA_VERSION, all in one transaction.
+
+        A failed migration rolls back completely and leaves the file as it was.
+        """
+        with self.transaction() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version > SCHEMA_VERSION:
+                raise sqlite3.DatabaseError(
+                    f"{self.path} has schema version {version}; this version of the "
+                    f"tracker only understands up to {SCHEMA_VERSION}"
+                )
+            for number, migrate in enumerate(MIGRATIONS[version:], start=version + 1):
+                migrate(conn)
+                conn.execute(f"PRAGMA user_version = {number}")
+
+            # Rebuilding a table drops its triggers, so these are (re)created
+            # after the migrations rather than by them.
+            for statement in ROLLUP_TABLES + tuple(ROLLUP_TRIGGERS.values()) + tuple(JOURNAL_TRIGGERS.values()):
+                conn.execute(statement)
+            self.init_notes_index(rebuild=version < SCHEMA_VERSION)
+            # Databases written before the rollup tables existed get them
+            # backfilled once; from then on the triggers keep them current.
+            # A migration may have rewritten values, so it rebuilds them too.
+            has_rows = conn.execute(
+                "SELECT EXISTS (SELECT 1 FROM daily_log) OR EXISTS (SELECT 1 FROM weekly_weight)"
+            ).fetchone()[0]
+            has_rollups = conn.execute(
+                "SELECT EXISTS (SELECT 1 FROM daily_rollup) OR EXISTS (SELECT 1 FROM weight_rollup)"
+            ).fetchone()[0]
+            if has_rows and (not has_rollups or version < SCHEMA_VERSION):
+                self.rebuild_rollups()
+
+    def rebuild_rollups(self):
+        for statement in ROLLUP_REBUILD:
+            self.conn.execute(statement)
+
+    def init_notes_index(self, rebuild=False):
+        """Create the notes search index if this SQLite build has FTS5.
+
+        Without FTS5 the tracker still works; search_notes() just isn't
+        available (has_search is False).
+        """
+        try:
+            self.conn.execute(NOTES_TABLE)
+        except sqlite3.OperationalError:
+            self.has_search = False
+            return
+        self.has_search = True
+        for statement in NOTES_TRIGGERS.values():
+            self.conn.execute(statement)
+        # Filled once for databases that predate the index
+        indexed = self.conn.execute("SELECT EXISTS (SELECT 1 FROM notes_fts)").fetchone()[0]
+        if rebuild or not indexed:
+            self.rebuild_notes_index()
+
+    def rebuild_notes_index(self):
+        for statement in NOTES_REBUILD:
+            self.conn.execute(statement)
+
+    def derived_triggers(self):
+        """Triggers that maintain data derived from daily_log / weekly_weight."""
+        if self.has_search:
+            return {**ROLLUP_TRIGGERS, **NOTES_TRIGGERS}
+        return ROLLUP_TRIGGERS
+
+    @contextmanager
+    def transaction(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    @contextmanager
+    def snapshot(self):
+        """A read transaction: every query inside sees the file as of its first read."""
+        self.conn.execute("BEGIN")
+        try:
+            yield self.conn
+        finally:
+            self.conn.execute("COMMIT")
+
+    @contextmanager
+    def bulk_transaction(self):
+        """One transaction for large imports.
+
+        The per-row rollup and search-index triggers are dropped for the
+        duration and both rebuilt once at the end; DDL is transactional in
+        SQLite, so a failed import leaves the triggers exactly as they were.
+        """
+        triggers = self.derived_triggers()
+        with self.transaction() as conn:
+            for name in triggers:
+                conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+            yield conn
+            self.rebuild_rollups()
+            if self.has_search:
+                self.rebuild_notes_index()
+            for statement in triggers.values():
+                conn.execute(statement)
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    # ── DAY ENTRIES ──────────────────────────────────────────────────────
+
+    def load_day(self, date_str):
+        """The DayRecord for one ISO date; a blank one if nothing is logged."""
+        return self.load_range(date_str, date_str).get(date_str) or DayRecord(date_str)
+
+    def save_day(self, record):
+        """Upsert one DayRecord (and its weight, if any) in one commit."""
+        with self.transaction() as conn:
+            conn.execute(UPSERT_DAY, record.daily_values())
+            if record.weight_kg:
+                conn.execute(UPSERT_WEIGHT, (record.date, record.weight_kg))
+
+    def update_day(self, date_str, **values):
+        """Change only the given fields of one day, validating them first.
+
+        Returns the day's DayRecord afterwards. A day that only gets a
+        weight gets no daily_log row; like save_day(), a weight is never
+        removed (change_log only journals values, not deletions).
+        """
+        changes = DayRecord.parse(date_str, **values)
+        with self.transaction() as conn:
+            record = self.load_day(changes.date)
+            for field in values:
+                setattr(record, field, getattr(changes, field))
+            if any(field != "weight_kg" for field in values):
+                conn.execute(UPSERT_DAY, record.daily_values())
+            if "weight_kg" in values and record.weight_kg:
+                conn.execute(UPSERT_WEIGHT, (record.date, record.weight_kg))
+        return record
+
+    def load_range(self, since, until, limit=None):
+        """{ISO date: DayRecord} for every logged day in [since, until], from one query.
+
+        Days with neither an entry nor a weigh-in are simply absent. With a
+        limit, only the first that many days are returned.
+        """
+        # Plain tuples straight into records: no sqlite3.Row per day
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        if limit is None:
+            rows = cursor.execute(SELECT_DAY_RANGE, {"since": since, "until": until})
+        else:
+            rows = cursor.execute(SELECT_DAY_PAGE, {"since": since, "until": until, "limit": limit})
+        return {row[0]: DayRecord(*row[:-1]) for row in rows}
+
+    def load_weights(self, since, until, limit):
+        """[(ISO date, weight_kg)] for the first limit weigh-ins in [since, until]."""
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        return cursor.execute(SELECT_WEIGHT_PAGE, {"since": since, "until": until, "limit": limit}).fetchall()
+
+    # ── HISTORY ──────────────────────────────────────────────────────────
+
+    def range_start(self, range_key):
+        """First ISO date covered by a HISTORY_RANGES key ("" if no data)."""
+        days = HISTORY_RANGES[range_key]
+        if days is not None:
+            return (date.today() - timedelta(days=days - 1)).isoformat()
+        return self.conn.execute(SELECT_FIRST_DATE).fetchone()[0] or ""
+
+    def history(self, range_key):
+        """Return (bucket, daily rows, weight rows) for a history range.
+
+        Rows come back oldest first. Spans longer than MAX_HISTORY_POINTS days
+        are averaged per week or month so the row count stays bounded.
+        """
+        start = self.range_start(range_key)
+        span = (date.today() - date.fromisoformat(start)).days + 1 if start else 0
+        bucket = pick_bucket(span)
+        daily_rows = self.conn.execute(DAILY_HISTORY_SQL[bucket], (start,)).fetchall()
+        weight_rows = self.conn.execute(WEIGHT_HISTORY_SQL[bucket], (start,)).fetchall()
+        return bucket, daily_rows, weight_rows
+
+    def gym_notes(self, start, limit, offset=0):
+        """One page of the non-empty gym notes on or after start, newest first."""
+        return self.conn.execute(SELECT_GYM_NOTES, (start, limit, offset)).fetchall()
+
+    def count_gym_notes(self, start):
+        return self.conn.execute(COUNT_GYM_NOTES, (start,)).fetchone()[0]
+
+    def summary(self, start):
+        """Averages (and min/max) per metric over [start, today], plus the weight trend.
+
+        Reads O(months) rollup rows rather than every day in the range.
+        """
+        summary = dict(self.conn.execute(SELECT_SUMMARY, {"start": start}).fetchone())
+        weights = self.recent_weights(4)
+        if len(weights) >= 2:
+            summary["weight_trend"] = (weights[0]["weight_kg"] - weights[-1]["weight_kg"], len(weights))
+        else:
+            summary["weight_trend"] = None
+        return summary
+
+    def sleep_quality(self, start):
+        """(heatmap start, nights, months) of sleep ratings from start onwards.
+
+        nights are (date, sleep_quality) rows for at most the last
+        SLEEP_HEATMAP_DAYS, from the heatmap start; months are per-month
+        good/okay/poor counts over the whole range.
+        """
+        since = max(start, (date.today() - timedelta(days=SLEEP_HEATMAP_DAYS - 1)).isoformat())
+        nights = self.conn.execute(SELECT_SLEEP_NIGHTS, (since,)).fetchall()
+        months = self.conn.execute(SELECT_SLEEP_MONTHS, (start,)).fetchall()
+        return since, nights, months
+
+    def metric_range(self, metric, since, until):
+        """(date, value) tuples of one HEATMAP_METRICS column, since..until inclusive."""
+        if metric not in HEATMAP_METRICS:
+            raise ValueError(f"Not a heatmap metric: {metric!r}")
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        return cursor.execute(SELECT_METRIC_RANGE.format(metric=metric), (since, until)).fetchall()
+
+    def data_version(self):
+        """A value that changes whenever any connection commits to the file.
+
+        PRAGMA data_version only moves for other connections' commits;
+        total_changes covers this connection's own writes.
+        """
+        return self.conn.execute("PRAGMA data_version").fetchone()[0], self.conn.total_changes
+
+    def journal_version(self):
+        """(site id, last change_log seq): moves with every write, and unlike
+        data_version() it means the same thing on every connection."""
+        seq = self.conn.execute(SELECT_JOURNAL_SEQ).fetchone()
+        return self.site_id(), seq[0] if seq else 0
+
+    def recent_weights(self, limit):
+        return self.conn.execute(SELECT_RECENT_WEIGHTS, (limit,)).fetchall()
+
+    # ── SYNC ─────────────────────────────────────────────────────────────
+
+    def site_id(self):
+        """This copy's id in change_log; every copy of the file needs its own."""
+        return self.conn.execute(SELECT_SITE).fetchone()[0]
+
+    def reset_site_id(self):
+        """Give this file a new site id, for a copy made by copying another's file.
+
+        Its existing journal entries keep the old id, which is correct: they
+        were made on the copy that still has it.
+        """
+        self.conn.execute("UPDATE sync_meta SET value = lower(hex(randomblob(8))) WHERE key = 'site'")
+        return self.site_id()
+
+    def changes_since(self, seq, skip_site=None, limit=SYNC_BATCH):
+        """Up to limit change_log tuples after seq, oldest first.
+
+        (seq, site, stamp, table, date, field, value), leaving out the
+        entries made on skip_site, if given.
+        """
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        return cursor.execute(SELECT_CHANGES, {"since": seq, "skip": skip_site, "limit": limit}).fetchall()
+
+    def outbox_seq(self, path):
+        """Seq of the last entry this copy appended to the outbox at path, or None."""
+        row = self.conn.execute(SELECT_META, (f"outbox:{os.path.abspath(path)}",)).fetchone()
+        return row[0] if row else None
+
+    def set_outbox_seq(self, path, seq):
+        self.conn.execute(UPSERT_META, (f"outbox:{os.path.abspath(path)}", seq))
+
+    def watermark(self, peer):
+        """Highest seq of peer's journal applied here (0 before the first sync)."""
+        row = self.conn.execute(SELECT_WATERMARK, (peer,)).fetchone()
+        return row[0] if row else 0
+
+    def apply_changes(self, peer, changes):
+        """Merge another copy's change_log entries, last writer wins per field.
+
+        An entry is applied only if its (stamp, site) is later than the newest
+        one already journalled for that field here, so entries seen before
+        (directly or relayed) are no-ops. Everything, including peer's new
+        watermark, commits together. Returns the number of fields changed.
+        Big batches (a first sync) go through bulk_transaction().
+        """
+        if peer == self.site_id():
+            raise ValueError("Both copies have the same site id (one file was copied from the other); "
+                             "run 'tracker_cli.py new-site' on one of them first")
+        applied = 0
+        bulk = len(changes) >= BULK_APPLY
+        with (self.bulk_transaction() if bulk else self.transaction()) as conn:
+            conn.execute("INSERT INTO sync_meta (key, value) VALUES ('applying', 1)")
+            for seq, site, stamp, table, date_str, field, value in changes:
+                statement = APPLY_FIELD.get((table, field))
+                if statement is None:
+                    raise ValueError(f"Unknown field in change log: {table}.{field}")
+                latest = conn.execute(SELECT_FIELD_STAMP, (table, date_str, field)).fetchone()
+                if latest is not None and (stamp, site) <= tuple(latest):
+                    continue
+                conn.execute(INSERT_CHANGE, (site, stamp, table, date_str, field, value))
+                conn.execute(statement, (date_str, value))
+                applied += 1
+            conn.execute("DELETE FROM sync_meta WHERE key = 'applying'")
+            if changes:
+                conn.execute(UPSERT_WATERMARK, (peer, changes[-1][0]))
+        return applied
+
+    # ── SEARCH ───────────────────────────────────────────────────────────
+
+    def search_notes(self, text, page=0, page_size=SEARCH_PAGE_SIZE):
+        """Best-ranked days whose gym or discomfort notes match text.
+
+        Returns (total matches, rows of (date, snippet)) for one page. Hits
+        in a snippet are wrapped in HIT_START / HIT_END.
+        """
+        if not self.has_search:
+            raise sqlite3.NotSupportedError("notes search needs an SQLite build with FTS5")
+        query = notes_query(text)
+        if not query:
+            return 0, []
+        total = self.conn.execute(COUNT_NOTES, {"query": query}).fetchone()[0]
+        rows = self.conn.execute(SEARCH_NOTES, {
+            "query": query, "limit": page_size, "offset": page * page_size,
+        }).fetchall()
+        return total, rows
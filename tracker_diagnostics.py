@@ -0,0 +1,54 @@
+import customtkinter as ctk
+
+from tracker_profiling import PROFILER
+
+# ─── CONSTANTS ──────────────────────────────────────────────────────────────
+
+REFRESH_MS = 1000
+MAX_ROWS = 40           # slowest operations shown
+OP_WIDTH = 56
+
+
+def format_stats(stats, limit=MAX_ROWS):
+    """PROFILER.stats() as a fixed-width table."""
+    lines = [f"{'operation':<{OP_WIDTH}} {'runs':>6} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} "
+             f"{'queries':>8} {'rows':>8}"]
+    for op, runs, p50, p95, worst, queries, rows in stats[:limit]:
+        name = op if len(op) <= OP_WIDTH else op[:OP_WIDTH - 1] + "…"
+        counts = "" if queries is None else f" {queries:8.1f} {rows:8.1f}"
+        lines.append(f"{name:<{OP_WIDTH}} {runs:6d} {p50:9.2f} {p95:9.2f} {worst:9.2f}{counts}")
+    return "\n".join(lines)
+
+
+# ─── WINDOW ──────────────────────────────────────────────────────────────────
+
+class DiagnosticsWindow(ctk.CTkToplevel):
+    """Live p50/p95 latencies of everything the profiler has recorded this session."""
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.title("⏱ Diagnostics")
+        self.geometry("1000x600")
+
+        bar = ctk.CTkFrame(self, fg_color="transparent")
+        bar.pack(fill="x", padx=15, pady=(15, 5))
+        ctk.CTkLabel(bar, text=f"Log: {PROFILER.path}", text_color="gray").pack(side="left")
+        ctk.CTkButton(bar, text="Reset", width=80, command=self._reset).pack(side="right")
+
+        self.table = ctk.CTkTextbox(self, wrap="none", font=("Courier", 12))
+        self.table.pack(fill="both", expand=True, padx=15, pady=(5, 15))
+        self._refresh()
+
+    def _reset(self):
+        PROFILER.reset()
+        self._refresh(schedule=False)
+
+    def _refresh(self, schedule=True):
+        if not self.winfo_exists():
+            return
+        self.table.configure(state="normal")
+        self.table.delete("1.0", "end")
+        self.table.insert("1.0", format_stats(PROFILER.stats()))
+        self.table.configure(state="disabled")
+        if schedule:
+            self.after(REFRESH_MS, self._refresh)
@@ -0,0 +1,335 @@
+import csv
+import json
+import os
+import struct
+import sys
+import time
+from array import array
+from itertools import chain, islice
+
+from tracker_db import (DAILY_COLUMNS, INSERT_DAY_IF_NEW, INSERT_WEIGHT_IF_NEW, SELECT_DAY_RANGE,
+                        UPSERT_DAY, UPSERT_WEIGHT)
+from tracker_record import RECORD_FIELDS, DayRecord, parse_number
+
+# ─── CONSTANTS ──────────────────────────────────────────────────────────────
+
+BATCH_SIZE = 5000
+READ_CHUNK = 1 << 16
+EXPORT_BATCH = 2000
+
+EXPORT_COLUMNS = DAILY_COLUMNS + ("weight_kg",)
+EXPORT_FORMATS = ("csv", "jsonl", "tcol")
+
+# Columnar file layout (.tcol), little-endian:
+#   magic | u32 header length | JSON header {"columns": [[name, type], ...]}
+#   then row groups: u32 row count, and per column a null bitmap followed by
+#   float64 ("d") / int64 ("q") values, or u32 offsets + UTF-8 blob ("s").
+#   A row count of 0 ends the file.
+TCOL_MAGIC = b"TCOL1\n"
+TCOL_TYPES = {
+    "date": "s", "sleep_hours": "d", "sleep_disturbances": "q", "calories": "q",
+    "mood": "q", "discomfort_level": "q", "discomfort_notes": "s", "gym_notes": "s",
+    "weight_kg": "d",
+}
+
+
+# ─── PARSING ─────────────────────────────────────────────────────────────────
+
+def _iter_json_object(f):
+    """Yield (key, value) pairs of a top-level JSON object without loading it all.
+
+    Only the current chunk and the value being decoded are held in memory, so
+    a multi-hundred-MB log.json streams in bounded space.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+
+    def fill():
+        nonlocal buf, pos, eof
+        chunk = f.read(READ_CHUNK)
+        if not chunk:
+            eof = True
+        buf = buf[pos:] + chunk
+        pos = 0
+
+    def skip_ws():
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos].isspace():
+                pos += 1
+            if pos < len(buf) or eof:
+                return
+            fill()
+
+    def expect(char):
+        nonlocal pos
+        skip_ws()
+        if pos >= len(buf) or buf[pos] != char:
+            raise ValueError(f"Expected {char!r} in JSON log")
+        pos += 1
+
+    def decode():
+        nonlocal pos
+        skip_ws()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                fill()
+                continue
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(buf) and not eof:
+                fill()
+                continue
+            pos = end
+            return value
+
+    fill()
+    expect("{")
+    skip_ws()
+    if pos < len(buf) and buf[pos] == "}":
+        return
+    while True:
+        key = decode()
+        expect(":")
+        yield key, decode()
+        skip_ws()
+        if pos < len(buf) and buf[pos] == ",":
+            pos += 1
+            continue
+        expect("}")
+        return
+
+
+def legacy_entry_to_record(date_str, entry):
+    """Map a Tracker.py log.json entry onto a DayRecord.
+
+    The old terminal log rated mood 1-5, so it is doubled onto the 1-10 scale.
+    Free-text notes become gym notes.
+    """
+    if not isinstance(entry, dict):
+        raise ValueError(f"{date_str}: not a log entry")
+    mood = parse_number(entry.get("mood"), "integer")
+    notes = (entry.get("notes") or "").strip()
+    if not notes and str(entry.get("exercise", "")).strip().lower().startswith("y"):
+        notes = "Exercised"
+    return DayRecord.parse(
+        date_str,
+        sleep_hours=entry.get("sleep"),
+        mood=max(1, min(mood * 2, 10)) if mood is not None else None,
+        gym_notes=notes,
+    )
+
+
+def csv_to_record(fields):
+    """Map one CSV line (headers named like daily_log columns, plus weight_kg) onto a DayRecord."""
+    return DayRecord.parse(fields.get("date"), **{field: fields.get(field) for field in RECORD_FIELDS[1:]})
+
+
+def legacy_journal_path(path):
+    """The journal Tracker.py appends to beside its snapshot: log.json -> log.jsonl."""
+    return os.path.splitext(path)[0] + ".jsonl"
+
+
+def _iter_legacy_journal(path):
+    """Yield (line number, date, entry) for every readable line of a Tracker.py journal."""
+    try:
+        f = open(path, "r", encoding="utf-8")
+    except FileNotFoundError:
+        return
+    with f:
+        for number, line in enumerate(f):
+            try:
+                record = json.loads(line)
+                yield number, str(record["date"]), record["entry"]
+            except (ValueError, KeyError, TypeError):
+                continue    # a line torn by a crash mid-append
+
+
+def iter_legacy_log(path, skipped):
+    """Stream records from a Tracker.py log.json; invalid entries are counted in skipped[0].
+
+    Days logged since its last snapshot are in the journal next to it, and
+    replace the snapshot's entries for the same dates. The journal is read
+    twice so that only its dates (and which line is the latest for each)
+    are held in memory, never its entries.
+    """
+    journal = legacy_journal_path(path)
+    latest = {date_str: number for number, date_str, _ in _iter_legacy_journal(journal)}
+    with open(path, "r", encoding="utf-8") as f:
+        snapshot = ((d, e) for d, e in _iter_json_object(f) if d not in latest)
+        journaled = ((d, e) for number, d, e in _iter_legacy_journal(journal) if latest[d] == number)
+        for date_str, entry in chain(snapshot, journaled):
+            try:
+                yield legacy_entry_to_record(date_str, entry)
+            except ValueError:
+                skipped[0] += 1
+
+
+def iter_csv(path, skipped):
+    """Stream records from a CSV export; invalid lines are counted in skipped[0]."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for fields in csv.DictReader(f):
+            try:
+                yield csv_to_record(fields)
+            except ValueError:
+                skipped[0] += 1
+
+
+# ─── IMPORT ──────────────────────────────────────────────────────────────────
+
+def import_rows(db, records, replace=False, batch_size=BATCH_SIZE):
+    """Insert DayRecords with executemany in one transaction.
+
+    Returns the number of records read.
+    """
+    day_sql = UPSERT_DAY if replace else INSERT_DAY_IF_NEW
+    weight_sql = UPSERT_WEIGHT if replace else INSERT_WEIGHT_IF_NEW
+    count = 0
+    with db.bulk_transaction() as conn:
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                break
+            conn.executemany(day_sql, (record.daily_values() for record in batch))
+            conn.executemany(weight_sql, ((record.date, record.weight_kg) for record in batch if record.weight_kg))
+            count += len(batch)
+    return count
+
+
+def import_file(db, path, fmt=None, replace=False):
+    """Import a legacy log.json or a CSV file. Returns (rows, skipped, seconds)."""
+    fmt = fmt or ("csv" if path.lower().endswith(".csv") else "json")
+    skipped = [0]
+    rows = iter_csv(path, skipped) if fmt == "csv" else iter_legacy_log(path, skipped)
+
+    started = time.perf_counter()
+    count = import_rows(db, rows, replace=replace)
+    return count, skipped[0], time.perf_counter() - started
+
+
+# ─── EXPORT ──────────────────────────────────────────────────────────────────
+
+def iter_export_batches(db, since="", until="9999-12-31"):
+    """Yield lists of export rows, EXPORT_BATCH at a time, straight off the cursor."""
+    width = len(EXPORT_COLUMNS)
+    cursor = db.conn.execute(SELECT_DAY_RANGE, {"since": since, "until": until})
+    while True:
+        batch = cursor.fetchmany(EXPORT_BATCH)
+        if not batch:
+            return
+        yield [tuple(row)[:width] for row in batch]
+
+
+def _write_csv(f, batches):
+    writer = csv.writer(f)
+    writer.writerow(EXPORT_COLUMNS)
+    for batch in batches:
+        writer.writerows(batch)
+        yield len(batch)
+
+
+def _write_jsonl(f, batches):
+    for batch in batches:
+        f.write("".join(json.dumps(dict(zip(EXPORT_COLUMNS, row))) + "\n" for row in batch))
+        yield len(batch)
+
+
+def _null_bitmap(values):
+    bits = bytearray((len(values) + 7) // 8)
+    for i, value in enumerate(values):
+        if value is None:
+            bits[i >> 3] |= 1 << (i & 7)
+    return bytes(bits)
+
+
+def _le(arr):
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _encode_column(kind, values):
+    if kind == "s":
+        blobs = [(v or "").encode("utf-8") for v in values]
+        offsets = array("I", [0])
+        for blob in blobs:
+            offsets.append(offsets[-1] + len(blob))
+        return _le(offsets) + b"".join(blobs)
+    fill = 0.0 if kind == "d" else 0
+    return _le(array(kind, (fill if v is None else v for v in values)))
+
+
+def _write_tcol(f, batches):
+    header = json.dumps({"columns": [[c, TCOL_TYPES[c]] for c in EXPORT_COLUMNS]}).encode()
+    f.write(TCOL_MAGIC + struct.pack("<I", len(header)) + header)
+    for batch in batches:
+        f.write(struct.pack("<I", len(batch)))
+        for i, column in enumerate(EXPORT_COLUMNS):
+            values = [row[i] for row in batch]
+            f.write(_null_bitmap(values))
+            f.write(_encode_column(TCOL_TYPES[column], values))
+        yield len(batch)
+    f.write(struct.pack("<I", 0))
+
+
+def read_tcol(path):
+    """Yield rows (dicts) back out of a .tcol file, one row group at a time."""
+    with open(path, "rb") as f:
+        if f.read(len(TCOL_MAGIC)) != TCOL_MAGIC:
+            raise ValueError(f"{path} is not a tracker columnar file")
+        (size,) = struct.unpack("<I", f.read(4))
+        columns = json.loads(f.read(size))["columns"]
+        while True:
+            (n,) = struct.unpack("<I", f.read(4))
+            if n == 0:
+                return
+            data = {}
+            for name, kind in columns:
+                nulls = f.read((n + 7) // 8)
+                if kind == "s":
+                    offsets = array("I")
+                    offsets.frombytes(f.read(4 * (n + 1)))
+                    if sys.byteorder == "big":
+                        offsets.byteswap()
+                    blob = f.read(offsets[-1])
+                    values = [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(n)]
+                else:
+                    values = array(kind)
+                    values.frombytes(f.read(values.itemsize * n))
+                    if sys.byteorder == "big":
+                        values.byteswap()
+                data[name] = [None if nulls[i >> 3] >> (i & 7) & 1 else v for i, v in enumerate(values)]
+            for i in range(n):
+                yield {name: data[name][i] for name, _ in columns}
+
+
+EXPORT_WRITERS = {"csv": _write_csv, "jsonl": _write_jsonl, "tcol": _write_tcol}
+
+
+def export_file(db, path, fmt=None, since="", until="9999-12-31"):
+    """Stream daily_log + weekly_weight into path ("-" = stdout).
+
+    Returns (rows, seconds). Memory use is one fetchmany batch regardless of
+    how big the table is; since/until are inclusive ISO dates.
+    """
+    fmt = fmt or next((f for f in EXPORT_FORMATS if path.lower().endswith("." + f)), "csv")
+    batches = iter_export_batches(db, since, until)
+    writer = EXPORT_WRITERS[fmt]
+
+    started = time.perf_counter()
+    if path == "-":
+        out = sys.stdout.buffer if fmt == "tcol" else sys.stdout
+        count = sum(writer(out, batches))
+        out.flush()
+    elif fmt == "tcol":
+        with open(path, "wb") as f:
+            count = sum(writer(f, batches))
+    else:
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            count = sum(writer(f, batches))
+    return count, time.perf_counter() - started
@@ -0,0 +1,141 @@
+import math
+import tkinter as tk
+import customtkinter as ctk
+from datetime import date
+
+from tracker_db import Database
+
+# ─── CONSTANTS ──────────────────────────────────────────────────────────────
+
+ROW_HEIGHT = 130        # px per note: date line + text box + gap
+VIEWPORT_HEIGHT = 420   # px of the list shown at once
+PAGE_SIZE = 50          # notes fetched per query
+OVERSCAN = 1            # extra rows kept ready above/below the viewport
+WHEEL_UNITS = 3         # scroll units per mouse-wheel notch
+
+
+# ─── LIST ────────────────────────────────────────────────────────────────────
+
+class VirtualNotesList(ctk.CTkFrame):
+    """Scrollable list of gym notes that only builds widgets for what is visible.
+
+    The canvas's scroll region is sized for every note in the range, but only
+    enough row widgets to fill the viewport exist; scrolling moves them and
+    swaps their text. Note text is fetched PAGE_SIZE rows at a time through
+    the DBWorker as pages come into view, so 3,000 notes cost a few widgets
+    and a few small queries rather than 3,000 text boxes up front.
+    """
+
+    def __init__(self, parent, worker, start, total, date_format="%A, %d %B %Y"):
+        super().__init__(parent)
+        self.worker = worker
+        self.start = start
+        self.total = total
+        self.date_format = date_format
+        self.pages = {}         # page number -> rows, newest note first
+        self.pending = set()    # pages requested but not back yet
+        self.slots = []         # recycled row widgets
+
+        bg = self._apply_appearance_mode(self.cget("fg_color"))
+        self.canvas = tk.Canvas(self, height=min(VIEWPORT_HEIGHT, total * ROW_HEIGHT),
+                                bg=bg, highlightthickness=0, yscrollincrement=ROW_HEIGHT // 4,
+                                yscrollcommand=self._on_view_changed)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.canvas.yview)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.canvas.configure(scrollregion=(0, 0, 1, total * ROW_HEIGHT))
+        self.canvas.bind("<Configure>", lambda event: self._layout())
+        self._bind_wheel(self.canvas)
+
+    # ── LAYOUT ───────────────────────────────────────────────────────────
+
+    def _on_view_changed(self, first, last):
+        self.scrollbar.set(first, last)
+        self._layout()
+
+    def _layout(self):
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        if width <= 1 or not self.total:
+            return
+
+        top = self.canvas.canvasy(0)
+        first_row = max(0, int(top // ROW_HEIGHT) - OVERSCAN)
+        count = min(self.total - first_row, math.ceil(height / ROW_HEIGHT) + 1 + 2 * OVERSCAN)
+        while len(self.slots) < count:
+            self.slots.append(self._make_slot())
+
+        for i, slot in enumerate(self.slots):
+            row = first_row + i
+            if i >= count:
+                self.canvas.itemconfigure(slot["window"], state="hidden")
+                continue
+            self.canvas.coords(slot["window"], 0, row * ROW_HEIGHT)
+            self.canvas.itemconfigure(slot["window"], state="normal", width=width)
+            self._fill_slot(slot, row)
+
+    def _make_slot(self):
+        frame = ctk.CTkFrame(self.canvas, border_width=1, border_color="gray", height=ROW_HEIGHT - 10)
+        label = ctk.CTkLabel(frame, text="", font=("Arial", 11, "bold"), text_color="#3b82f6")
+        label.pack(anchor="w", padx=10, pady=(5, 0))
+        textbox = ctk.CTkTextbox(frame, height=80)
+        textbox.pack(fill="x", padx=10, pady=(0, 10))
+        textbox.configure(state="disabled")
+        self._bind_wheel(frame)
+        window = self.canvas.create_window(0, 0, window=frame, anchor="nw", height=ROW_HEIGHT - 10)
+        return {"window": window, "label": label, "textbox": textbox, "shown": None}
+
+    def _fill_slot(self, slot, row):
+        page, index = divmod(row, PAGE_SIZE)
+        rows = self.pages.get(page)
+        note = rows[index] if rows is not None and index < len(rows) else None
+        shown = (note["date"], note["gym_notes"]) if note is not None else None
+        if slot["shown"] == shown and shown is not None:
+            return
+        slot["shown"] = shown
+
+        textbox = slot["textbox"]
+        textbox.configure(state="normal")
+        textbox.delete("1.0", "end")
+        if note is None:
+            slot["label"].configure(text="Loading…")
+            self._request_page(page)
+        else:
+            slot["label"].configure(text=date.fromisoformat(note["date"]).strftime(self.date_format))
+            textbox.insert("1.0", note["gym_notes"])
+        textbox.configure(state="disabled")
+
+    # ── DATA ─────────────────────────────────────────────────────────────
+
+    def _request_page(self, page):
+        if page in self.pages or page in self.pending:
+            return
+        self.pending.add(page)
+        self.worker.submit(Database.gym_notes, self.start, PAGE_SIZE, page * PAGE_SIZE,
+                           callback=lambda rows: self._page_loaded(page, rows),
+                           errback=lambda e: self.pending.discard(page))
+
+    def _page_loaded(self, page, rows):
+        self.pending.discard(page)
+        if not self.winfo_exists():
+            return
+        self.pages[page] = rows
+        self._layout()
+
+    # ── SCROLLING ────────────────────────────────────────────────────────
+
+    def _bind_wheel(self, widget):
+        # Returning "break" keeps the enclosing scrollable frame from
+        # scrolling at the same time as the list.
+        widget.bind("<MouseWheel>", self._on_wheel)
+        widget.bind("<Button-4>", self._on_wheel)
+        widget.bind("<Button-5>", self._on_wheel)
+        for child in widget.winfo_children():
+            self._bind_wheel(child)
+
+    def _on_wheel(self, event):
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            self.canvas.yview_scroll(-WHEEL_UNITS, "units")
+        else:
+            self.canvas.yview_scroll(WHEEL_UNITS, "units")
+        return "break"
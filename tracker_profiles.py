@@ -0,0 +1,100 @@
+import sqlite3
+import customtkinter as ctk
+from tkinter import messagebox
+
+from tracker_cache import DayCache
+from tracker_db import DEFAULT_PROFILE, list_profiles, profile_path
+from tracker_worker import DBWorker
+
+# ─── CONSTANTS ──────────────────────────────────────────────────────────────
+
+NEW_PROFILE = "➕ New profile…"
+
+
+# ─── PROFILES ────────────────────────────────────────────────────────────────
+
+class Profile:
+    """One person's database: its own DBWorker (connection) and DayCache."""
+
+    def __init__(self, name, worker):
+        self.name = name
+        self.worker = worker
+        self.day_cache = DayCache()
+
+    @property
+    def path(self):
+        return self.worker.path
+
+
+class ProfileSet:
+    """Profiles opened so far, each left open for the rest of the session.
+
+    Switching back to a profile reuses its worker and cache as they were,
+    so there is no reconnect, no schema check and no cold cache. Only the
+    active profile drives the busy indicator; the others finish their
+    queued work quietly.
+    """
+
+    def __init__(self, root, on_busy=None):
+        self.root = root
+        self.on_busy = on_busy
+        self.profiles = {}
+        self.active = None
+
+    def open(self, name=DEFAULT_PROFILE):
+        """Make name the active profile, opening (or creating) its database the first time."""
+        profile = self.profiles.get(name)
+        if profile is None:
+            worker = DBWorker(self.root, profile_path(name),
+                              on_busy=lambda busy: self._on_busy(name, busy))
+            profile = self.profiles[name] = Profile(name, worker)
+        self.active = profile
+        if self.on_busy:
+            self.on_busy(profile.worker.pending > 0)
+        return profile
+
+    def _on_busy(self, name, busy):
+        if self.on_busy and self.active is not None and self.active.name == name:
+            self.on_busy(busy)
+
+    def close(self):
+        for profile in self.profiles.values():
+            profile.worker.close()
+        self.profiles.clear()
+        self.active = None
+
+
+# ─── SWITCHER ────────────────────────────────────────────────────────────────
+
+class ProfileSwitcher(ctk.CTkOptionMenu):
+    """Top-bar menu of profiles; picking one calls on_switch(name).
+
+    on_switch should open the profile and may raise ValueError or
+    sqlite3.Error, in which case the menu goes back to the current profile.
+    """
+
+    def __init__(self, parent, on_switch, current=DEFAULT_PROFILE, **kwargs):
+        super().__init__(parent, values=list_profiles() + [NEW_PROFILE], command=self._picked, **kwargs)
+        self.on_switch = on_switch
+        self.current = current
+        self.set(current)
+
+    def _picked(self, name):
+        if name == NEW_PROFILE:
+            name = ctk.CTkInputDialog(text="Name for the new profile:", title="New profile").get_input()
+            name = (name or "").strip()
+            if not name:
+                self.set(self.current)
+                return
+        if name == self.current:
+            self.set(name)
+            return
+        try:
+            self.on_switch(name)
+        except (ValueError, sqlite3.Error) as e:
+            messagebox.showerror("Profile", str(e), parent=self.winfo_toplevel())
+            self.set(self.current)
+            return
+        self.current = name
+        self.configure(values=list_profiles() + [NEW_PROFILE])
+        self.set(name)
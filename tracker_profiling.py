@@ -0,0 +1,246 @@
+import os
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+from tracker_db import DB_PATH
+
+# ─── CONSTANTS ──────────────────────────────────────────────────────────────
+
+# Off unless asked for: TRACKER_PROFILING=1 in the environment, or
+# --profiling on the command line of either app
+ENABLED = bool(os.environ.get("TRACKER_PROFILING")) or "--profiling" in sys.argv
+
+LOG_PATH = os.path.join(os.path.dirname(DB_PATH), "tracker_profile.log")
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUPS = 3
+SAMPLES_KEPT = 500      # most recent timings per operation, for the percentiles
+SQL_LABEL_CHARS = 70
+
+
+def sql_label(sql):
+    """A statement's SQL on one line, shortened, to group its timings under."""
+    text = " ".join(sql.split())
+    return "sql: " + (text if len(text) <= SQL_LABEL_CHARS else text[:SQL_LABEL_CHARS - 1] + "…")
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+# ─── PROFILER ────────────────────────────────────────────────────────────────
+
+class Profiler:
+    """Per-operation timings, with the queries and rows each one cost.
+
+    Operations are timed either as a block on one thread (span) or from
+    start() to stop() across threads, e.g. from a request on the Tk thread
+    to its callback. Queries and rows are counted on the thread that runs
+    them, so a span on the DB worker thread sees exactly its own. Every
+    record goes to a rotating log file and into a short history per
+    operation that stats() summarises.
+    """
+
+    def __init__(self, enabled=ENABLED, path=LOG_PATH):
+        self.enabled = enabled
+        self.path = path
+        self._samples = defaultdict(lambda: deque(maxlen=SAMPLES_KEPT))
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._log = None
+
+    def _counters(self):
+        local = self._local
+        if not hasattr(local, "queries"):
+            local.queries = local.rows = 0
+        return local
+
+    def _logger(self):
+        if self._log is None:
+            # Imported on first use: the apps load this module at startup
+            # whether or not profiling is on
+            import logging.handlers
+
+            handler = logging.handlers.RotatingFileHandler(self.path, maxBytes=LOG_MAX_BYTES,
+                                                           backupCount=LOG_BACKUPS, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            log = logging.getLogger("tracker.profiling")
+            log.setLevel(logging.INFO)
+            log.propagate = False
+            log.addHandler(handler)
+            self._log = log
+        return self._log
+
+    # ── RECORDING ────────────────────────────────────────────────────────
+
+    def record(self, op, ms, queries=None, rows=None):
+        with self._lock:
+            self._samples[op].append((ms, queries, rows))
+            log = self._logger()
+        counts = "" if queries is None else f" queries={queries} rows={rows}"
+        log.info(f"{op} ms={ms:.3f}{counts} thread={threading.current_thread().name}")
+
+    @contextmanager
+    def span(self, op):
+        if not self.enabled:
+            yield
+            return
+        counters = self._counters()
+        queries, rows = counters.queries, counters.rows
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(op, (time.perf_counter() - started) * 1000,
+                        counters.queries - queries, counters.rows - rows)
+
+    def start(self, op):
+        """A token for stop(); None (and no cost) while profiling is off."""
+        return (op, time.perf_counter()) if self.enabled else None
+
+    def stop(self, token):
+        if token is not None:
+            op, started = token
+            self.record(op, (time.perf_counter() - started) * 1000)
+
+    def count_query(self, rows):
+        counters = self._counters()
+        counters.queries += 1
+        counters.rows += rows
+
+    # ── READING ──────────────────────────────────────────────────────────
+
+    def stats(self):
+        """[(op, runs, p50 ms, p95 ms, max ms, mean queries, mean rows)], slowest p95 first."""
+        with self._lock:
+            samples = {op: list(runs) for op, runs in self._samples.items()}
+        table = []
+        for op, runs in samples.items():
+            ordered = sorted(ms for ms, _, _ in runs)
+            counted = [(q, r) for _, q, r in runs if q is not None]
+            queries = sum(q for q, _ in counted) / len(counted) if counted else None
+            rows = sum(r for _, r in counted) / len(counted) if counted else None
+            table.append((op, len(runs), percentile(ordered, 0.5), percentile(ordered, 0.95),
+                          ordered[-1], queries, rows))
+        table.sort(key=lambda row: row[3], reverse=True)
+        return table
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+    # ── SQL ──────────────────────────────────────────────────────────────
+
+    def wrap_connection(self, conn):
+        return ProfiledConnection(conn, self) if self.enabled else conn
+
+
+class ProfiledConnection:
+    """Stands in for a sqlite3.Connection and times every statement run through it."""
+
+    def __init__(self, conn, profiler):
+        object.__setattr__(self, "_conn", conn)
+        object.__setattr__(self, "_profiler", profiler)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
+
+    def cursor(self):
+        return ProfiledCursor(self._conn.cursor(), self._profiler)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+class ProfiledCursor:
+    """A sqlite3.Cursor whose statements are recorded once their rows are read.
+
+    A statement with no result rows is recorded as soon as it has run; a
+    query when it has been read to the end (or its one fetchone() row), so
+    the time includes stepping through the results.
+    """
+
+    def __init__(self, cursor, profiler):
+        object.__setattr__(self, "_cursor", cursor)
+        object.__setattr__(self, "_profiler", profiler)
+        object.__setattr__(self, "_pending", None)     # [label, ms so far, rows so far]
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._cursor, name, value)
+
+    def _run(self, method, sql, parameters):
+        self._finish()
+        started = time.perf_counter()
+        method(sql, parameters)
+        ms = (time.perf_counter() - started) * 1000
+        if self._cursor.description is None:
+            object.__setattr__(self, "_pending", [sql_label(sql), ms, max(self._cursor.rowcount, 0)])
+            self._finish()
+        else:
+            object.__setattr__(self, "_pending", [sql_label(sql), ms, 0])
+        return self
+
+    def execute(self, sql, parameters=()):
+        return self._run(self._cursor.execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._run(self._cursor.executemany, sql, seq_of_parameters)
+
+    def _fetched(self, started, rows, done):
+        pending = self._pending
+        if pending is None:
+            return
+        pending[1] += (time.perf_counter() - started) * 1000
+        pending[2] += rows
+        if done:
+            self._finish()
+
+    def _finish(self):
+        pending = self._pending
+        if pending is None:
+            return
+        object.__setattr__(self, "_pending", None)
+        label, ms, rows = pending
+        self._profiler.count_query(rows)
+        self._profiler.record(label, ms, 1, rows)
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._fetched(started, row is not None, True)
+        return row
+
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        rows = self._cursor.fetchmany(size) if size is not None else self._cursor.fetchmany()
+        self._fetched(started, len(rows), not rows)
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._fetched(started, len(rows), True)
+        return rows
+
+    def __iter__(self):
+        while True:
+            started = time.perf_counter()
+            row = self._cursor.fetchone()
+            self._fetched(started, row is not None, row is None)
+            if row is None:
+                return
+            yield row
+
+
+PROFILER = Profiler()
@@ -0,0 +1,349 @@
+"""Quick daily entry in the terminal, for logging over SSH.
+
+    python tracker_quick.py                       # today, default database
+    python tracker_quick.py --profile Sam --date 2026-10-17
+
+Same tracker.db (and profiles) as the apps. The screen comes up straight
+away with today's values filled in as soon as they are read; every key
+edits the form in place, and changes are saved in the background
+AUTOSAVE_DELAY after the last keystroke (and when leaving a day or
+quitting). Nothing here imports customtkinter or numpy, so it starts in
+tens of milliseconds; `--startup-timing` prints where that goes.
+
+Keys: ↑/↓, Tab, Enter move between fields · type to edit · Backspace ·
+Ctrl-U clears a field · ←/→ previous/next day · Esc or Ctrl-D quits.
+"""
+import time
+
+STARTED = time.perf_counter()
+
+import argparse
+import asyncio
+import os
+import shutil
+import signal
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from tracker_db import DB_PATH, Database, profile_path
+from tracker_record import DayRecord
+
+IMPORTED = time.perf_counter()
+
+# ─── CONSTANTS ──────────────────────────────────────────────────────────────
+
+AUTOSAVE_DELAY = 0.8    # seconds, as in the apps
+
+# (DayRecord field, label), in screen order
+FIELDS = (
+    ("weight_kg", "Weight (kg)"),
+    ("sleep_hours", "Sleep hours"),
+    ("sleep_disturbances", "Disturbances"),
+    ("calories", "Calories"),
+    ("mood", "Mood (1-10)"),
+    ("discomfort_level", "Discomfort (0-10)"),
+    ("discomfort_notes", "Discomfort notes"),
+    ("gym_notes", "Gym notes"),
+)
+LABEL_WIDTH = 20
+FIRST_FIELD_ROW = 3     # screen row of the first field (1-based)
+
+ALT_SCREEN_ON, ALT_SCREEN_OFF = "\x1b[?1049h", "\x1b[?1049l"
+CLEAR = "\x1b[H\x1b[2J"
+BOLD, DIM, RED, GREEN, RESET = "\x1b[1m", "\x1b[2m", "\x1b[31m", "\x1b[32m", "\x1b[0m"
+
+KEY_UP, KEY_DOWN, KEY_RIGHT, KEY_LEFT = "\x1b[A", "\x1b[B", "\x1b[C", "\x1b[D"
+KEY_BACKTAB = "\x1b[Z"
+KEYS = (KEY_UP, KEY_DOWN, KEY_RIGHT, KEY_LEFT, KEY_BACKTAB, "\x1bOA", "\x1bOB", "\x1bOC", "\x1bOD")
+
+
+def _text(value):
+    return "" if value is None else str(value)
+
+
+def split_keys(data):
+    """Split what one read returned into keys: arrow sequences, a lone Esc, or characters."""
+    keys = []
+    i = 0
+    while i < len(data):
+        if data[i] == "\x1b" and i + 1 < len(data):
+            key = next((k for k in KEYS if data.startswith(k, i)), None)
+            if key is not None:
+                # Application-mode arrows (ESC O x) mean the same as ESC [ x
+                keys.append(key.replace("\x1bO", "\x1b["))
+                i += len(key)
+                continue
+            # Some other sequence (F-keys, Home...): skip up to its final byte
+            j = i + 2
+            while j < len(data) and not ("@" <= data[j] <= "~"):
+                j += 1
+            i = j + 1
+            continue
+        keys.append(data[i])
+        i += 1
+    return keys
+
+
+# ─── APP ─────────────────────────────────────────────────────────────────────
+
+class QuickEntry:
+    """The form, its background saves, and the terminal it draws on.
+
+    Database calls run on one executor thread that owns the connection,
+    like DBWorker: call(func, *args) awaits func(db, *args), and since the
+    thread takes them in order a save queued before a load is always
+    visible to it.
+    """
+
+    def __init__(self, path, day, out=sys.stdout):
+        self.path = path
+        self.day = day
+        self.out = out
+        self.values = {field: "" for field, _ in FIELDS}
+        self.active = 0
+        self.loading = True
+        self.last_saved = None      # the record last written or read, to skip no-op saves
+        self.status = ""
+        self.status_color = DIM
+        self.db = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tracker-db")
+        self._save_timer = None
+        self._saves = set()
+        self._done = None
+        self.first_paint = None
+
+    # ── DATABASE THREAD ──────────────────────────────────────────────────
+
+    def _run(self, func, args):
+        if self.db is None:
+            self.db = Database(self.path)
+        return func(self.db, *args)
+
+    def _close(self):
+        if self.db is not None:
+            self.db.close()
+
+    async def call(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._run, func, args)
+
+    # ── LOADING / SAVING ─────────────────────────────────────────────────
+
+    async def load(self):
+        day = self.day
+        self.loading = True
+        self.render()
+        try:
+            record = await self.call(Database.load_day, day.isoformat())
+        except sqlite3.Error as e:
+            self.set_status(f"Could not read {self.path}: {e}", RED)
+            return
+        if day != self.day:
+            return      # moved on while it was loading
+        self.values = {field: _text(getattr(record, field)) for field, _ in FIELDS}
+        self.last_saved = record
+        self.loading = False
+        self.render()
+
+    def read_form(self):
+        return DayRecord.parse(self.day.isoformat(), **self.values)
+
+    def edited(self):
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+        self._save_timer = asyncio.get_running_loop().call_later(AUTOSAVE_DELAY, self.save)
+        self.render()
+
+    def save(self):
+        """Queue a save of the form if it changed; the write happens in the background."""
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+            self._save_timer = None
+        if self.loading:
+            return
+        try:
+            record = self.read_form()
+        except ValueError as e:
+            self.set_status(f"Not saved: {e}", RED)
+            return
+        if record == self.last_saved:
+            return
+        self.last_saved = record
+        task = asyncio.get_running_loop().create_task(self._write(record))
+        self._saves.add(task)
+        task.add_done_callback(self._saves.discard)
+
+    async def _write(self, record):
+        try:
+            await self.call(Database.save_day, record)
+        except sqlite3.Error as e:
+            if self.last_saved is record:
+                self.last_saved = None      # let the next edit retry
+            self.set_status(f"Save failed: {e}", RED)
+            return
+        self.set_status(f"Saved {date.fromisoformat(record.date):%a %d %b} at {time.strftime('%H:%M:%S')}", GREEN)
+
+    def go_to(self, day):
+        self.save()
+        self.day = day
+        self.values = {field: "" for field, _ in FIELDS}
+        asyncio.get_running_loop().create_task(self.load())
+
+    # ── INPUT ────────────────────────────────────────────────────────────
+
+    def on_input(self, fd):
+        data = os.read(fd, 1024).decode("utf-8", errors="ignore")
+        if not data:
+            self.quit()
+            return
+        for key in split_keys(data):
+            self.on_key(key)
+
+    def on_key(self, key):
+        field = FIELDS[self.active][0]
+        if key in ("\x1b", "\x04"):
+            self.quit()
+        elif key in (KEY_DOWN, "\t", "\r", "\n"):
+            self.active = (self.active + 1) % len(FIELDS)
+            self.render()
+        elif key in (KEY_UP, KEY_BACKTAB):
+            self.active = (self.active - 1) % len(FIELDS)
+            self.render()
+        elif key == KEY_LEFT:
+            self.go_to(self.day - timedelta(days=1))
+        elif key == KEY_RIGHT:
+            if self.day < date.today():
+                self.go_to(self.day + timedelta(days=1))
+        elif self.loading:
+            return      # never edit (and then save) the blank form shown while loading
+        elif key in ("\x7f", "\x08"):
+            self.values[field] = self.values[field][:-1]
+            self.edited()
+        elif key == "\x15":
+            self.values[field] = ""
+            self.edited()
+        elif key.isprintable():
+            self.values[field] += key
+            self.edited()
+
+    # ── SCREEN ───────────────────────────────────────────────────────────
+
+    def set_status(self, text, color=DIM):
+        self.status, self.status_color = text, color
+        self.render()
+
+    def render(self):
+        width = shutil.get_terminal_size().columns
+        room = max(width - LABEL_WIDTH - 4, 8)
+        title = f"{self.day:%A %d %B %Y}" + ("  (loading…)" if self.loading else "")
+        lines = [f"{BOLD}📋 Daily Log - {title}{RESET}", ""]
+        cursor = None
+        for i, (field, label) in enumerate(FIELDS):
+            shown = self.values[field].replace("\n", "↵")
+            if len(shown) > room:
+                shown = "…" + shown[-(room - 1):]     # keep the end, where typing happens
+            marker = ">" if i == self.active else " "
+            lines.append(f"{marker} {label:<{LABEL_WIDTH}}{shown}")
+            if i == self.active:
+                cursor = (FIRST_FIELD_ROW + i, 2 + LABEL_WIDTH + len(shown) + 1)
+        lines += ["", f"{DIM}↑↓/Tab move · type to edit · Ctrl-U clear · ←/→ day · Esc quit{RESET}",
+                  f"{self.status_color}{self.status[:width]}{RESET}"]
+        self.out.write(CLEAR + "\n".join(lines) + "\x1b[{};{}H".format(*cursor))
+        self.out.flush()
+        if self.first_paint is None:
+            self.first_paint = time.perf_counter()
+
+    # ── LIFECYCLE ────────────────────────────────────────────────────────
+
+    def quit(self):
+        if self._done is not None and not self._done.done():
+            self._done.set_result(None)
+
+    async def run(self, fd):
+        loop = asyncio.get_running_loop()
+        self._done = loop.create_future()
+        loop.add_reader(fd, self.on_input, fd)
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self.quit)
+        loop.add_signal_handler(signal.SIGWINCH, self.render)
+
+        self.out.write(ALT_SCREEN_ON)
+        self.render()
+        loop.create_task(self.load())
+        try:
+            await self._done
+        finally:
+            loop.remove_reader(fd)
+            self.save()
+            if self._saves:
+                await asyncio.wait(self._saves)
+            await loop.run_in_executor(self._executor, self._close)
+            self._executor.shutdown()
+            self.out.write(ALT_SCREEN_OFF)
+            if self.status_color == RED:
+                # e.g. "Not saved: ..." for a field left invalid at Esc
+                self.out.write(f"{self.status}\n")
+            self.out.flush()
+
+    async def startup_timing(self):
+        """Paint once, load the day, and return (first paint, loaded) seconds since start."""
+        self.render()
+        await self.load()
+        loaded = time.perf_counter()
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._close)
+        self._executor.shutdown()
+        return self.first_paint - STARTED, loaded - STARTED
+
+
+# ─── ENTRY POINT ─────────────────────────────────────────────────────────────
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="tracker_quick", description="Log a day from the terminal.")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--db", default=DB_PATH, help=f"database file (default: {DB_PATH})")
+    target.add_argument("--profile", help="use this profile's database instead of --db")
+    parser.add_argument("--date", type=date.fromisoformat, default=date.today(), help="ISO date (default: today)")
+    parser.add_argument("--startup-timing", action="store_true", help="print how long start-up takes, then exit")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        path = profile_path(args.profile) if args.profile else args.db
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    if args.startup_timing:
+        with open(os.devnull, "w", encoding="utf-8") as devnull:
+            paint, loaded = asyncio.run(QuickEntry(path, args.date, out=devnull).startup_timing())
+        print(f"imports      {(IMPORTED - STARTED) * 1000:7.1f} ms")
+        print(f"first paint  {paint * 1000:7.1f} ms")
+        print(f"day loaded   {loaded * 1000:7.1f} ms")
+        return 0
+
+    try:
+        import termios
+        import tty
+    except ImportError:
+        print("❌ tracker_quick needs a Unix terminal (use the app on Windows)", file=sys.stderr)
+        return 1
+    if not sys.stdin.isatty():
+        print("❌ tracker_quick needs an interactive terminal", file=sys.stderr)
+        return 1
+
+    fd = sys.stdin.fileno()
+    saved = termios.tcgetattr(fd)
+    # Keys arrive one at a time and unechoed; Ctrl-C still raises SIGINT
+    tty.setcbreak(fd)
+    try:
+        asyncio.run(QuickEntry(path, args.date).run(fd))
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
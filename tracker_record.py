@@ -0,0 +1,139 @@
+import math
+from datetime import date
+from operator import attrgetter
+
+# ─── CONSTANTS ──────────────────────────────────────────────────────────────
+
+# daily_log's columns in table order, then the day's weigh-in
+DAILY_FIELDS = ("date", "sleep_hours", "sleep_disturbances", "calories", "mood",
+                "discomfort_level", "discomfort_notes", "gym_notes")
+RECORD_FIELDS = DAILY_FIELDS + ("weight_kg",)
+TEXT_FIELDS = ("discomfort_notes", "gym_notes")
+
+# Numeric field -> (SQLite type, lowest, highest or None). The tables' CHECK
+# constraints are generated from this too, so the parser and the database
+# always agree on what a valid value is.
+NUMBER_FIELDS = {
+    "sleep_hours": ("real", 0, 24),
+    "sleep_disturbances": ("integer", 0, None),
+    "calories": ("integer", 0, None),
+    "mood": ("integer", 0, 10),
+    "discomfort_level": ("integer", 0, 10),
+    "weight_kg": ("real", 0, 1000),
+}
+
+FIELD_LABELS = {
+    "date": "Date", "sleep_hours": "Sleep hours", "sleep_disturbances": "Sleep disturbances",
+    "calories": "Calories", "mood": "Mood", "discomfort_level": "Discomfort",
+    "weight_kg": "Weight",
+}
+
+
+# ─── PARSING ─────────────────────────────────────────────────────────────────
+
+def parse_number(value, kind="real"):
+    """A number, or text as typed or read from a file, as a float ("real") or int.
+
+    Blank text and None give None. Anything else that isn't a finite number,
+    or a fractional value for an "integer", raises ValueError.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        if not value:
+            return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{value!r} is not a number") from None
+    if not math.isfinite(number):
+        raise ValueError(f"{value!r} is not a number")
+    if kind == "real":
+        return number
+    if not number.is_integer():
+        raise ValueError(f"{value!r} is not a whole number")
+    return int(number)
+
+
+def parse_field(field, value):
+    """value for one of NUMBER_FIELDS, checked against its range; ValueError says which field."""
+    kind, low, high = NUMBER_FIELDS[field]
+    try:
+        number = parse_number(value, kind)
+    except ValueError as e:
+        raise ValueError(f"{FIELD_LABELS[field]}: {e}") from None
+    if number is not None and (number < low or (high is not None and number > high)):
+        limits = f"at least {low}" if high is None else f"between {low} and {high}"
+        raise ValueError(f"{FIELD_LABELS[field]} must be {limits}, not {number:g}")
+    return number
+
+
+def parse_date(value):
+    """A canonical ISO date string, as daily_log requires."""
+    if not value or not str(value).strip():
+        raise ValueError("missing date")
+    return date.fromisoformat(str(value).strip()).isoformat()
+
+
+# ─── RECORD ──────────────────────────────────────────────────────────────────
+
+_daily_values = attrgetter(*DAILY_FIELDS)
+_all_values = attrgetter(*RECORD_FIELDS)
+
+
+class DayRecord:
+    """One day: its daily_log values and its weigh-in, as plain Python values.
+
+    Build one with parse() from anything outside the database (the entry
+    form, an import file); the constructor trusts its arguments and is what
+    loads use, since the table constraints already checked those values.
+    Slots rather than a dict keep a cache of years of days small.
+    """
+
+    __slots__ = RECORD_FIELDS
+
+    def __init__(self, date, sleep_hours=None, sleep_disturbances=None, calories=None, mood=None,
+                 discomfort_level=None, discomfort_notes="", gym_notes="", weight_kg=None):
+        self.date = date
+        self.sleep_hours = sleep_hours
+        self.sleep_disturbances = sleep_disturbances
+        self.calories = calories
+        self.mood = mood
+        self.discomfort_level = discomfort_level
+        self.discomfort_notes = discomfort_notes or ""
+        self.gym_notes = gym_notes or ""
+        self.weight_kg = weight_kg
+
+    @classmethod
+    def parse(cls, date, **values):
+        """A validated record; raises ValueError naming the first bad field."""
+        record = cls(parse_date(date))
+        for field, value in values.items():
+            if field in NUMBER_FIELDS:
+                value = parse_field(field, value)
+            elif field in TEXT_FIELDS:
+                value = "" if value is None else str(value)
+            else:
+                raise TypeError(f"unknown field {field!r}")
+            setattr(record, field, value)
+        return record
+
+    def daily_values(self):
+        """The daily_log columns as a tuple, for UPSERT_DAY and friends."""
+        return _daily_values(self)
+
+    def as_dict(self):
+        return dict(zip(RECORD_FIELDS, _all_values(self)))
+
+    def __eq__(self, other):
+        if not isinstance(other, DayRecord):
+            return NotImplemented
+        return _all_values(self) == _all_values(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        values = ", ".join(f"{field}={value!r}" for field, value in zip(RECORD_FIELDS, _all_values(self))
+                           if value not in (None, ""))
+        return f"DayRecord({values})"
@@ -0,0 +1,143 @@
+import customtkinter as ctk
+from datetime import date
+
+from tracker_db import HIT_END, HIT_START, SEARCH_PAGE_SIZE, Database
+
+# ─── CONSTANTS ──────────────────────────────────────────────────────────────
+
+SEARCH_DELAY_MS = 250       # pause in typing before the query runs
+HIT_COLOR = "#c9a227"
+LINK_COLOR = "#3b82f6"
+
+
+def split_snippet(snippet):
+    """Yield (text, is_hit) pieces of a snippet marked with HIT_START / HIT_END."""
+    for i, part in enumerate(snippet.split(HIT_START)):
+        if i == 0:
+            yield part, False
+            continue
+        hit, _, rest = part.partition(HIT_END)
+        yield hit, True
+        yield rest, False
+
+
+# ─── WINDOW ──────────────────────────────────────────────────────────────────
+
+class SearchWindow(ctk.CTkToplevel):
+    """Full-text search over every day's gym and discomfort notes.
+
+    Queries run on the app's DBWorker, one page at a time, best match first.
+    Clicking a result's date calls on_pick(iso_date).
+    """
+
+    def __init__(self, parent, worker, on_pick, date_format="%A %d %B %Y"):
+        super().__init__(parent)
+        self.title("🔍 Search Notes")
+        self.geometry("800x600")
+
+        self.worker = worker
+        self.on_pick = on_pick
+        self.date_format = date_format
+        self.page = 0
+        self.total = 0
+        self._query = ""
+        self._request = 0       # answers to older requests are dropped
+        self._search_job = None
+
+        bar = ctk.CTkFrame(self, fg_color="transparent")
+        bar.pack(fill="x", padx=15, pady=(15, 5))
+
+        self.entry = ctk.CTkEntry(bar, placeholder_text="e.g. deadlift PR", font=("Arial", 14), height=36)
+        self.entry.pack(side="left", fill="x", expand=True)
+        self.entry.bind("<KeyRelease>", self._on_key)
+        self.entry.bind("<Return>", lambda event: self.search(self.entry.get()))
+
+        self.count_label = ctk.CTkLabel(bar, text="", width=160, text_color="gray")
+        self.count_label.pack(side="left", padx=(10, 0))
+
+        self.results = ctk.CTkTextbox(self, wrap="word", font=("Arial", 13))
+        self.results.pack(fill="both", expand=True, padx=15, pady=5)
+        self.results.tag_config("date", foreground=LINK_COLOR, underline=True)
+        self.results.tag_config("hit", foreground=HIT_COLOR)
+        self.results.configure(state="disabled")
+
+        pager = ctk.CTkFrame(self, fg_color="transparent")
+        pager.pack(fill="x", padx=15, pady=(5, 15))
+        self.prev_button = ctk.CTkButton(pager, text="◀ Prev", width=90, state="disabled",
+                                         command=lambda: self._show_page(self.page - 1))
+        self.prev_button.pack(side="left")
+        self.page_label = ctk.CTkLabel(pager, text="")
+        self.page_label.pack(side="left", expand=True)
+        self.next_button = ctk.CTkButton(pager, text="Next ▶", width=90, state="disabled",
+                                         command=lambda: self._show_page(self.page + 1))
+        self.next_button.pack(side="left")
+
+        self.after(100, self.entry.focus_set)
+
+    # ── QUERYING ─────────────────────────────────────────────────────────
+
+    def _on_key(self, event):
+        if event.keysym == "Return":
+            return
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(SEARCH_DELAY_MS, lambda: self.search(self.entry.get()))
+
+    def search(self, text):
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+            self._search_job = None
+        text = text.strip()
+        if text == self._query:
+            return
+        self._query = text
+        self._show_page(0)
+
+    def _show_page(self, page):
+        self._request += 1
+        request = self._request
+        if not self._query:
+            self._render(request, 0, 0, [])
+            return
+        self.count_label.configure(text="⏳ Searching…")
+        self.worker.submit(Database.search_notes, self._query, page,
+                           callback=lambda result: self._render(request, page, *result),
+                           errback=lambda e: self._failed(request, e))
+
+    # ── RESULTS ──────────────────────────────────────────────────────────
+
+    def _render(self, request, page, total, rows):
+        if request != self._request or not self.winfo_exists():
+            return
+        self.page = page
+        self.total = total
+        pages = max(1, -(-total // SEARCH_PAGE_SIZE))
+
+        self.results.configure(state="normal")
+        self.results.delete("1.0", "end")
+        for row in rows:
+            link = f"pick-{row['date']}"
+            self.results.insert("end", date.fromisoformat(row["date"]).strftime(self.date_format),
+                                ("date", link))
+            self.results.tag_bind(link, "<Button-1>", lambda event, d=row["date"]: self.on_pick(d))
+            self.results.insert("end", "\n")
+            for text, is_hit in split_snippet(row["snippet"]):
+                self.results.insert("end", text, ("hit",) if is_hit else ())
+            self.results.insert("end", "\n\n")
+        if self._query and not rows:
+            self.results.insert("end", "No notes match.")
+        self.results.configure(state="disabled")
+
+        self.count_label.configure(text=f"{total} matching day{'s' if total != 1 else ''}" if self._query else "")
+        self.page_label.configure(text=f"Page {page + 1} of {pages}" if total else "")
+        self.prev_button.configure(state="normal" if page > 0 else "disabled")
+        self.next_button.configure(state="normal" if page + 1 < pages else "disabled")
+
+    def _failed(self, request, e):
+        if request != self._request or not self.winfo_exists():
+            return
+        self.count_label.configure(text="")
+        self.results.configure(state="normal")
+        self.results.delete("1.0", "end")
+        self.results.insert("end", f"❌ Search failed: {e}")
+        self.results.configure(state="disabled")
@@ -0,0 +1,242 @@
+import json
+import os
+import socket
+import socketserver
+
+from tracker_db import SYNC_BATCH, Database
+
+# ─── CONSTANTS ──────────────────────────────────────────────────────────────
+
+PROTOCOL = 1
+DEFAULT_PORT = 8765
+SOCKET_TIMEOUT = 30         # seconds without a message before giving up
+OUTBOX_SUFFIX = ".jsonl"
+TAIL_BYTES = 64 * 1024      # read from the end of an outbox to find its last entry
+
+
+def _batches(db, since, **filters):
+    """change_log entries after since, SYNC_BATCH at a time."""
+    while True:
+        batch = db.changes_since(since, **filters)
+        if not batch:
+            return
+        yield batch
+        since = batch[-1][0]
+
+
+# ─── DIRECTORY ───────────────────────────────────────────────────────────────
+
+def sync_directory(db, folder):
+    """Exchange changes through a folder every copy can reach (USB stick, share, cloud folder).
+
+    Each copy appends its journal to <folder>/<site>.jsonl and applies
+    everyone else's file from its watermark on, so after the first sync a
+    run only writes and applies what changed since the last. Entries made
+    on a copy that has its own file there are not repeated in the others';
+    anything else (say, synced in over a socket) is passed along.
+    Returns (sent, received, applied).
+    """
+    os.makedirs(folder, exist_ok=True)
+    site = db.site_id()
+    peers = {}
+    for name in sorted(os.listdir(folder)):
+        peer, ext = os.path.splitext(name)
+        if ext == OUTBOX_SUFFIX and peer != site:
+            peers[peer] = os.path.join(folder, name)
+
+    sent = _append_outbox(db, os.path.join(folder, site + OUTBOX_SUFFIX), skip_sites=set(peers))
+    received = applied = 0
+    for peer, path in peers.items():
+        count, changed = _read_outbox(db, peer, path)
+        received += count
+        applied += changed
+    return sent, received, applied
+
+
+def _append_outbox(db, path, skip_sites):
+    entry = _last_entry(path)
+    last = entry[0] if entry else 0
+    # change_log rows can be replaced under a new seq, so the file's last
+    # entry is checked against what this copy remembers appending, not
+    # against the journal. None: an outbox from before this was recorded.
+    appended = db.outbox_seq(path)
+    if entry and appended is not None and appended != last:
+        raise ValueError(f"{path} was written by another copy of this database file; "
+                         "run 'tracker_cli.py new-site' on one of the copies first")
+    sent = 0
+    with open(path, "ab") as f:
+        # A line torn by a crash mid-write is left on its own and skipped by readers
+        if f.tell() and not _ends_with_newline(path):
+            f.write(b"\n")
+        for batch in _batches(db, last):
+            changes = [change for change in batch if change[1] not in skip_sites]
+            f.write(b"".join(_encode(change) + b"\n" for change in changes))
+            sent += len(changes)
+            if changes:
+                last = changes[-1][0]
+        f.flush()
+        os.fsync(f.fileno())
+    db.set_outbox_seq(path, last)
+    return sent
+
+
+def _read_outbox(db, peer, path):
+    since = db.watermark(peer)
+    received = applied = 0
+    batch = []
+    with open(path, "rb") as f:
+        for line in f:
+            change = _decode(line)
+            if change is None or change[0] <= since:
+                continue
+            batch.append(change)
+            if len(batch) >= SYNC_BATCH:
+                applied += db.apply_changes(peer, batch)
+                received += len(batch)
+                batch = []
+    if batch:
+        applied += db.apply_changes(peer, batch)
+        received += len(batch)
+    return received, applied
+
+
+def _last_entry(path):
+    """The last complete entry in an outbox, or None for a new one."""
+    try:
+        size = os.path.getsize(path)
+    except FileNotFoundError:
+        return None
+    with open(path, "rb") as f:
+        f.seek(max(0, size - TAIL_BYTES))
+        lines = f.read().splitlines()
+        if size > TAIL_BYTES:
+            lines = lines[1:]   # probably starts mid-line
+        for line in reversed(lines):
+            change = _decode(line)
+            if change is not None:
+                return change
+        if size > TAIL_BYTES:
+            # One very long note: fall back to reading the whole file
+            f.seek(0)
+            return max((c for c in map(_decode, f) if c is not None), default=None)
+    return None
+
+
+def _ends_with_newline(path):
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def _encode(change):
+    return json.dumps(change, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _decode(line):
+    try:
+        change = json.loads(line)
+    except ValueError:
+        return None
+    return change if isinstance(change, list) and len(change) == 7 else None
+
+
+# ─── SOCKET ──────────────────────────────────────────────────────────────────
+#
+# One JSON object per line. Each side says who it is and how far it has
+# read the other's journal; the server then streams its entries past that
+# point and takes the client's the same way:
+#
+#   client: {"protocol", "site"}      server: {"site", "since"}
+#   client: {"since"}
+#   server: {"changes": [...]} ... {"end": true}
+#   client: {"changes": [...]} ... {"end": true}
+#   server: {"applied": n}
+#
+# Entries a copy made itself are never sent back to it.
+
+def _send(stream, message):
+    stream.write(_encode(message) + b"\n")
+    stream.flush()
+
+
+def _receive(stream):
+    line = stream.readline()
+    if not line:
+        raise ConnectionError("sync peer closed the connection")
+    message = json.loads(line)
+    if "error" in message:
+        raise ValueError(f"sync peer: {message['error']}")
+    return message
+
+
+def _send_changes(db, stream, since, peer):
+    sent = 0
+    for batch in _batches(db, since, skip_site=peer):
+        _send(stream, {"changes": batch})
+        sent += len(batch)
+    _send(stream, {"end": True})
+    return sent
+
+
+def _receive_changes(db, stream, peer):
+    received = applied = 0
+    while True:
+        message = _receive(stream)
+        if message.get("end"):
+            return received, applied
+        batch = [tuple(change) for change in message["changes"]]
+        applied += db.apply_changes(peer, batch)
+        received += len(batch)
+
+
+def sync_socket(db, host, port=DEFAULT_PORT):
+    """Sync with a copy running serve(). Returns (sent, received, applied)."""
+    with socket.create_connection((host, port), timeout=SOCKET_TIMEOUT) as sock:
+        stream = sock.makefile("rwb")
+        site = db.site_id()
+        _send(stream, {"protocol": PROTOCOL, "site": site})
+        server = _receive(stream)
+        peer = server["site"]
+        _send(stream, {"since": db.watermark(peer)})
+        received, applied = _receive_changes(db, stream, peer)
+        sent = _send_changes(db, stream, server["since"], peer)
+        _receive(stream)
+    return sent, received, applied
+
+
+class _SyncHandler(socketserver.StreamRequestHandler):
+    timeout = SOCKET_TIMEOUT
+
+    def handle(self):
+        db = Database(self.server.db_path)
+        try:
+            hello = _receive(self.rfile)
+            site = db.site_id()
+            if hello.get("protocol") != PROTOCOL:
+                _send(self.wfile, {"error": f"unsupported sync protocol {hello.get('protocol')}"})
+                return
+            if hello["site"] == site:
+                _send(self.wfile, {"error": "both copies have the same site id; run new-site on one"})
+                return
+            peer = hello["site"]
+            _send(self.wfile, {"site": site, "since": db.watermark(peer)})
+            sent = _send_changes(db, self.wfile, _receive(self.rfile)["since"], peer)
+            received, applied = _receive_changes(db, self.rfile, peer)
+            _send(self.wfile, {"applied": applied})
+            print(f"🔄 {self.client_address[0]}: sent {sent}, received {received}, applied {applied}")
+        except (OSError, ValueError) as e:
+            print(f"❌ Sync with {self.client_address[0]} failed: {e}")
+        finally:
+            db.close()
+
+
+class _SyncServer(socketserver.TCPServer):
+    allow_reuse_address = True
+
+
+def serve(db_path, host="127.0.0.1", port=DEFAULT_PORT):
+    """Answer sync_socket() clients, one at a time, until interrupted."""
+    with _SyncServer((host, port), _SyncHandler) as server:
+        server.db_path = db_path
+        print(f"Serving {db_path} for sync on {host}:{port} (Ctrl+C to stop)")
+        server.serve_forever()
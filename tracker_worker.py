@@ -0,0 +1,112 @@
+import queue
+import threading
+import traceback
+
+from tracker_db import Database
+from tracker_profiling import PROFILER
+
+# ─── CONSTANTS ──────────────────────────────────────────────────────────────
+
+POLL_MS = 15             # how often finished results are picked up while busy
+SHUTDOWN_TIMEOUT = 10    # seconds to wait for queued writes on close
+
+
+def _print_error(error):
+    traceback.print_exception(type(error), error, error.__traceback__)
+
+
+# ─── WORKER ──────────────────────────────────────────────────────────────────
+
+class DBWorker:
+    """Owns the Database on a background thread so Tk never waits on SQLite.
+
+    submit(func, *args) queues func(db, *args); requests run one at a time in
+    order, so a save queued before a load is always visible to that load.
+    Results are handed back on the Tk thread by polling with root.after(),
+    because widgets may only be touched from the main loop.
+    """
+
+    def __init__(self, root, path, on_busy=None):
+        self.root = root
+        self.path = path
+        self.on_busy = on_busy
+        self.pending = 0
+        self._requests = queue.Queue()
+        self._results = queue.Queue()
+        self._poll_job = None
+        self._open_error = None
+
+        opened = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(opened,),
+                                        name="tracker-db", daemon=True)
+        self._thread.start()
+        opened.wait()
+        if self._open_error is not None:
+            raise self._open_error
+
+    # ── MAIN THREAD ──────────────────────────────────────────────────────
+
+    def submit(self, func, *args, callback=None, errback=None):
+        self.pending += 1
+        if self.pending == 1 and self.on_busy:
+            self.on_busy(True)
+        self._requests.put((func, args, callback, errback))
+        if self._poll_job is None:
+            self._poll_job = self.root.after(POLL_MS, self._poll)
+
+    def _poll(self):
+        self._poll_job = None
+        while True:
+            try:
+                callback, errback, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self.pending -= 1
+            # A callback that raises (say, on a window closed meanwhile) is
+            # reported, and the other results are still handed out
+            try:
+                if error is not None:
+                    (errback or _print_error)(error)
+                elif callback is not None:
+                    callback(result)
+            except Exception as e:
+                _print_error(e)
+
+        if self.pending:
+            self._poll_job = self.root.after(POLL_MS, self._poll)
+        elif self.on_busy:
+            self.on_busy(False)
+
+    def close(self):
+        """Finish everything already queued, then close the connection."""
+        if self._poll_job is not None:
+            self.root.after_cancel(self._poll_job)
+            self._poll_job = None
+        self._requests.put(None)
+        self._thread.join(SHUTDOWN_TIMEOUT)
+
+    # ── WORKER THREAD ────────────────────────────────────────────────────
+
+    def _run(self, opened):
+        try:
+            with PROFILER.span("db open"):
+                db = Database(self.path)
+            db.conn = PROFILER.wrap_connection(db.conn)
+        except Exception as e:
+            self._open_error = e
+            opened.set()
+            return
+        opened.set()
+
+        while True:
+            request = self._requests.get()
+            if request is None:
+                break
+            func, args, callback, errback = request
+            try:
+                with PROFILER.span(f"db: {getattr(func, '__qualname__', func)}"):
+                    result = func(db, *args)
+                self._results.put((callback, errback, result, None))
+            except Exception as e:
+                self._results.put((callback, errback, None, e))
+        db.close()